@@ -0,0 +1,40 @@
+"""Serve the dashboard's projection numbers as JSON for other tools.
+
+    python api.py [--host 127.0.0.1] [--port 8600] [--access-log]
+
+    GET /v1                          endpoints and their parameters
+    GET /v1/cost-projection          ?target_gap_closure_pct=75&years=10[&inflation_rate=0.06...]
+    GET /v1/scenario-comparison      [?years=15&training_capacity_increase=2.5...]
+    GET /v1/regions
+    GET /v1/states
+
+Rates are fractions, as the data functions take them. Responses carry an ETag
+derived from the dataset version, so clients sending If-None-Match get a 304
+until the data changes.
+"""
+import argparse
+import sys
+
+from utils.projection_api import API_HOST, API_PORT, create_server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve projections as a local JSON API")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--access-log", action="store_true", help="log every request to stderr")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, access_log=args.access_log)
+    print(f"Serving projections on http://{args.host}:{args.port}/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Generate the board pack: every AI report type for every scenario plus the strategy document.
+
+    python batch_reports.py [--output-dir board_pack] [--workers 4] [--force] [--no-strategy]
+
+Each document is written as soon as it completes; rerunning skips documents whose
+dataset version, model and prompt are unchanged, so an interrupted run picks up
+where it stopped.
+"""
+import argparse
+import os
+import sys
+
+from utils.report_batch import (
+    BATCH_MAX_WORKERS, BATCH_OUTPUT_DIR, assemble_board_pack, build_batch_items, run_batch
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-generate AI reports and the strategy document")
+    parser.add_argument("--output-dir", default=BATCH_OUTPUT_DIR, help="directory for the generated documents")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS, help="concurrent generations")
+    parser.add_argument("--force", action="store_true", help="regenerate documents that already exist")
+    parser.add_argument("--no-strategy", action="store_true", help="skip the OpenAI strategy document")
+    args = parser.parse_args(argv)
+
+    items = build_batch_items(include_strategy=not args.no_strategy)
+    done = 0
+
+    def on_progress(item_id, status, detail):
+        nonlocal done
+        done += 1
+        print(f"[{done}/{len(items)}] {status:<9} {item_id} {detail}".rstrip(), flush=True)
+
+    summary = run_batch(args.output_dir, items, max_workers=args.workers, force=args.force, on_progress=on_progress)
+
+    with open(os.path.join(args.output_dir, "Board_Pack.md"), "w", encoding="utf-8") as f:
+        f.write(assemble_board_pack(args.output_dir, items))
+
+    print(
+        f"{len(summary['completed'])} generated, {len(summary['skipped'])} skipped, "
+        f"{len(summary['failed'])} failed -> {args.output_dir}"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
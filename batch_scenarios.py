@@ -0,0 +1,61 @@
+"""Run scenario definitions headlessly and collect every projection in one Parquet file.
+
+    python batch_scenarios.py scenarios.yaml [--output scenario_results.parquet] [--workers 8] [--fresh]
+
+Each scenario takes the parameters of calculate_cost_projection and
+project_proposed_strategy_scenario (see utils/scenario_specs.py). Results are
+checkpointed as they complete; rerunning the same command skips finished
+scenarios, so an interrupted run picks up where it stopped.
+"""
+import argparse
+import sys
+import time
+
+from utils.scenario_batch import SCENARIO_BATCH_OUTPUT, SCENARIO_BATCH_WORKERS, run_scenarios
+from utils.scenario_specs import load_specs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-run cost and strategy projections from a scenario file")
+    parser.add_argument("scenarios", help="CSV or YAML file of scenario definitions")
+    parser.add_argument("--output", default=SCENARIO_BATCH_OUTPUT, help="Parquet file for the combined results")
+    parser.add_argument("--workers", type=int, default=SCENARIO_BATCH_WORKERS, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, help="scenarios per task and checkpoint (default: automatic)")
+    parser.add_argument("--fresh", action="store_true", help="discard the checkpoint and rerun every scenario")
+    parser.add_argument("--keep-checkpoint", action="store_true", help="keep the checkpoint after a clean run")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = load_specs(args.scenarios)
+    except (OSError, ValueError, ImportError) as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    started = time.time()
+
+    def on_progress(done, total, failed):
+        elapsed = time.time() - started
+        rate = done / elapsed if elapsed > 0 else 0
+        eta = f", ETA {(total - done) / rate:.0f}s" if rate and done < total else ""
+        failures = f", {failed} failed" if failed else ""
+        print(f"[{done}/{total}] {rate:.1f} scenarios/s{eta}{failures}", flush=True)
+
+    summary = run_scenarios(
+        specs, args.output, max_workers=args.workers, chunk_size=args.chunk_size, fresh=args.fresh,
+        keep_checkpoint=args.keep_checkpoint, on_progress=on_progress
+    )
+
+    if summary["discarded_checkpoint"]:
+        print("Discarded a checkpoint built from an older dataset version", file=sys.stderr)
+    for scenario, error in sorted(summary["failed"].items()):
+        print(f"failed    {scenario} {error}", file=sys.stderr)
+    print(
+        f"{summary['completed']} computed, {summary['skipped']} resumed from checkpoint, "
+        f"{len(summary['failed'])} failed -> {summary['output']} ({summary['rows']} rows, "
+        f"{time.time() - started:.1f}s)"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
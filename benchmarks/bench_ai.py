@@ -0,0 +1,215 @@
+"""Drive concurrent AI-page requests through the offline stub backend.
+
+    python benchmarks/bench_ai.py --sessions 20 --requests 5 --unique-prompts 8 --error-rate 0.05
+
+Each simulated session issues a mix of the AI page calls (streamed policy
+recommendations, streamed reports and parallel strategy sections). The run
+reports end-to-end and time-to-first-chunk latency, throughput, scheduler queue
+depth, response-cache hits and single-flight coalescing, with no network access.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ACTIONS = ["policy", "report", "strategy_sections"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AI code paths against the stub backend")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent simulated sessions")
+    parser.add_argument("--requests", type=int, default=5, help="requests issued by each session")
+    parser.add_argument("--rounds", type=int, default=1, help="repeat the workload to measure a warm cache")
+    parser.add_argument("--unique-prompts", type=int, default=8, help="distinct inputs per action")
+    parser.add_argument("--latency", type=float, default=0.5, help="stub time to first token (s)")
+    parser.add_argument("--tps", type=float, default=200, help="stub tokens per second")
+    parser.add_argument("--response-tokens", type=int, default=300, help="stub response length")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub calls that fail")
+    parser.add_argument("--rpm", type=float, default=600, help="requests per minute allowed per provider")
+    parser.add_argument("--tpm", type=float, default=2_000_000, help="tokens per minute allowed per provider")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args, cache_dir):
+    # module-level settings are read at import time, so this must run before importing utils
+    os.environ.update({
+        "AI_BACKEND": "stub",
+        "AI_CACHE_PATH": os.path.join(cache_dir, "responses.sqlite3"),
+        "AI_STUB_LATENCY": str(args.latency),
+        "AI_STUB_TOKENS_PER_SECOND": str(args.tps),
+        "AI_STUB_RESPONSE_TOKENS": str(args.response_tokens),
+        "AI_STUB_ERROR_RATE": str(args.error_rate),
+        "OPENAI_RPM": str(args.rpm),
+        "OPENAI_TPM": str(args.tpm),
+        "GEMINI_RPM": str(args.rpm),
+        "GEMINI_TPM": str(args.tpm),
+    })
+
+
+def percentiles(values):
+    if not values:
+        return {"count": 0}
+    values = np.asarray(values)
+    return {
+        "count": int(values.size),
+        "mean": round(float(values.mean()), 4),
+        "p50": round(float(np.percentile(values, 50)), 4),
+        "p95": round(float(np.percentile(values, 95)), 4),
+        "p99": round(float(np.percentile(values, 99)), 4),
+        "max": round(float(values.max()), 4),
+    }
+
+
+def run_workload(args):
+    from utils.ai_helper_gemini import AIHealthcareAnalyst
+    from utils.ai_helper_openai import generate_ai_strategy_sections
+    from utils.llm_scheduler import scheduler_stats
+    from utils.prompt_builder import category_summary, policy_scenario_data
+    from utils.report_batch import REPORT_SCENARIOS, REPORT_TYPES, default_strategy_params, report_results_data
+
+    analyst = AIHealthcareAnalyst()
+    strategy_params = default_strategy_params()
+    category_data = category_summary()
+
+    def call(action, variant):
+        """Run one request; returns time to first chunk for streamed calls"""
+        started = time.perf_counter()
+        if action == "strategy_sections":
+            generate_ai_strategy_sections(**dict(strategy_params, timeline=5 + variant))
+            return None
+        if action == "policy":
+            stream = analyst.stream_policy_recommendations(
+                policy_scenario_data(REPORT_SCENARIOS[variant % len(REPORT_SCENARIOS)], 5 + variant),
+                category_data
+            )
+        else:
+            report_types = list(REPORT_TYPES)
+            scenario = REPORT_SCENARIOS[variant % len(REPORT_SCENARIOS)]
+            stream = analyst.stream_executive_report(
+                {"years": 5 + variant, "strategy_type": scenario, "budget": 150_000},
+                report_results_data(scenario),
+                report_types[variant % len(report_types)]
+            )
+        first_chunk = None
+        for _ in stream:
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+        return first_chunk
+
+    results = []
+    results_lock = threading.Lock()
+    max_queue_depth = {}
+    stop_sampling = threading.Event()
+
+    def sample_queues():
+        while not stop_sampling.is_set():
+            for provider, stats in scheduler_stats().items():
+                max_queue_depth[provider] = max(max_queue_depth.get(provider, 0), stats["queue_depth"])
+            time.sleep(0.02)
+
+    def session(index):
+        rng = random.Random(args.seed * 1000 + index)
+        for _ in range(args.requests):
+            action = rng.choice(ACTIONS)
+            variant = rng.randrange(args.unique_prompts)
+            started = time.perf_counter()
+            error = None
+            first_chunk = None
+            try:
+                first_chunk = call(action, variant)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            with results_lock:
+                results.append({
+                    "action": action,
+                    "latency": time.perf_counter() - started,
+                    "first_chunk": first_chunk,
+                    "error": error,
+                })
+
+    sampler = threading.Thread(target=sample_queues, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(args.sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_time = time.perf_counter() - started
+    stop_sampling.set()
+    sampler.join()
+    return results, wall_time, max_queue_depth
+
+
+def summarize(results, wall_time, max_queue_depth):
+    from utils.llm_providers import PROVIDER_REGISTRY
+    from utils.llm_scheduler import scheduler_stats
+    from utils.response_cache import get_response_cache
+    from utils.single_flight import AI_SINGLE_FLIGHT
+
+    ok = [r for r in results if r["error"] is None]
+    stub_calls = {"calls": 0, "errors": 0}
+    for key, backend in PROVIDER_REGISTRY.items():
+        if key[0] == "backend" and hasattr(backend, "stats"):
+            for name, value in backend.stats().items():
+                stub_calls[name] += value
+
+    return {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(len(results) / wall_time, 3) if wall_time else None,
+        "latency_s": percentiles([r["latency"] for r in ok]),
+        "first_chunk_s": percentiles([r["first_chunk"] for r in ok if r["first_chunk"] is not None]),
+        "by_action": {
+            action: percentiles([r["latency"] for r in ok if r["action"] == action]) for action in ACTIONS
+        },
+        "max_queue_depth": max_queue_depth,
+        "scheduler": scheduler_stats(),
+        "response_cache": get_response_cache().stats(),
+        "single_flight": AI_SINGLE_FLIGHT.stats(),
+        "stub_backend": stub_calls,
+        "sample_errors": sorted({r["error"] for r in results if r["error"]})[:5],
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="bench_ai_") as cache_dir:
+        configure_environment(args, cache_dir)
+        rounds = []
+        for round_index in range(args.rounds):
+            results, wall_time, max_queue_depth = run_workload(args)
+            summary = summarize(results, wall_time, max_queue_depth)
+            summary["round"] = round_index + 1
+            rounds.append(summary)
+            latency = summary["latency_s"]
+            print(
+                f"round {round_index + 1}: {summary['requests']} requests in {summary['wall_time_s']}s "
+                f"({summary['throughput_rps']} req/s), p50 {latency.get('p50')}s p95 {latency.get('p95')}s, "
+                f"errors {summary['errors']}, cache hits {summary['response_cache']['hits']}, "
+                f"coalesced {summary['single_flight']['coalesced_calls']}, "
+                f"max queue depth {summary['max_queue_depth']}"
+            )
+
+    output = {"config": vars(args), "rounds": rounds}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2)
+    else:
+        print(json.dumps(rounds[-1], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
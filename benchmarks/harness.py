@@ -0,0 +1,207 @@
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+
+class BenchmarkCase:
+    """One timed call. `setup` runs before every repeat and is not timed.
+
+    `hot` marks the paths guarded by the regression gate.
+    """
+
+    def __init__(self, name, fn, size="default", setup=None, hot=False):
+        self.name = name
+        self.fn = fn
+        self.size = size
+        self.setup = setup
+        self.hot = hot
+
+    @property
+    def key(self):
+        return f"{self.name}[{self.size}]"
+
+
+def median_ci(times, confidence=0.95, resamples=2000, seed=0):
+    """Bootstrap confidence interval for the median of `times`"""
+    if len(times) < 2:
+        return times[0], times[0]
+    rng = np.random.default_rng(seed)
+    samples = rng.choice(np.asarray(times), size=(resamples, len(times)), replace=True)
+    medians = np.median(samples, axis=1)
+    tail = (1 - confidence) / 2 * 100
+    return float(np.percentile(medians, tail)), float(np.percentile(medians, 100 - tail))
+
+
+def _time_once(case):
+    if case.setup is not None:
+        case.setup()
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        case.fn()
+        return time.perf_counter() - started
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _measure_memory(case):
+    if case.setup is not None:
+        case.setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        before = tracemalloc.take_snapshot()
+        result = case.fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    growth = [stat for stat in after.compare_to(before, "filename") if stat.size_diff > 0]
+    return {
+        "alloc_blocks": sum(max(stat.count_diff, 0) for stat in growth),
+        "alloc_bytes": sum(stat.size_diff for stat in growth),
+        "peak_bytes": peak - baseline,
+    }
+
+
+def summarize_times(case, times):
+    low, high = median_ci(times)
+    return {
+        "name": case.name,
+        "size": case.size,
+        "hot": case.hot,
+        "repeats": len(times),
+        "times_s": [round(t, 6) for t in times],
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "min_s": min(times),
+        "stdev_s": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "ci95_s": [low, high],
+    }
+
+
+def measure(case, repeats=5, warmup=1, track_memory=True):
+    """Time `case` `repeats` times after `warmup` untimed calls.
+
+    Memory is measured in a separate traced call, since tracemalloc slows the
+    code under test. `alloc_*` is what the call left allocated (including its
+    result); `peak_bytes` is the traced high-water mark during the call.
+    """
+    for _ in range(warmup):
+        _time_once(case)
+    result = summarize_times(case, [_time_once(case) for _ in range(repeats)])
+    if track_memory:
+        result.update(_measure_memory(case))
+    return result
+
+
+def run_cases(cases, repeats=5, warmup=1, track_memory=True, on_result=None):
+    results = {}
+    for case in cases:
+        result = measure(case, repeats=repeats, warmup=warmup, track_memory=track_memory)
+        results[case.key] = result
+        if on_result is not None:
+            on_result(case, result)
+    return results
+
+
+def _calibration_workload():
+    # fixed mix of interpreter, numpy and pandas work used to gauge machine speed
+    total = 0
+    for i in range(20_000):
+        total += i * i % 7
+    frame = pd.DataFrame({"a": np.arange(20_000) % 97, "b": np.arange(20_000, dtype=float)})
+    frame.groupby("a")["b"].sum()
+    np.sort(np.random.default_rng(0).random(50_000))
+    return total
+
+
+CALIBRATION_CASE = BenchmarkCase("calibration", _calibration_workload)
+
+
+def run_cases_interleaved(cases, repeats=9, warmup=1):
+    """Time cases round-robin so transient machine slowdowns spread across every case.
+
+    A fixed calibration workload is timed in every round; its median is
+    returned alongside the results so runs on differently loaded machines can
+    be normalised against each other.
+    """
+    cases = list(cases) + [CALIBRATION_CASE]
+    for case in cases:
+        for _ in range(warmup):
+            _time_once(case)
+    times = {case.key: [] for case in cases}
+    for _ in range(repeats):
+        for case in cases:
+            times[case.key].append(_time_once(case))
+    calibration = statistics.median(times.pop(CALIBRATION_CASE.key))
+    results = {case.key: summarize_times(case, times[case.key]) for case in cases if case is not CALIBRATION_CASE}
+    return results, calibration
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata():
+    from data.india_healthcare_data import DATA_VERSION
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": _git_commit(),
+        "data_version": DATA_VERSION,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+    }
+
+
+def write_results(path, metadata, results):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"metadata": metadata, "results": results}, f, indent=2)
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_bytes(num):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num) < 1024 or unit == "GB":
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+
+
+def format_table(rows, headers):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    lines = ["  ".join(str(value).ljust(width) for value, width in zip(headers, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    for row in rows:
+        lines.append("  ".join(str(value).ljust(width) for value, width in zip(row, widths)))
+    return "\n".join(lines)
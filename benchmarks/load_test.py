@@ -0,0 +1,303 @@
+"""Load-test a local Streamlit server with concurrent headless sessions.
+
+    python benchmarks/load_test.py --sessions 1,2,4,8 --steps 30 --think-ms 250
+
+Starts `streamlit run app.py` with the stub AI backend and, for each session
+count, connects that many websocket clients. Each one follows a page flow that
+mostly drags the Cost Calculator and Scenario Comparison sliders, with the odd
+visit to another page. Clients speak Streamlit's browser protocol, so every step
+is a real rerun on the server. For each level the run reports rerun latency
+percentiles (request sent to script finished), throughput, errors and the
+server's resident memory.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.bench_ai import percentiles
+
+PAGE_RADIO = "Select Module"
+COST_PAGE = "💰 Cost Calculator"
+SCENARIO_PAGE = "📈 Scenario Comparison"
+
+# Sliders dragged on each page; other pages are only visited
+SLIDERS = {
+    COST_PAGE: [
+        "Target Gap Closure (%)",
+        "Timeline (Years)",
+        "Training Cost Adjustment",
+        "Annual Inflation Rate (%)",
+        "Annual Salary Growth Rate (%)",
+        "Infrastructure Investment (%)",
+    ],
+    SCENARIO_PAGE: [
+        "Training Capacity Increase",
+        "Infrastructure Investment",
+        "Retention Improvement",
+        "Projection Timeline (Years)",
+    ],
+}
+
+FINISHED_EARLY_FOR_RERUN = 2
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with concurrent websocket sessions")
+    parser.add_argument("--sessions", default="1,2,4,8", help="comma-separated concurrent session counts")
+    parser.add_argument("--steps", type=int, default=20, help="reruns issued by each session per level")
+    parser.add_argument("--think-ms", type=float, default=200, help="mean pause between a session's reruns")
+    parser.add_argument("--slider-share", type=float, default=0.8,
+                        help="fraction of steps that drag a slider rather than switch page")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--startup-timeout", type=float, default=60, help="seconds to wait for the server")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    return parser.parse_args(argv)
+
+
+def server_environment(cache_dir):
+    env = dict(os.environ)
+    env.update({
+        "AI_BACKEND": "stub",
+        "AI_CACHE_PATH": os.path.join(cache_dir, "responses.sqlite3"),
+        "PYTHONUNBUFFERED": "1",
+    })
+    return env
+
+
+def start_server(args, cache_dir):
+    command = [
+        sys.executable, "-m", "streamlit", "run", os.path.join(ROOT_DIR, "app.py"),
+        "--server.headless", "true",
+        "--server.port", str(args.port),
+        "--server.address", "127.0.0.1",
+        "--browser.gatherUsageStats", "false",
+    ]
+    log = open(os.path.join(cache_dir, "server.log"), "w", encoding="utf-8")
+    server = subprocess.Popen(command, cwd=ROOT_DIR, env=server_environment(cache_dir),
+                              stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Streamlit exited with code {server.returncode}; see {log.name}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{args.port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"Streamlit did not become healthy within {args.startup_timeout}s")
+
+
+def rss_bytes(pid):
+    """Resident set size of `pid` from /proc; None where that is unavailable"""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+class Session:
+    """One browser tab: a websocket to the server and the widget state it would send"""
+
+    def __init__(self, url):
+        self.url = url
+        self.page = None
+        self.widgets = {}
+        self.elements = {}
+        self._socket = None
+
+    async def connect(self):
+        import websockets
+
+        self._socket = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self._socket is not None:
+            await self._socket.close()
+
+    def set_page(self, page):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        radio = self.elements[PAGE_RADIO]
+        self.widgets[radio.id] = WidgetState(id=radio.id, string_value=page)
+        self.page = page
+
+    def set_slider(self, label, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        slider = self.elements[label]
+        state = WidgetState(id=slider.id)
+        state.double_array_value.data.append(value)
+        self.widgets[slider.id] = state
+
+    async def rerun(self):
+        """Request a rerun with the current widget state; returns (seconds, error or None)"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.widget_states.widgets.extend(self.widgets.values())
+        started = time.perf_counter()
+        await self._socket.send(message.SerializeToString())
+
+        elements = {}
+        error = None
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self._socket.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in ("slider", "radio"):
+                    widget = getattr(element, element_type)
+                    elements[widget.label] = widget
+                elif element_type == "exception" and error is None:
+                    error = f"{element.exception.type}: {element.exception.message}"
+            elif kind == "script_finished" and forward.script_finished != FINISHED_EARLY_FOR_RERUN:
+                break
+        elapsed = time.perf_counter() - started
+        self.elements = elements
+        if self.page is None and PAGE_RADIO in elements:
+            radio = elements[PAGE_RADIO]
+            self.page = radio.options[radio.default]
+        return elapsed, error
+
+
+def next_action(session, rng, slider_share):
+    """Pick the next step: mostly a slider drag on a calculator page, sometimes a page switch"""
+    sliders = [label for label in SLIDERS.get(session.page, []) if label in session.elements]
+    if sliders and rng.random() < slider_share:
+        label = rng.choice(sliders)
+        slider = session.elements[label]
+        steps = int(round((slider.max - slider.min) / slider.step))
+        value = slider.min + rng.randint(0, steps) * slider.step
+        session.set_slider(label, value)
+        return "slider", label
+    # calculator pages dominate the flow, other pages are occasional detours
+    pages = list(session.elements[PAGE_RADIO].options)
+    weights = [6 if option in SLIDERS else 1 for option in pages]
+    target = rng.choices(pages, weights)[0]
+    session.set_page(target)
+    return "page", target
+
+
+async def run_session(index, args, url, results):
+    rng = random.Random(f"{args.seed}-{index}")
+    session = Session(url)
+    await session.connect()
+    try:
+        await session.rerun()
+        session.set_page(rng.choice(list(SLIDERS)))
+        for _ in range(args.steps):
+            await asyncio.sleep(rng.expovariate(1000 / args.think_ms) if args.think_ms > 0 else 0)
+            action, target = next_action(session, rng, args.slider_share)
+            latency, error = await session.rerun()
+            results.append({"session": index, "action": action, "target": target,
+                            "latency": latency, "error": error})
+    finally:
+        await session.close()
+
+
+async def run_level(sessions, args, url):
+    results = []
+    started = time.perf_counter()
+    await asyncio.gather(*(run_session(index, args, url, results) for index in range(sessions)))
+    return results, time.perf_counter() - started
+
+
+async def warm_up(url):
+    """Visit every page once so import and first-render costs don't land in the first level"""
+    session = Session(url)
+    await session.connect()
+    try:
+        await session.rerun()
+        for page in session.elements[PAGE_RADIO].options:
+            session.set_page(page)
+            await session.rerun()
+    finally:
+        await session.close()
+
+
+def summarize(sessions, results, wall_time, rss_before, rss_after):
+    ok = [r for r in results if r["error"] is None]
+    mb = 1024 * 1024
+    return {
+        "sessions": sessions,
+        "reruns": len(results),
+        "errors": len(results) - len(ok),
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(len(results) / wall_time, 3) if wall_time else None,
+        "latency_s": percentiles([r["latency"] for r in ok]),
+        "by_action": {
+            action: percentiles([r["latency"] for r in ok if r["action"] == action]) for action in ("slider", "page")
+        },
+        "server_rss_mb": {
+            "before": round(rss_before / mb, 1) if rss_before else None,
+            "after": round(rss_after / mb, 1) if rss_after else None,
+            "per_session": round((rss_after - rss_before) / mb / sessions, 2) if rss_before and rss_after else None,
+        },
+        "sample_errors": sorted({r["error"] for r in results if r["error"]})[:5],
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        import websockets  # noqa: F401
+    except ImportError:
+        print("The load test needs the 'websockets' package: pip install websockets", file=sys.stderr)
+        return 1
+
+    levels = [int(value) for value in args.sessions.split(",") if value.strip()]
+    url = f"ws://127.0.0.1:{args.port}/_stcore/stream"
+    summaries = []
+    with tempfile.TemporaryDirectory(prefix="load_test_") as cache_dir:
+        server = start_server(args, cache_dir)
+        try:
+            asyncio.run(warm_up(url))
+            for sessions in levels:
+                rss_before = rss_bytes(server.pid)
+                results, wall_time = asyncio.run(run_level(sessions, args, url))
+                summary = summarize(sessions, results, wall_time, rss_before, rss_bytes(server.pid))
+                summaries.append(summary)
+                latency = summary["latency_s"]
+                memory = summary["server_rss_mb"]
+                print(
+                    f"{sessions:>3} sessions: {summary['reruns']} reruns in {summary['wall_time_s']}s "
+                    f"({summary['throughput_rps']} reruns/s), p50 {latency.get('p50')}s "
+                    f"p95 {latency.get('p95')}s p99 {latency.get('p99')}s, errors {summary['errors']}, "
+                    f"server RSS {memory['before']} -> {memory['after']} MB"
+                )
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    output = {"config": vars(args), "levels": summaries}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(summaries[-1], indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Performance regression gate for the hot paths.
+
+    python benchmarks/regress.py                  # compare against benchmarks/baseline.json
+    python benchmarks/regress.py --update-baseline
+
+Runs the benchmark cases marked hot (calculate_cost_projection, the
+project_*_scenario functions, get_region_summary and the chart/map builders)
+with interleaved repeats and compares each median with the committed
+baseline, after normalising for machine speed with a calibration workload. A case
+counts as regressed only when its median is slower than the baseline by more
+than --threshold and --min-delta-ms, and the two 95% confidence intervals do
+not overlap, so run-to-run noise does not fail the gate. Exits 1 on any
+regression.
+
+Baselines are machine specific; refresh the baseline on the machine that runs
+the gate.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import ROOT_DIR, format_table, load_results, run_cases_interleaved, run_metadata, write_results
+from benchmarks.suite import build_cases
+
+BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA_MS = 0.5
+
+REGRESSED = "REGRESSED"
+IMPROVED = "improved"
+OK = "ok"
+NEW = "new"
+MISSING = "missing"
+
+
+def _scaled(result, factor):
+    return dict(
+        result,
+        median_s=result["median_s"] * factor,
+        ci95_s=[bound * factor for bound in result["ci95_s"]]
+    )
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta_ms=DEFAULT_MIN_DELTA_MS, speed_factor=1.0):
+    """Per-case comparison rows: {case, baseline_ms, current_ms, change_pct, status}.
+
+    Baseline timings are multiplied by `speed_factor` (current / baseline
+    calibration time) so a uniformly slower or faster machine is not reported
+    as a change.
+    """
+    rows = []
+    for key in sorted(set(baseline) | set(current)):
+        base, cur = baseline.get(key), current.get(key)
+        if base is not None:
+            base = _scaled(base, speed_factor)
+        if cur is None:
+            rows.append({"case": key, "baseline_ms": base["median_s"] * 1000, "current_ms": None,
+                         "change_pct": None, "status": MISSING})
+            continue
+        if base is None:
+            rows.append({"case": key, "baseline_ms": None, "current_ms": cur["median_s"] * 1000,
+                         "change_pct": None, "status": NEW})
+            continue
+
+        delta_ms = (cur["median_s"] - base["median_s"]) * 1000
+        ratio = cur["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        separated_up = cur["ci95_s"][0] > base["ci95_s"][1]
+        separated_down = cur["ci95_s"][1] < base["ci95_s"][0]
+
+        status = OK
+        if ratio > 1 + threshold and delta_ms > min_delta_ms and separated_up:
+            status = REGRESSED
+        elif ratio < 1 - threshold and -delta_ms > min_delta_ms and separated_down:
+            status = IMPROVED
+        rows.append({
+            "case": key,
+            "baseline_ms": base["median_s"] * 1000,
+            "current_ms": cur["median_s"] * 1000,
+            "current_ci_ms": [bound * 1000 for bound in cur["ci95_s"]],
+            "change_pct": (ratio - 1) * 100,
+            "status": status,
+        })
+    return rows
+
+
+def format_comparison(rows):
+    def ms(value):
+        return "-" if value is None else f"{value:.2f}"
+
+    table_rows = [
+        [
+            row["case"],
+            ms(row["baseline_ms"]),
+            ms(row["current_ms"]),
+            "-" if "current_ci_ms" not in row else f"{row['current_ci_ms'][0]:.2f}-{row['current_ci_ms'][1]:.2f}",
+            "-" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%",
+            row["status"],
+        ]
+        for row in rows
+    ]
+    return format_table(table_rows, ["case", "baseline ms", "current ms", "current 95% CI", "change", "status"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail when hot paths are slower than the committed baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the new baseline")
+    parser.add_argument("--repeats", type=int, default=9)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction of the baseline median (default 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--output", help="also write the current results and comparison as JSON")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(name_filter=args.filter, hot_only=True)
+    print(f"Running {len(cases)} hot-path benchmarks x {args.repeats} repeats...", flush=True)
+    current, calibration = run_cases_interleaved(cases, repeats=args.repeats, warmup=args.warmup)
+    metadata = dict(run_metadata(), calibration_s=calibration)
+
+    if args.update_baseline:
+        write_results(args.baseline, metadata, current)
+        print(f"Baseline updated: {args.baseline} ({len(current)} cases)")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first", file=sys.stderr)
+        return 2
+
+    baseline = load_results(args.baseline)
+    baseline_results = baseline["results"]
+    if args.filter:
+        baseline_results = {key: value for key, value in baseline_results.items() if args.filter in value["name"]}
+
+    for field in ("platform", "processor", "python"):
+        if baseline["metadata"].get(field) != metadata.get(field):
+            print(f"warning: baseline {field} {baseline['metadata'].get(field)!r} differs from "
+                  f"{metadata.get(field)!r}; timings may not be comparable", file=sys.stderr)
+
+    speed_factor = 1.0
+    if baseline["metadata"].get("calibration_s"):
+        speed_factor = calibration / baseline["metadata"]["calibration_s"]
+        print(f"Machine speed factor vs baseline: {speed_factor:.2f}x (calibration workload)")
+
+    rows = compare(baseline_results, current, threshold=args.threshold, min_delta_ms=args.min_delta_ms,
+                   speed_factor=speed_factor)
+    print(format_comparison(rows))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"metadata": metadata, "results": current, "comparison": rows}, f, indent=2)
+
+    regressed = [row["case"] for row in rows if row["status"] == REGRESSED]
+    if regressed:
+        print(f"\n{len(regressed)} hot path(s) regressed beyond {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%} (baseline commit {baseline['metadata'].get('git_commit')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Benchmark every public data function and chart/map builder at default and scaled sizes.
+
+    python benchmarks/suite.py [--repeats 5] [--filter projection] [--sizes default,scaled]
+                               [--no-memory] [--output benchmarks/results/run.json]
+
+Reports median wall time, allocations and peak traced memory per case and
+writes the full results (including every repeat) as JSON for later comparison.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import (
+    RESULTS_DIR, BenchmarkCase, format_bytes, format_table, run_cases, run_metadata, write_results
+)
+from data import india_healthcare_data as data
+from utils import charts, maps
+from utils.figure_cache import FIGURE_CACHE
+
+SIZES = ("default", "scaled")
+
+# (default, scaled) inputs
+PROJECTION_YEARS = (10, 100)
+PROJECTION_BATCH = (64, 1024)
+SCENARIO_YEARS = (15, 150)
+ENSEMBLE_RUNS = (200, 5000)
+STATE_REPLICAS = (1, 50)
+CLUSTER_POINTS = (None, 100_000)
+FORMAT_NUMBERS = (1, 10_000)
+
+
+def scaled_state_dataframe(replicas, seed=0):
+    """The state table repeated `replicas` times with jittered coordinates and unique names"""
+    state_df = data.get_state_dataframe()
+    if replicas == 1:
+        return state_df
+    rng = np.random.default_rng(seed)
+    copies = []
+    for replica in range(replicas):
+        copy = state_df.copy()
+        copy["State"] = copy["State"] + f" #{replica}"
+        copy["Latitude"] = copy["Latitude"] + rng.normal(0, 0.5, len(copy))
+        copy["Longitude"] = copy["Longitude"] + rng.normal(0, 0.5, len(copy))
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def synthetic_points(count, seed=0):
+    """Facility-level points scattered over India's bounding box"""
+    rng = np.random.default_rng(seed)
+    required = rng.integers(50, 500, count)
+    current = (required * rng.uniform(0.2, 0.9, count)).astype(int)
+    return pd.DataFrame({
+        "Name": [f"Facility {i}" for i in range(count)],
+        "Latitude": rng.uniform(8, 35, count),
+        "Longitude": rng.uniform(68, 97, count),
+        "Current AHP": current,
+        "Required AHP": required,
+        "Gap": required - current,
+    })
+
+
+def _data_cases():
+    cases = [
+        BenchmarkCase(fn.__name__, fn, hot=fn is data.get_region_summary)
+        for fn in (
+            data.get_category_dataframe,
+            data.get_state_dataframe,
+            data.get_region_summary,
+            data.get_budget_trend_dataframe,
+            data.get_funding_sources_dataframe,
+            data.get_global_comparison_dataframe,
+            data.get_strategy_summary,
+        )
+    ]
+    for size, years in zip(SIZES, PROJECTION_YEARS):
+        cases.append(BenchmarkCase(
+            "calculate_cost_projection", lambda years=years: data.calculate_cost_projection(75, years),
+            size=size, hot=True
+        ))
+    for size, count in zip(SIZES, PROJECTION_BATCH):
+        param_sets = [{"target_gap_closure_pct": 50 + i % 51, "years": 10} for i in range(count)]
+        cases.append(BenchmarkCase(
+            "calculate_cost_projection_batch",
+            lambda param_sets=param_sets: data.calculate_cost_projection_batch(param_sets), size=size
+        ))
+    for size, years in zip(SIZES, SCENARIO_YEARS):
+        for fn in (data.project_baseline_scenario, data.project_no_intervention_scenario,
+                   data.project_proposed_strategy_scenario):
+            cases.append(BenchmarkCase(fn.__name__, lambda fn=fn, years=years: fn(years=years), size=size, hot=True))
+        cases.append(BenchmarkCase(
+            "get_scenario_comparison", lambda years=years: data.get_scenario_comparison(years), size=size
+        ))
+    for size, runs in zip(SIZES, ENSEMBLE_RUNS):
+        cases.append(BenchmarkCase(
+            "project_proposed_strategy_ensemble",
+            lambda runs=runs: data.project_proposed_strategy_ensemble(runs=runs), size=size
+        ))
+    for size, count in zip(SIZES, FORMAT_NUMBERS):
+        numbers = [12_345_678 * (i + 1) for i in range(count)]
+        for fn in (data.format_indian_number, data.format_large_number):
+            cases.append(BenchmarkCase(
+                fn.__name__, lambda fn=fn, numbers=numbers: [fn(n) for n in numbers], size=size
+            ))
+    return cases
+
+
+def _chart_cases():
+    # every builder is memoized, so the cache is cleared before each repeat to time a cold build
+    def case(name, fn, size="default"):
+        return BenchmarkCase(name, fn, size=size, setup=FIGURE_CACHE.clear, hot=True)
+
+    cases = [
+        case(builder.__name__, builder)
+        for builder in (
+            charts.create_3d_crisis_gauge,
+            charts.create_interactive_category_chart,
+            charts.create_budget_trend_chart,
+            charts.create_funding_waterfall,
+            charts.create_global_comparison_chart,
+        )
+    ]
+    for size, years, runs in zip(SIZES, SCENARIO_YEARS, ENSEMBLE_RUNS):
+        scenario_df = data.get_scenario_comparison(years)
+        ensemble_df = data.project_proposed_strategy_ensemble(years=years, runs=runs)
+        cases.append(case("create_3d_scenario_comparison",
+                          lambda df=scenario_df: charts.create_3d_scenario_comparison(df), size))
+        cases.append(case("create_scenario_comparison_chart",
+                          lambda df=scenario_df: charts.create_scenario_comparison_chart(df), size))
+        cases.append(case("create_scenario_fan_chart",
+                          lambda e=ensemble_df, s=scenario_df: charts.create_scenario_fan_chart(e, s), size))
+    for size, years in zip(SIZES, (10, 200)):
+        cost_df = data.calculate_cost_projection(75, years)
+        cases.append(case("create_cost_breakdown_chart",
+                          lambda df=cost_df: charts.create_cost_breakdown_chart(df), size))
+        cases.append(case("create_cumulative_cost_chart",
+                          lambda df=cost_df: charts.create_cumulative_cost_chart(df), size))
+    for size, replicas, points in zip(SIZES, STATE_REPLICAS, CLUSTER_POINTS):
+        state_df = scaled_state_dataframe(replicas)
+        point_df = state_df if points is None else synthetic_points(points)
+        cases.append(case("create_state_gap_map", lambda df=state_df: maps.create_state_gap_map(df), size))
+        cases.append(case("get_state_gap_map_html", lambda df=state_df: maps.get_state_gap_map_html(df), size))
+        cases.append(case("create_gap_cluster_map", lambda df=point_df: maps.create_gap_cluster_map(df), size))
+    return cases
+
+
+def build_cases(sizes=SIZES, name_filter=None, hot_only=False):
+    cases = _data_cases() + _chart_cases()
+    return [
+        case for case in cases
+        if case.size in sizes
+        and (not name_filter or name_filter in case.name)
+        and (case.hot or not hot_only)
+    ]
+
+
+def summary_rows(results):
+    rows = []
+    for key, result in results.items():
+        rows.append([
+            key,
+            f"{result['median_s'] * 1000:.2f}",
+            f"{result['ci95_s'][0] * 1000:.2f}-{result['ci95_s'][1] * 1000:.2f}",
+            result.get("alloc_blocks", "-"),
+            format_bytes(result["alloc_bytes"]) if "alloc_bytes" in result else "-",
+            format_bytes(result["peak_bytes"]) if "peak_bytes" in result else "-",
+        ])
+    return rows
+
+
+SUMMARY_HEADERS = ["case", "median ms", "95% CI ms", "alloc blocks", "alloc", "peak"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data functions and chart builders")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated: default,scaled")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="results JSON path (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(sizes=tuple(args.sizes.split(",")), name_filter=args.filter)
+
+    def on_result(case, result):
+        print(f"{case.key:<50} {result['median_s'] * 1000:10.2f} ms", flush=True)
+
+    results = run_cases(
+        cases, repeats=args.repeats, warmup=args.warmup, track_memory=not args.no_memory, on_result=on_result
+    )
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    write_results(output, run_metadata(), results)
+
+    print()
+    print(format_table(summary_rows(results), SUMMARY_HEADERS))
+    print(f"\nWrote {len(results)} results to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
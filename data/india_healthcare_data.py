@@ -1,6 +1,12 @@
+import hashlib
+import inspect
+import json
+
 import pandas as pd
 import numpy as np
 
+from utils.perf import timed
+
 TOTAL_GAP = 6_500_000
 
 AHP_CATEGORIES = {
@@ -1017,6 +1023,22 @@ DATA_SOURCES = [
 ]
 
 
+def _compute_data_version():
+    payload = json.dumps(
+        [TOTAL_GAP, AHP_CATEGORIES, STATE_DATA, DEMOGRAPHIC_DATA, WHO_BENCHMARKS,
+         REGION_DATA, TRAINING_INFRASTRUCTURE, CURRENT_FUNDING, INDIA_BUDGET_TREND,
+         GLOBAL_HEALTH_SPENDING_COMPARISON, FUNDING_SOURCES, STRATEGY_PORTFOLIO],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+# Changes whenever any of the datasets above is edited; used to key caches.
+DATA_VERSION = _compute_data_version()
+
+
+@timed
 def get_category_dataframe():
     data = []
     for category, info in AHP_CATEGORIES.items():
@@ -1035,6 +1057,7 @@ def get_category_dataframe():
     return pd.DataFrame(data)
 
 
+@timed
 def get_state_dataframe():
     data = []
     for state, info in STATE_DATA.items():
@@ -1057,6 +1080,7 @@ def get_state_dataframe():
     return pd.DataFrame(data)
 
 
+@timed
 def get_region_summary():
     region_data = []
     for region, states in REGION_DATA.items():
@@ -1082,6 +1106,7 @@ def get_region_summary():
     return pd.DataFrame(region_data)
 
 
+@timed
 def calculate_cost_projection(
     target_gap_closure_pct: float,
     years: int,
@@ -1151,6 +1176,89 @@ def calculate_cost_projection(
     return pd.DataFrame(yearly_costs)
 
 
+@timed
+def calculate_cost_projection_batch(param_sets):
+    """calculate_cost_projection for many parameter sets in one array computation.
+
+    Takes a list of keyword-argument dicts and returns one DataFrame per set,
+    equal to what calculate_cost_projection returns for it. Timelines may
+    differ; shorter ones are padded and trimmed. Sums run category by category
+    and growth factors use Python's pow so every value matches the loop exactly.
+    """
+    if not param_sets:
+        return []
+    signature = inspect.signature(calculate_cost_projection)
+    sets = []
+    for params in param_sets:
+        bound = signature.bind(**params)
+        bound.apply_defaults()
+        sets.append(bound.arguments)
+    if any(p["years"] < 1 for p in sets):
+        raise ValueError("years must be at least 1")
+
+    category_df = get_category_dataframe()
+    gap = category_df["Gap"].to_numpy()
+    total_gap = gap.sum()
+    share = gap / total_gap if total_gap > 0 else np.zeros(len(gap))
+    training_unit = category_df["Training Cost (₹)"].to_numpy(dtype=float)
+    salary_unit = category_df["Avg Salary (₹)"].to_numpy(dtype=float)
+
+    max_years = max(p["years"] for p in sets)
+    annual = np.array([int(TOTAL_GAP * (p["target_gap_closure_pct"] / 100)) // p["years"] for p in sets])
+    multiplier = np.array([p["training_cost_multiplier"] for p in sets], dtype=float)
+    infrastructure = np.array([p["infrastructure_investment_pct"] for p in sets], dtype=float)
+    retention = np.array([bool(p["include_retention"]) for p in sets])
+    inflation = np.array([[(1 + p["inflation_rate"]) ** k for k in range(max_years)] for p in sets])
+    growth = np.array([[(1 + p["salary_growth_rate"]) ** k for k in range(max_years)] for p in sets])
+
+    # (sets, categories): hires per category each year and their training cost before inflation
+    category_target = (annual[:, None] * share[None, :]).astype(np.int64)
+    training_base = category_target * (training_unit[None, :] * multiplier[:, None])
+    hired_before = annual[:, None] * np.arange(max_years)[None, :]
+
+    # (sets, years), accumulated one category at a time in the loop's order
+    training = np.zeros((len(sets), max_years))
+    salary = np.zeros((len(sets), max_years))
+    retention_cost = np.zeros((len(sets), max_years))
+    for c in range(len(gap)):
+        salary_with_growth = salary_unit[c] * growth
+        training = training + training_base[:, c, None] * inflation
+        salary = salary + category_target[:, c, None] * salary_with_growth
+        retention_cost = retention_cost + hired_before * share[c] * salary_with_growth * 0.15
+    retention_cost[~retention] = 0.0
+    infrastructure_cost = (training + salary) * infrastructure[:, None]
+    year_cost = training + salary + infrastructure_cost + retention_cost
+    cumulative_cost = np.cumsum(year_cost, axis=1)
+
+    def python_round(values, digits=2):
+        return [float(round(value, digits)) for value in values.tolist()]
+
+    frames = []
+    for b, p in enumerate(sets):
+        years = p["years"]
+        year = np.arange(1, years + 1)
+        hired = annual[b] * year
+        # retention terms are numpy scalars in the loop, so rows that include them round like np.round
+        round_total = (lambda values: np.round(values, 2).tolist()) if retention[b] else python_round
+        frames.append(pd.DataFrame({
+            "Year": year,
+            "Calendar Year": 2024 + year,
+            "Training Cost (₹ Cr)": python_round(training[b, :years] / 1e7),
+            "Salary Cost (₹ Cr)": python_round(salary[b, :years] / 1e7),
+            "Infrastructure Cost (₹ Cr)": python_round(infrastructure_cost[b, :years] / 1e7),
+            "Retention Cost (₹ Cr)": round_total(retention_cost[b, :years] / 1e7),
+            "Total Year Cost (₹ Cr)": round_total(year_cost[b, :years] / 1e7),
+            "Cumulative Cost (₹ Cr)": round_total(cumulative_cost[b, :years] / 1e7),
+            "Professionals Added": np.full(years, annual[b]),
+            "Cumulative Professionals": hired,
+            "Gap Remaining": TOTAL_GAP - hired,
+            "Gap Closure %": [float(round((h / TOTAL_GAP) * 100, 2)) for h in hired.tolist()],
+            "Inflation Factor": python_round(inflation[b, :years], 3)
+        }))
+    return frames
+
+
+@timed
 def get_budget_trend_dataframe():
     data = []
     for year, info in INDIA_BUDGET_TREND.items():
@@ -1165,6 +1273,7 @@ def get_budget_trend_dataframe():
     return pd.DataFrame(data)
 
 
+@timed
 def get_funding_sources_dataframe():
     data = []
     for source in FUNDING_SOURCES:
@@ -1181,6 +1290,7 @@ def get_funding_sources_dataframe():
     return pd.DataFrame(data)
 
 
+@timed
 def get_global_comparison_dataframe():
     data = []
     for country, info in GLOBAL_HEALTH_SPENDING_COMPARISON.items():
@@ -1193,6 +1303,7 @@ def get_global_comparison_dataframe():
     return pd.DataFrame(data)
 
 
+@timed
 def get_strategy_summary():
     summary = []
     for phase_key, phase_data in STRATEGY_PORTFOLIO.items():
@@ -1211,6 +1322,7 @@ def get_strategy_summary():
     return pd.DataFrame(summary)
 
 
+@timed
 def project_baseline_scenario(years: int = 15):
     current_annual_growth = 125_000
     current_gap = TOTAL_GAP
@@ -1229,6 +1341,7 @@ def project_baseline_scenario(years: int = 15):
     return pd.DataFrame(projections)
 
 
+@timed
 def project_no_intervention_scenario(years: int = 15):
     annual_decline_rate = 0.02
     current_production = 485_000 * 0.72
@@ -1253,12 +1366,14 @@ def project_no_intervention_scenario(years: int = 15):
     return pd.DataFrame(projections)
 
 
+@timed
 def project_proposed_strategy_scenario(
     years: int = 15,
     training_capacity_increase: float = 2.0,
     infrastructure_boost: float = 1.5,
     retention_improvement: float = 0.30
 ):
+    # infrastructure_boost is accepted for existing callers but is not part of the model
     base_production = 485_000 * 0.72
     enhanced_production = base_production * training_capacity_increase
     improved_attrition = 0.10 * (1 - retention_improvement)
@@ -1283,6 +1398,41 @@ def project_proposed_strategy_scenario(
     return pd.DataFrame(projections)
 
 
+@timed
+def project_proposed_strategy_ensemble(
+    years: int = 15,
+    runs: int = 200,
+    training_capacity_increase: float = 2.0,
+    retention_improvement: float = 0.30,
+    uncertainty: float = 0.15,
+    seed: int = 42
+):
+    rng = np.random.default_rng(seed)
+    training = np.clip(training_capacity_increase * rng.normal(1.0, uncertainty, runs), 0, None)
+    retention = np.clip(retention_improvement * rng.normal(1.0, uncertainty, runs), 0, 1)
+    
+    base_production = 485_000 * 0.72
+    enhanced_production = base_production * training
+    improved_attrition = 0.10 * (1 - retention)
+    
+    capacity_ramp = np.minimum(1.0, np.arange(years + 1) / 3)
+    year_production = base_production + np.outer(enhanced_production - base_production, capacity_ramp)
+    net_addition = np.floor(year_production * (1 - improved_attrition)[:, None])
+    
+    # Additions are never negative, so clamping the running total matches the year-by-year max(0, ...)
+    added_before = np.concatenate([np.zeros((runs, 1)), np.cumsum(net_addition[:, :-1], axis=1)], axis=1)
+    gap = np.maximum(0, TOTAL_GAP - added_before).astype(np.int64)
+    
+    return pd.DataFrame({
+        "Year": np.tile(2024 + np.arange(years + 1), runs),
+        "Scenario": "Proposed Strategy",
+        "Run": np.repeat(np.arange(runs), years + 1),
+        "Gap": gap.ravel(),
+        "Gap Closure %": np.round((TOTAL_GAP - gap.ravel()) / TOTAL_GAP * 100, 2)
+    })
+
+
+@timed
 def get_scenario_comparison(years: int = 15, **strategy_params):
     baseline = project_baseline_scenario(years)
     no_intervention = project_no_intervention_scenario(years)
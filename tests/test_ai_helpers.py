@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from utils import ai_helper_openai, response_cache
+from utils.ai_helper_gemini import GEMINI_MODEL_NAME, AIHealthcareAnalyst
+from utils.ai_helper_openai import (
+    OPENAI_MODEL_NAME, STRATEGY_SECTIONS, assemble_strategy, build_strategy_section_prompt, generate_ai_strategy,
+    generate_ai_strategy_sections, stream_ai_strategy
+)
+from utils.llm_providers import PROVIDER_REGISTRY, StubError, get_backend
+from utils.llm_scheduler import LLMScheduler
+from utils.response_cache import ResponseCache
+
+STRATEGY_PARAMS = dict(
+    gap_analysis="Priority categories: Nursing. Focus regions: North",
+    budget_constraints="Moderate",
+    priority_areas="Rural access",
+    timeline=10,
+    phase_focus="Balanced"
+)
+
+
+@pytest.fixture
+def stub_backend(monkeypatch, tmp_path):
+    """Serve every provider from a fast stub backend with an empty response cache"""
+    monkeypatch.setenv("AI_BACKEND", "stub")
+    monkeypatch.setenv("AI_STUB_LATENCY", "0")
+    monkeypatch.setenv("AI_STUB_TOKENS_PER_SECOND", "1000000")
+    monkeypatch.setattr(response_cache, "_response_cache", ResponseCache(str(tmp_path / "cache.db")))
+    PROVIDER_REGISTRY.clear()
+    yield
+    PROVIDER_REGISTRY.clear()
+
+
+def openai_stub():
+    return get_backend("openai", OPENAI_MODEL_NAME, ai_helper_openai.OPENAI_API_KEY)
+
+
+def test_streamed_strategy_arrives_in_chunks_and_is_cached(stub_backend):
+    chunks = list(stream_ai_strategy(**STRATEGY_PARAMS))
+
+    assert len(chunks) > 1
+    assert generate_ai_strategy(**STRATEGY_PARAMS) == "".join(chunks)
+    assert list(stream_ai_strategy(**STRATEGY_PARAMS)) == ["".join(chunks)]
+    assert openai_stub().stats()["calls"] == 1
+
+
+def test_streamed_report_matches_the_blocking_report(stub_backend):
+    analyst = AIHealthcareAnalyst()
+    scenario_data = {"years": 10, "strategy_type": "Balanced"}
+    results_data = {"current_supply": 1_000, "required_supply": 3_000, "gap": 2_000}
+
+    streamed = "".join(analyst.stream_executive_report(scenario_data, results_data, "policy_brief"))
+
+    assert streamed == analyst.generate_executive_report(scenario_data, results_data, "policy_brief")
+    assert get_backend("gemini", GEMINI_MODEL_NAME).stats()["calls"] == 1
+
+
+def test_stream_errors_reach_the_caller(stub_backend, monkeypatch):
+    monkeypatch.setenv("AI_STUB_ERROR_RATE", "1")
+    monkeypatch.setattr(ai_helper_openai, "get_scheduler", lambda provider: LLMScheduler(1000, 1e9, max_retries=0))
+
+    with pytest.raises(StubError):
+        list(stream_ai_strategy(**STRATEGY_PARAMS))
+
+
+
+def test_sections_are_generated_in_document_order(stub_backend):
+    sections = generate_ai_strategy_sections(**STRATEGY_PARAMS)
+
+    assert list(sections) == [key for key, _, _ in STRATEGY_SECTIONS]
+    assert all(sections.values())
+    assert openai_stub().stats()["calls"] == len(STRATEGY_SECTIONS)
+
+
+def test_section_prompts_ask_for_one_section_only():
+    prompt = build_strategy_section_prompt("funding_mechanism", **STRATEGY_PARAMS)
+
+    assert "## 3. FUNDING MECHANISM" in prompt
+    assert "## 1. EXECUTIVE SUMMARY" not in prompt
+    assert "## 4. POLICY RECOMMENDATIONS" not in prompt
+
+
+def test_regenerating_one_section_reuses_the_others(stub_backend):
+    first = generate_ai_strategy_sections(**STRATEGY_PARAMS)
+
+    second = generate_ai_strategy_sections(**STRATEGY_PARAMS, regenerate=["risk_mitigation"])
+
+    assert second == first
+    assert openai_stub().stats()["calls"] == len(STRATEGY_SECTIONS) + 1
+
+
+def test_section_concurrency_is_bounded(monkeypatch):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_section(section_key, regenerate=False, **strategy_params):
+        with lock:
+            running.append(section_key)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(section_key)
+        return section_key
+
+    monkeypatch.setattr(ai_helper_openai, "generate_strategy_section", fake_section)
+
+    sections = generate_ai_strategy_sections(**STRATEGY_PARAMS, max_concurrency=2)
+
+    assert max(peak) == 2
+    assert list(sections.values()) == [key for key, _, _ in STRATEGY_SECTIONS]
+
+
+def test_assemble_strategy_skips_missing_sections():
+    sections = {"success_metrics": "metrics", "executive_summary": "summary", "risk_mitigation": None}
+
+    assert assemble_strategy(sections) == "summary\n\nmetrics"
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.india_healthcare_data import (
+    calculate_cost_projection, get_scenario_comparison, project_proposed_strategy_ensemble,
+    project_proposed_strategy_scenario
+)
+from utils import charts
+from utils.charts import (
+    MAX_BAR_PERIODS, MAX_LINE_TRACES, MAX_POINTS_PER_TRACE, bucket_cost_periods, collapse_scenario_variants,
+    downsample_frame, summarize_ensemble
+)
+from utils.figure_cache import FIGURE_CACHE
+from utils.scenario_specs import STRATEGY_PARAMETERS, normalize_spec
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    FIGURE_CACHE.clear()
+    yield
+    FIGURE_CACHE.clear()
+
+
+def long_series(rows=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"Year": np.arange(rows), "Gap": rng.normal(0, 1, rows).cumsum()})
+
+
+def test_downsample_keeps_ends_and_extremes_within_budget():
+    frame = long_series()
+
+    sampled = downsample_frame(frame, "Year", ["Gap"])
+
+    assert len(sampled) <= MAX_POINTS_PER_TRACE + 2
+    assert sampled["Year"].iloc[0] == 0 and sampled["Year"].iloc[-1] == len(frame) - 1
+    assert sampled["Gap"].max() == frame["Gap"].max()
+    assert sampled["Gap"].min() == frame["Gap"].min()
+    assert sampled["Year"].is_monotonic_increasing
+
+
+def test_short_series_are_not_downsampled():
+    frame = long_series(rows=100)
+
+    pd.testing.assert_frame_equal(downsample_frame(frame, "Year", ["Gap"]), frame)
+
+
+def test_many_named_scenarios_collapse_into_an_ensemble():
+    frame = pd.concat([long_series(20).assign(Scenario=f"S{i}") for i in range(MAX_LINE_TRACES + 1)])
+
+    collapsed = collapse_scenario_variants(frame)
+
+    assert collapsed["Scenario"].unique().tolist() == ["Scenario Ensemble"]
+    assert collapsed["Run"].nunique() == MAX_LINE_TRACES + 1
+    assert "Run" not in collapse_scenario_variants(frame[frame["Scenario"] == "S0"]).columns
+
+
+def test_ensemble_envelope_is_ordered_per_year():
+    ensemble = project_proposed_strategy_ensemble(years=10, runs=50)
+
+    envelope = summarize_ensemble(ensemble)
+
+    assert len(envelope) == 11
+    assert (envelope["P5"] <= envelope["P50"]).all() and (envelope["P50"] <= envelope["P95"]).all()
+
+
+def test_ensemble_without_uncertainty_matches_the_deterministic_projection():
+    ensemble = project_proposed_strategy_ensemble(years=15, runs=3, uncertainty=0.0)
+    deterministic = project_proposed_strategy_scenario(years=15)
+
+    for _, run in ensemble.groupby("Run"):
+        assert run["Gap"].tolist() == deterministic["Gap"].tolist()
+
+
+def test_fan_chart_trace_count_does_not_grow_with_runs():
+    scenario_df = get_scenario_comparison(years=15)
+    small = charts.create_scenario_fan_chart(project_proposed_strategy_ensemble(runs=20), scenario_df)
+    large = charts.create_scenario_fan_chart(project_proposed_strategy_ensemble(runs=1000), scenario_df)
+
+    assert len(large.data) == len(small.data) == 7
+    assert all(trace.type == "scattergl" for trace in large.data)
+
+
+def test_long_horizon_lines_switch_to_webgl():
+    frame = long_series(rows=3000).assign(Scenario="Baseline (Current Trend)")
+
+    fig = charts.create_scenario_comparison_chart(frame)
+
+    assert fig.data[0].type == "scattergl"
+    assert len(fig.data[0].x) <= MAX_POINTS_PER_TRACE + 2
+
+
+def test_long_cost_projections_are_bucketed_into_periods():
+    cost_df = calculate_cost_projection(75, 120)
+
+    bucketed = bucket_cost_periods(cost_df)
+
+    assert len(bucketed) <= MAX_BAR_PERIODS
+    assert bucketed["Training Cost (₹ Cr)"].sum() == pytest.approx(cost_df["Training Cost (₹ Cr)"].sum())
+    assert bucketed["Calendar Year"].iloc[0].startswith(str(cost_df["Calendar Year"].iloc[0]))
+
+
+def test_infrastructure_boost_is_still_accepted_by_specs():
+    assert "infrastructure_boost" in STRATEGY_PARAMETERS
+    spec = normalize_spec({"model": "strategy", "infrastructure_boost": "2.0"})
+
+    assert spec["strategy"]["infrastructure_boost"] == 2.0
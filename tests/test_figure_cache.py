@@ -0,0 +1,72 @@
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from utils import figure_cache
+from utils.figure_cache import FIGURE_CACHE, cached_figure, input_fingerprint
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    FIGURE_CACHE.clear()
+    yield
+    FIGURE_CACHE.clear()
+
+
+def counting_builder():
+    calls = []
+
+    @cached_figure
+    def build(values, title="chart"):
+        calls.append((list(values), title))
+        return go.Figure(go.Bar(y=list(values)), layout={"title": {"text": title}})
+
+    return build, calls
+
+
+def test_repeat_calls_share_one_build():
+    build, calls = counting_builder()
+
+    first = build([1, 2, 3])
+    second = build([1, 2, 3])
+
+    assert second is first
+    assert len(calls) == 1
+    assert FIGURE_CACHE.stats()["hits"] == 1
+
+
+def test_any_input_change_rebuilds():
+    build, calls = counting_builder()
+
+    build([1, 2, 3])
+    build([1, 2, 4])
+    build([1, 2, 3], title="other")
+
+    assert len(calls) == 3
+
+
+def test_dataframe_inputs_are_fingerprinted_by_content():
+    frame = pd.DataFrame({"Year": [2024, 2025], "Gap": [10, 8]})
+
+    assert input_fingerprint(frame) == input_fingerprint(frame.copy())
+    assert input_fingerprint(frame) != input_fingerprint(frame.assign(Gap=[10, 9]))
+    assert input_fingerprint(frame) != input_fingerprint(frame.rename(columns={"Gap": "Shortfall"}))
+
+
+def test_dataset_version_is_part_of_the_key(monkeypatch):
+    build, calls = counting_builder()
+    build([1])
+
+    monkeypatch.setattr(figure_cache, "DATA_VERSION", "next-version")
+    build([1])
+
+    assert len(calls) == 2
+
+
+def test_json_is_encoded_once_and_matches_the_figure():
+    build, _ = counting_builder()
+
+    entry = build.entry([5, 6])
+
+    assert build.to_json([5, 6]) is entry.json
+    assert entry.json == entry.figure.to_json()
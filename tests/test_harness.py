@@ -0,0 +1,77 @@
+import pytest
+
+from benchmarks.harness import (
+    BenchmarkCase, format_bytes, format_table, load_results, measure, median_ci, run_cases, write_results
+)
+from benchmarks.suite import SIZES, build_cases, scaled_state_dataframe, synthetic_points, summary_rows
+
+
+def test_median_ci_brackets_the_median():
+    times = [1.0, 1.1, 0.9, 1.05, 0.95, 1.2, 0.8]
+
+    low, high = median_ci(times)
+
+    assert low <= 1.0 <= high
+    assert median_ci(times) == (low, high)
+    assert median_ci([0.5]) == (0.5, 0.5)
+
+
+def test_measure_runs_setup_before_every_timed_call():
+    calls = []
+    case = BenchmarkCase("case", lambda: calls.append("fn"), setup=lambda: calls.append("setup"))
+
+    result = measure(case, repeats=3, warmup=1, track_memory=False)
+
+    assert calls == ["setup", "fn"] * 4
+    assert result["repeats"] == 3 and len(result["times_s"]) == 3
+    assert result["ci95_s"][0] <= result["median_s"] <= result["ci95_s"][1]
+    assert "peak_bytes" not in result
+
+
+def test_memory_pass_counts_what_the_call_allocates():
+    result = measure(BenchmarkCase("alloc", lambda: bytearray(1_000_000)), repeats=1, warmup=0)
+
+    assert result["peak_bytes"] >= 1_000_000
+
+
+def test_results_round_trip_through_json(tmp_path):
+    results = run_cases([BenchmarkCase("noop", lambda: None, size="scaled")], repeats=2, track_memory=False)
+    path = str(tmp_path / "nested" / "results.json")
+
+    write_results(path, {"git_commit": "abc"}, results)
+
+    assert load_results(path) == {"metadata": {"git_commit": "abc"}, "results": results}
+    assert list(results) == ["noop[scaled]"]
+    assert summary_rows(results)[0][0] == "noop[scaled]"
+
+
+def test_case_keys_are_unique_and_filterable():
+    cases = build_cases()
+
+    assert len({case.key for case in cases}) == len(cases)
+    assert {case.size for case in cases} == set(SIZES)
+    assert all(case.size == "default" for case in build_cases(sizes=("default",)))
+    assert all("map" in case.name for case in build_cases(name_filter="map"))
+    assert build_cases(hot_only=True) and all(case.hot for case in build_cases(hot_only=True))
+
+
+def test_scaled_inputs_have_the_requested_size():
+    base = scaled_state_dataframe(1)
+
+    scaled = scaled_state_dataframe(3)
+
+    assert len(scaled) == 3 * len(base)
+    assert scaled["State"].is_unique
+    assert len(synthetic_points(100)) == 100
+    assert (synthetic_points(100)["Gap"] > 0).all()
+
+
+@pytest.mark.parametrize("num, text", [(512, "512 B"), (2048, "2.0 KB"), (5 * 1024 ** 3, "5.0 GB")])
+def test_format_bytes(num, text):
+    assert format_bytes(num) == text
+
+
+def test_format_table_aligns_columns():
+    table = format_table([["a", 1], ["long name", 22]], ["case", "ms"])
+
+    assert table.splitlines() == ["case       ms", "---------  --", "a          1 ", "long name  22"]
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from utils.jobs import DONE, FAILED, PENDING, RUNNING, JobQueue
+
+
+@pytest.fixture
+def queue():
+    jobs = JobQueue(max_workers=2, max_pending=3, retention=4)
+    yield jobs
+    jobs._executor.shutdown(wait=True)
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    job = queue.get(job_id)
+    while not (job.is_finished and job.finished) and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert job.is_finished, f"job {job_id} is still {job.status}"
+    return job
+
+
+def test_result_is_available_by_id(queue):
+    job_id = queue.submit("report", "Executive Summary", lambda a, b=0: a + b, 2, b=3)
+
+    job = wait_for(queue, job_id)
+
+    assert job.status == DONE
+    assert job.result == 5
+    assert job.kind == "report" and job.label == "Executive Summary"
+    assert job.elapsed >= 0
+
+
+def test_errors_are_recorded_on_the_job(queue):
+    def fail():
+        raise ValueError("no key")
+
+    job = wait_for(queue, queue.submit("report", "Broken", fail))
+
+    assert job.status == FAILED
+    assert job.error == "no key"
+
+
+def test_streamed_output_is_visible_while_running(queue):
+    release = threading.Event()
+
+    def chunks():
+        yield "Hello, "
+        yield ""
+        release.wait(5)
+        yield "world"
+
+    job_id = queue.submit_stream("strategy", "Strategy", chunks)
+    job = queue.get(job_id)
+    deadline = time.monotonic() + 5
+    while job.partial_output != "Hello, " and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+    assert job.status == RUNNING
+    assert job.partial_output == "Hello, "
+    release.set()
+    assert wait_for(queue, job_id).result == "Hello, world"
+
+
+def test_submissions_past_max_pending_are_refused(queue):
+    release = threading.Event()
+    job_ids = [queue.submit("report", f"Job {i}", release.wait, 5) for i in range(3)]
+
+    with pytest.raises(RuntimeError, match="Too many AI jobs"):
+        queue.submit("report", "One too many", release.wait, 5)
+    assert queue.stats()[PENDING] + queue.stats()[RUNNING] == 3
+
+    release.set()
+    for job_id in job_ids:
+        wait_for(queue, job_id)
+    assert queue.stats()[DONE] == 3
+
+
+def test_oldest_finished_jobs_fall_out_of_retention(queue):
+    job_ids = []
+    for index in range(6):
+        job_ids.append(queue.submit("report", f"Job {index}", lambda value=index: value))
+        wait_for(queue, job_ids[-1])
+
+    assert [queue.get(job_id) for job_id in job_ids[:2]] == [None, None]
+    assert all(queue.get(job_id) for job_id in job_ids[2:])
+
+
+def test_unknown_ids_return_none(queue):
+    assert queue.get("missing") is None
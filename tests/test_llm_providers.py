@@ -0,0 +1,178 @@
+import threading
+
+import pytest
+
+from utils import llm_providers
+from utils.llm_providers import (
+    PROVIDER_REGISTRY, GeminiBackend, OpenAIBackend, ProviderRegistry, StubBackend, StubError, backend_model_name,
+    get_backend
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.delenv("AI_BACKEND", raising=False)
+    PROVIDER_REGISTRY.clear()
+    yield
+    PROVIDER_REGISTRY.clear()
+
+
+def call_with_timeout(fn, seconds=10):
+    """Run fn on a thread and fail instead of hanging if it deadlocks"""
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "call did not finish; registry lock deadlocked?"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def test_registry_creates_each_client_once():
+    registry = ProviderRegistry()
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    first = registry.get("key", factory)
+
+    assert registry.get("key", factory) is first
+    assert len(created) == 1
+    assert len(registry) == 1
+
+
+def test_registry_factory_may_use_the_registry():
+    registry = ProviderRegistry()
+
+    def outer():
+        return ("outer", registry.get("inner", lambda: "inner client"))
+
+    assert call_with_timeout(lambda: registry.get("outer", outer)) == ("outer", "inner client")
+    assert len(registry) == 2
+
+
+def test_registry_does_not_cache_a_failed_factory():
+    registry = ProviderRegistry()
+
+    def failing():
+        raise RuntimeError("no credentials")
+
+    with pytest.raises(RuntimeError):
+        registry.get("key", failing)
+    assert registry.get("key", lambda: "client") == "client"
+
+
+class FakeOpenAI:
+    def __init__(self, api_key, max_retries):
+        self.api_key = api_key
+        self.max_retries = max_retries
+
+
+class FakeGenai:
+    def __init__(self):
+        self.configured = []
+
+    def configure(self, api_key):
+        self.configured.append(api_key)
+
+    def GenerativeModel(self, model_name):
+        return ("model", model_name, self.configured[-1])
+
+
+def test_openai_client_is_shared_per_api_key(monkeypatch):
+    monkeypatch.setattr(llm_providers, "OpenAI", FakeOpenAI)
+
+    client = llm_providers.get_openai_client("sk-one")
+
+    assert llm_providers.get_openai_client("sk-one") is client
+    assert llm_providers.get_openai_client("sk-two") is not client
+    assert client.max_retries == 0
+    assert all("sk-one" not in repr(key) for key, _ in PROVIDER_REGISTRY.items())
+
+
+def test_gemini_is_configured_once_per_key_and_models_are_shared(monkeypatch):
+    fake = FakeGenai()
+    monkeypatch.setattr(llm_providers, "genai", fake)
+
+    model = llm_providers.get_gemini_model("gemini-2.0-flash", "key-one")
+
+    assert llm_providers.get_gemini_model("gemini-2.0-flash", "key-one") is model
+    assert llm_providers.get_gemini_model("gemini-1.5-pro", "key-one") is not model
+    assert fake.configured == ["key-one"]
+
+
+@pytest.mark.skipif(llm_providers.OpenAI is None, reason="openai is not installed")
+def test_openai_backend_builds_with_a_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+
+    backend = call_with_timeout(lambda: get_backend("openai", "gpt-4o"))
+
+    assert isinstance(backend, OpenAIBackend)
+    assert get_backend("openai", "gpt-4o") is backend
+    assert backend.client is llm_providers.get_openai_client()
+
+
+@pytest.mark.skipif(llm_providers.genai is None, reason="google-generativeai is not installed")
+def test_gemini_backend_builds_with_a_key(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+
+    backend = call_with_timeout(lambda: get_backend("gemini", "gemini-2.0-flash"))
+
+    assert isinstance(backend, GeminiBackend)
+    assert get_backend("gemini", "gemini-2.0-flash") is backend
+
+
+def test_missing_key_is_reported(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+        get_backend("openai", "gpt-4o")
+    assert len(PROVIDER_REGISTRY) == 0
+
+
+def test_ai_backend_substitutes_every_provider(monkeypatch):
+    monkeypatch.setenv("AI_BACKEND", "stub")
+
+    backend = get_backend("openai", "gpt-4o")
+
+    assert isinstance(backend, StubBackend)
+    assert backend.model_name == "stub/gpt-4o"
+    assert backend_model_name("openai", "gpt-4o") == "stub/gpt-4o"
+
+
+def test_unknown_backend_is_rejected(monkeypatch):
+    monkeypatch.setenv("AI_BACKEND", "nonexistent")
+
+    with pytest.raises(ValueError, match="Unknown AI backend"):
+        get_backend("openai", "gpt-4o")
+
+
+def test_stub_stream_matches_generate_and_is_deterministic():
+    backend = StubBackend("model", latency=0, tokens_per_second=1e9, response_tokens=60)
+
+    text = backend.generate("prompt", system_prompt="system")
+
+    assert "".join(backend.stream("prompt", system_prompt="system")) == text
+    assert backend.generate("prompt", system_prompt="system") == text
+    assert backend.generate("other prompt") != text
+    assert backend.stats() == {"calls": 4, "errors": 0}
+
+
+def test_stub_injects_errors_and_timeouts():
+    failing = StubBackend("model", latency=0, tokens_per_second=1e9, error_rate=1.0)
+    with pytest.raises(StubError):
+        failing.generate("prompt")
+
+    slow = StubBackend("model", latency=0.5, tokens_per_second=1e9)
+    with pytest.raises(TimeoutError):
+        slow.generate("prompt", timeout=0.01)
@@ -0,0 +1,146 @@
+import pytest
+
+from utils import llm_scheduler
+from utils.llm_scheduler import LLMScheduler, TokenBucket, backoff_delay, estimate_tokens, is_retryable
+
+
+class QuotaError(Exception):
+    status_code = 429
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "backoff_delay", lambda attempt: 0.0)
+
+
+def scheduler(**kwargs):
+    return LLMScheduler(requests_per_minute=6000, tokens_per_minute=1_000_000, timeout=5, **kwargs)
+
+
+def flaky(failures, error=QuotaError, result="ok"):
+    """fn(timeout) that raises `error` for its first `failures` calls"""
+    calls = []
+
+    def fn(timeout):
+        calls.append(timeout)
+        if len(calls) <= failures:
+            raise error("try again")
+        return result
+
+    return fn, calls
+
+
+def test_transient_failures_are_retried():
+    llm = scheduler(max_retries=3)
+    fn, calls = flaky(2)
+
+    assert llm.call(fn) == "ok"
+    assert len(calls) == 3
+    assert llm.stats() == {"queue_depth": 0, "in_flight": 0, "completed": 1, "failed": 2, "retries": 2}
+
+
+def test_permanent_failures_are_not_retried():
+    llm = scheduler()
+    fn, calls = flaky(1, error=BadRequestError)
+
+    with pytest.raises(BadRequestError):
+        llm.call(fn)
+    assert len(calls) == 1
+
+
+def test_retries_stop_at_max_retries():
+    llm = scheduler(max_retries=1)
+    fn, calls = flaky(5)
+
+    with pytest.raises(QuotaError):
+        llm.call(fn)
+    assert len(calls) == 2
+
+
+def test_calls_receive_the_time_left_before_the_deadline():
+    fn, calls = flaky(0)
+
+    scheduler().call(fn, timeout=2)
+
+    assert 0 < calls[0] <= 2
+
+
+def test_stream_retries_only_before_the_first_chunk():
+    llm = scheduler(max_retries=3)
+    attempts = []
+
+    def open_stream(timeout):
+        attempts.append(timeout)
+        if len(attempts) == 1:
+            raise QuotaError("try again")
+        yield "first"
+        raise QuotaError("mid-stream")
+
+    stream = llm.stream(open_stream)
+    assert next(stream) == "first"
+    with pytest.raises(QuotaError, match="mid-stream"):
+        next(stream)
+    assert len(attempts) == 2
+    assert llm.stats()["in_flight"] == 0
+
+
+def test_abandoned_stream_releases_its_slot_and_closes_upstream():
+    llm = scheduler()
+    closed = []
+
+    def open_stream(timeout):
+        try:
+            yield "first"
+            yield "second"
+        finally:
+            closed.append(True)
+
+    stream = llm.stream(open_stream)
+    assert next(stream) == "first"
+    stream.close()
+
+    assert closed == [True]
+    assert llm.stats()["in_flight"] == 0
+    assert llm.stats()["completed"] == 1
+
+
+def test_an_empty_token_bucket_delays_until_refilled():
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60)
+
+    assert bucket.delay(1, bucket.updated) == pytest.approx(1.0)
+    assert bucket.delay(1, bucket.updated + 1) == 0
+
+
+def test_requests_wait_for_the_rate_limit_and_then_time_out():
+    llm = LLMScheduler(requests_per_minute=1, tokens_per_minute=1_000_000, timeout=0.05)
+    llm.call(lambda timeout: "ok")
+
+    with pytest.raises(TimeoutError):
+        llm.call(lambda timeout: "ok")
+    assert llm.stats()["queue_depth"] == 0
+
+
+def test_retryable_errors_are_recognised_by_type_name_or_status():
+    rate_limit = type("RateLimitError", (Exception,), {})
+
+    assert is_retryable(rate_limit())
+    assert is_retryable(TimeoutError())
+    assert is_retryable(QuotaError())
+    assert not is_retryable(BadRequestError())
+    assert not is_retryable(ValueError())
+
+
+def test_backoff_is_capped():
+    assert all(0 <= backoff_delay(attempt, base=1, cap=3) <= 3 for attempt in range(10))
+
+
+def test_token_estimate_grows_with_text():
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("gap") == 1
+    assert estimate_tokens("1234567") == 3
+    assert estimate_tokens("gap " * 100) == 100
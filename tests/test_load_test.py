@@ -0,0 +1,96 @@
+import os
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.load_test import (
+    COST_PAGE, PAGE_RADIO, ROOT_DIR, SCENARIO_PAGE, SLIDERS, Session, next_action, rss_bytes,
+    server_environment, summarize
+)
+
+OTHER_PAGE = "🗺️ Geographic Analysis"
+
+
+def slider(widget_id, low=0.0, high=10.0, step=0.5):
+    return SimpleNamespace(id=widget_id, min=low, max=high, step=step)
+
+
+def session_on(page):
+    session = Session("ws://unused")
+    session.page = page
+    session.elements = {
+        PAGE_RADIO: SimpleNamespace(id="radio", options=[COST_PAGE, SCENARIO_PAGE, OTHER_PAGE]),
+        **{label: slider(f"slider-{index}") for index, label in enumerate(SLIDERS.get(page, []))},
+    }
+    return session
+
+
+def test_every_dragged_slider_exists_in_the_app():
+    with open(os.path.join(ROOT_DIR, "app.py"), encoding="utf-8") as f:
+        source = f.read()
+
+    for labels in SLIDERS.values():
+        for label in labels:
+            assert f'"{label}"' in source, label
+
+
+def test_slider_drags_stay_on_the_slider_grid():
+    rng = random.Random(0)
+    session = session_on(COST_PAGE)
+
+    for _ in range(50):
+        action, label = next_action(session, rng, slider_share=1.0)
+        assert action == "slider" and label in SLIDERS[COST_PAGE]
+        state = session.widgets[session.elements[label].id]
+        value = state.double_array_value.data[0]
+        assert 0 <= value <= 10 and (value * 2).is_integer()
+
+
+def test_pages_without_sliders_always_switch_page():
+    session = session_on(OTHER_PAGE)
+
+    action, target = next_action(session, random.Random(0), slider_share=1.0)
+
+    assert action == "page"
+    assert session.page == target
+    assert session.widgets["radio"].string_value == target
+
+
+def test_summary_reports_latency_errors_and_memory_per_session():
+    results = [
+        {"action": "slider", "latency": 0.1, "error": None},
+        {"action": "page", "latency": 0.3, "error": None},
+        {"action": "slider", "latency": 2.0, "error": "ValueError: boom"},
+    ]
+    mb = 1024 * 1024
+
+    summary = summarize(2, results, wall_time=1.5, rss_before=100 * mb, rss_after=110 * mb)
+
+    assert summary["reruns"] == 3 and summary["errors"] == 1
+    assert summary["throughput_rps"] == 2.0
+    assert summary["latency_s"]["count"] == 2
+    assert summary["by_action"]["page"]["max"] == 0.3
+    assert summary["server_rss_mb"] == {"before": 100.0, "after": 110.0, "per_session": 5.0}
+    assert summary["sample_errors"] == ["ValueError: boom"]
+
+
+def test_missing_rss_is_reported_as_unknown():
+    summary = summarize(1, [], wall_time=0, rss_before=None, rss_after=None)
+
+    assert summary["server_rss_mb"]["per_session"] is None
+    assert summary["throughput_rps"] is None
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs /proc")
+def test_rss_is_read_from_proc():
+    assert rss_bytes(os.getpid()) > 0
+    assert rss_bytes(2 ** 22 + 1) is None
+
+
+def test_server_runs_the_stub_backend_with_a_private_cache(tmp_path):
+    env = server_environment(str(tmp_path))
+
+    assert env["AI_BACKEND"] == "stub"
+    assert env["AI_CACHE_PATH"].startswith(str(tmp_path))
+
@@ -0,0 +1,54 @@
+import threading
+
+from utils.lru import LRUCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert [key for key, _ in cache.entries()] == ["a", "c"]
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 1}
+
+
+def test_replacing_an_entry_marks_it_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_clear_resets_entries_and_counts():
+    cache = LRUCache()
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("missing")
+
+    cache.clear()
+
+    assert cache.stats() == {"entries": 0, "hits": 0, "misses": 0}
+
+
+def test_concurrent_puts_stay_within_the_bound():
+    cache = LRUCache(max_entries=50)
+
+    def fill(offset):
+        for index in range(500):
+            cache.put((offset, index), index)
+            cache.get((offset, index - 1))
+
+    threads = [threading.Thread(target=fill, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats()["entries"] == 50
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.india_healthcare_data import get_state_dataframe
+from utils import maps
+from utils.figure_cache import FIGURE_CACHE
+from utils.maps import (
+    FEATURE_PROPERTIES, LOD_MAX_ZOOM, LOD_MIN_ZOOM, build_gap_cluster_index, create_gap_cluster_map,
+    create_state_gap_map, gap_clusters_for_view, get_state_gap_map_html, state_gap_features
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    FIGURE_CACHE.clear()
+    yield
+    FIGURE_CACHE.clear()
+
+
+def random_points(rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Latitude": rng.uniform(8, 35, rows),
+        "Longitude": rng.uniform(68, 97, rows),
+        "Gap": rng.integers(-50, 500, rows),
+        "Facility": [f"Facility {i}" for i in range(rows)],
+    })
+
+
+def test_every_state_becomes_one_point_feature():
+    state_df = get_state_dataframe()
+
+    features = state_gap_features()
+
+    assert features["type"] == "FeatureCollection"
+    assert len(features["features"]) == len(state_df)
+    first = features["features"][0]
+    assert first["geometry"]["coordinates"] == [state_df["Longitude"].iloc[0], state_df["Latitude"].iloc[0]]
+    assert set(first["properties"]) == set(FEATURE_PROPERTIES)
+    assert first["properties"]["name"] == state_df["State"].iloc[0]
+
+
+def test_features_are_built_once_per_input():
+    state_df = get_state_dataframe()
+
+    assert state_gap_features() is state_gap_features()
+    smaller = state_gap_features(state_df.head(3))
+
+    assert len(smaller["features"]) == 3
+    assert state_gap_features(state_df.head(3).copy()) is smaller
+
+
+def test_gap_map_renders_a_single_geojson_layer():
+    html = create_state_gap_map().get_root().render()
+
+    assert html.count("L.geoJSON(") == 1
+    assert "L.circleMarker(" in html
+    assert "Gap Severity" in html
+
+
+def test_clusters_conserve_points_and_gap_at_every_zoom():
+    points = random_points()
+
+    index = build_gap_cluster_index(points)
+
+    assert sorted(index) == list(range(LOD_MIN_ZOOM, LOD_MAX_ZOOM + 1))
+    for level in index.values():
+        assert level["points"].sum() == len(points)
+        assert level["gap"].sum() == points["Gap"].sum()
+        assert level["lat"].is_monotonic_increasing
+    assert len(index[LOD_MIN_ZOOM]) < len(index[LOD_MAX_ZOOM])
+
+
+def test_view_only_returns_clusters_near_the_bounds():
+    points = random_points()
+    bounds = {"_southWest": {"lat": 20, "lng": 75}, "_northEast": {"lat": 24, "lng": 80}}
+
+    everything = gap_clusters_for_view(points, zoom=8)
+    visible = gap_clusters_for_view(points, zoom=8, bounds=bounds)
+
+    assert 0 < len(visible["features"]) < len(everything["features"])
+    for feature in visible["features"]:
+        lon, lat = feature["geometry"]["coordinates"]
+        assert 19 < lat < 25 and 74 < lon < 81
+
+
+def test_zoom_is_clamped_to_the_prebuilt_levels():
+    points = random_points(rows=200)
+
+    assert gap_clusters_for_view(points, zoom=0) == gap_clusters_for_view(points, zoom=LOD_MIN_ZOOM)
+    assert gap_clusters_for_view(points, zoom=30) == gap_clusters_for_view(points, zoom=LOD_MAX_ZOOM)
+
+
+def test_single_points_keep_their_name_and_clusters_are_counted():
+    points = pd.DataFrame({
+        "Latitude": [10.0, 10.0001, 30.0],
+        "Longitude": [70.0, 70.0001, 90.0],
+        "Gap": [5, 7, 3],
+        "Facility": ["North", "North annex", "Lone clinic"],
+    })
+
+    names = {f["properties"]["name"] for f in gap_clusters_for_view(points, zoom=LOD_MIN_ZOOM)["features"]}
+
+    assert names == {"2 locations", "Lone clinic"}
+
+
+def test_points_without_required_columns_are_rejected():
+    with pytest.raises(ValueError, match="Gap"):
+        build_gap_cluster_index(pd.DataFrame({"Latitude": [10.0], "Longitude": [70.0]}))
+
+
+def test_cluster_map_returns_a_swappable_layer():
+    base_map, cluster_group = create_gap_cluster_map(random_points(rows=200), zoom=6)
+
+    assert "L.geoJSON(" not in base_map.get_root().render()
+    assert len(cluster_group._children) == 1
+
+
+def test_static_map_html_is_rendered_once_per_input(monkeypatch):
+    first = get_state_gap_map_html()
+    monkeypatch.setattr(maps, "create_state_gap_map", lambda state_df=None: pytest.fail("map was rebuilt"))
+
+    assert get_state_gap_map_html() is first
+    assert first.startswith(b"<!DOCTYPE html>")
+    assert b"Gap Severity" in first
+
+
+def test_static_map_html_follows_the_dataset_version(monkeypatch):
+    first = get_state_gap_map_html()
+
+    monkeypatch.setattr(maps, "DATA_VERSION", "next-version")
+
+    assert get_state_gap_map_html() is not first
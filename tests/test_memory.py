@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from utils.figure_cache import FIGURE_CACHE
+from utils.maps import state_gap_features
+from utils.memory import MB, MemoryTracker, cache_sizes, estimate_size, state_sizes
+
+
+@pytest.fixture
+def tracker():
+    tracker = MemoryTracker(enabled=True, budget_bytes=MB)
+    yield tracker
+    tracker.stop_tracing()
+
+
+def test_frames_and_arrays_report_their_buffers():
+    array = np.zeros(100_000)
+    frame = pd.DataFrame({"values": array, "names": ["state"] * len(array)})
+
+    assert estimate_size(array) == array.nbytes
+    assert estimate_size(frame) == frame.memory_usage(deep=True).sum()
+
+
+def test_shared_and_cyclic_objects_count_once():
+    array = np.zeros(100_000)
+    cycle = {"array": array}
+    cycle["self"] = cycle
+
+    assert estimate_size([array, array]) < 2 * array.nbytes
+    assert estimate_size(cycle) < 2 * array.nbytes
+
+
+def test_figures_and_plain_objects_are_walked():
+    class Holder:
+        def __init__(self):
+            self.array = np.zeros(10_000)
+
+    figure = go.Figure(go.Scatter(y=list(range(10_000))))
+
+    assert estimate_size(Holder()) > 80_000
+    assert estimate_size(figure) > estimate_size(go.Figure())
+
+
+def test_state_sizes_are_largest_first():
+    sizes = state_sizes({"small": 1, "large": np.zeros(1_000), "medium": "x" * 100})
+
+    assert list(sizes) == ["large", "medium", "small"]
+
+
+def test_disabled_tracker_records_nothing():
+    tracker = MemoryTracker(enabled=False)
+    tracker.begin_rerun()
+
+    assert tracker.end_rerun("session", "Costs", {"frame": np.zeros(10)}) is None
+    assert tracker.sessions() == []
+
+
+def test_sessions_keep_their_peak_and_warn_once_over_budget(tracker, capsys):
+    big = {"frame": np.zeros(MB // 4)}
+
+    tracker.end_rerun("session-1", "Costs", big)
+    tracker.end_rerun("session-1", "Costs", big)
+    record = tracker.end_rerun("session-1", "Overview", {})
+
+    assert record["page"] == "Overview"
+    assert record["state_bytes"] < record["peak_state_bytes"]
+    assert not record["over_budget"]
+    assert capsys.readouterr().err.count("Session session- holds") == 1
+    assert [r["session"] for r in tracker.sessions()] == ["session-1"]
+
+
+def test_tracemalloc_diffs_are_kept_per_page(tracker):
+    tracker.start_tracing()
+    tracker.begin_rerun()
+    held = [bytearray(1024) for _ in range(1000)]
+    tracker.end_rerun("session-1", "Costs", {})
+
+    growth = tracker.page_growth()["Costs"]
+
+    assert growth["net_bytes"] >= 1_000_000
+    assert any("test_memory.py" in row["location"] for row in growth["top"])
+    assert tracker.top_allocators(limit=3)
+    del held
+
+
+def test_cache_sizes_group_entries_by_builder():
+    FIGURE_CACHE.clear()
+    state_gap_features()
+
+    assert "figure_cache/state_gap_features" in cache_sizes()
+    FIGURE_CACHE.clear()
@@ -0,0 +1,76 @@
+import re
+import socket
+import urllib.error
+import urllib.request
+
+import pytest
+
+from utils.metrics import (
+    CONTENT_TYPE, Counter, Histogram, _labels, render_metrics, start_metrics_server, write_metrics_file
+)
+
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*"(,[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*")*\})? \S+$')
+
+
+def test_counter_sums_per_label_set():
+    counter = Counter("requests_total", "Requests", ["page"])
+    counter.inc(page="b")
+    counter.inc(2, page="a")
+    counter.inc(page="b")
+
+    assert counter.samples() == [("", [("page", "a")], 2), ("", [("page", "b")], 2)]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.7, 5):
+        histogram.observe(value)
+
+    samples = {(suffix, dict(labels).get("le")): value for suffix, labels, value in histogram.samples()}
+
+    assert samples[("_bucket", "0.1")] == 1
+    assert samples[("_bucket", "1")] == 3
+    assert samples[("_bucket", "+Inf")] == 4
+    assert samples[("_count", None)] == 4
+    assert samples[("_sum", None)] == pytest.approx(6.25)
+
+
+def test_label_values_are_escaped():
+    assert _labels([("page", 'say "hi"\\\n')]) == '{page="say \\"hi\\"\\\\\\n"}'
+
+
+def test_rendered_metrics_are_valid_exposition_text():
+    lines = render_metrics().splitlines()
+
+    names = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+    assert len(names) == len(set(names))
+    for line in lines:
+        assert line.startswith("# HELP ") or line.startswith("# TYPE ") or SAMPLE_LINE.match(line), line
+    for line in lines:
+        if line.startswith("# TYPE") and line.endswith(" counter"):
+            assert line.split()[2].endswith("_total")
+    assert "ahp_prompt_summary_cache_hits_total" in names
+    assert "ahp_figure_cache_entries" in names
+
+
+def test_metrics_file_is_replaced_whole(tmp_path):
+    path = tmp_path / "ahp.prom"
+
+    write_metrics_file(str(path))
+
+    assert path.read_text(encoding="utf-8").startswith("# HELP ")
+    assert [p.name for p in tmp_path.iterdir()] == ["ahp.prom"]
+
+
+def test_server_serves_only_the_metrics_path():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    start_metrics_server(port)
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+        assert response.headers["Content-Type"] == CONTENT_TYPE
+        assert b"# TYPE ahp_reruns_total counter" in response.read()
+    with pytest.raises(urllib.error.HTTPError):
+        urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=5)
@@ -0,0 +1,127 @@
+import itertools
+import threading
+
+import pandas as pd
+import pytest
+
+from data.india_healthcare_data import calculate_cost_projection, calculate_cost_projection_batch
+from utils.micro_batch import MicroBatcher, batched_cost_projection
+
+
+def submit_together(batcher, items):
+    """Submit every item from its own thread so they land in the same collection window"""
+    results = [None] * len(items)
+    errors = [None] * len(items)
+
+    def run(index, item):
+        try:
+            results[index] = batcher.submit(item)
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=run, args=(index, item)) for index, item in enumerate(items)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results, errors
+
+
+def test_duplicate_items_share_one_slot_and_get_copies():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return [{"value": item * 10} for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=6, max_wait=1.0, key=lambda item: item, copy_result=dict)
+    results, errors = submit_together(batcher, [1, 2, 1, 3, 1, 2])
+
+    assert errors == [None] * 6
+    assert [result["value"] for result in results] == [10, 20, 10, 30, 10, 20]
+    assert len(calls) == 1
+    assert sorted(calls[0]) == [1, 2, 3]
+    ones = [result for item, result in zip([1, 2, 1, 3, 1, 2], results) if item == 1]
+    assert len({id(result) for result in ones}) == 3
+    assert batcher.stats()["batches"] == 1
+    assert batcher.stats()["items"] == 6
+
+
+def test_without_copy_result_duplicates_share_the_result():
+    batcher = MicroBatcher(lambda items: [[item] for item in items], max_batch_size=2, max_wait=1.0,
+                           key=lambda item: item)
+    results, _ = submit_together(batcher, ["a", "a"])
+
+    assert results[0] is results[1]
+
+
+def test_failed_batch_is_retried_item_by_item():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        if "bad" in items:
+            raise ValueError("bad item")
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=3, max_wait=1.0, key=lambda item: item)
+    results, errors = submit_together(batcher, ["ok", "bad", "fine"])
+
+    assert results[0] == "OK" and results[2] == "FINE"
+    assert isinstance(errors[1], ValueError)
+    assert errors[0] is None and errors[2] is None
+    assert sorted(calls[0]) == ["bad", "fine", "ok"]
+    assert sorted(len(call) for call in calls[1:]) == [1, 1, 1]
+
+
+def test_batch_is_flushed_at_max_batch_size():
+    sizes = []
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        return list(items)
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait=5.0)
+    results, _ = submit_together(batcher, [1, 2, 3, 4])
+
+    assert sorted(results) == [1, 2, 3, 4]
+    assert max(sizes) <= 2
+
+
+PARAM_SETS = [
+    dict(target_gap_closure_pct=target, years=years, training_cost_multiplier=training, salary_growth_rate=growth,
+         infrastructure_investment_pct=infrastructure, include_retention=retention, inflation_rate=inflation)
+    for target, years, training, growth, infrastructure, retention, inflation in itertools.product(
+        [0, 37.5, 100], [1, 7, 25], [0.5, 1.0], [0.0, 0.065], [0.2], [True, False], [0.05, -0.01]
+    )
+]
+
+
+def test_batch_matches_the_loop_exactly():
+    frames = calculate_cost_projection_batch(PARAM_SETS)
+
+    assert len(frames) == len(PARAM_SETS)
+    for params, frame in zip(PARAM_SETS, frames):
+        pd.testing.assert_frame_equal(frame, calculate_cost_projection(**params), check_exact=True)
+
+
+def test_batch_rejects_timelines_shorter_than_a_year():
+    with pytest.raises(ValueError):
+        calculate_cost_projection_batch([dict(target_gap_closure_pct=50, years=0)])
+
+
+def test_batched_cost_projection_matches_direct_call():
+    expected = calculate_cost_projection(75, 10, inflation_rate=0.06)
+
+    pd.testing.assert_frame_equal(batched_cost_projection(75, 10, inflation_rate=0.06), expected, check_exact=True)
+    pd.testing.assert_frame_equal(
+        batched_cost_projection(target_gap_closure_pct=75, years=10, inflation_rate=0.06), expected, check_exact=True
+    )
+
+
+def test_batched_cost_projection_returns_independent_frames():
+    first = batched_cost_projection(60, 5)
+    first["Total Year Cost (₹ Cr)"] = 0
+    second = batched_cost_projection(60, 5)
+
+    pd.testing.assert_frame_equal(second, calculate_cost_projection(60, 5), check_exact=True)
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from utils import perf
+from utils.perf import BACKGROUND, PERF, RERUN, LatencyStats, begin_rerun, end_rerun, perf_page_unlocked, span, timed
+
+
+@pytest.fixture
+def recording(monkeypatch):
+    monkeypatch.setattr(PERF, "enabled", True)
+    PERF.reset()
+    yield PERF
+    PERF.reset()
+    perf._local.page = None
+
+
+@pytest.mark.parametrize("supplied, key, unlocked", [
+    ("secret", "secret", True),
+    ("perf", "secret", False),
+    ("", "secret", False),
+    (None, "secret", False),
+    ("perf", None, False),
+    ("", "", False),
+])
+def test_perf_page_needs_a_configured_matching_key(supplied, key, unlocked):
+    assert perf_page_unlocked(supplied, key) is unlocked
+
+
+def test_latency_stats_summary():
+    stats = LatencyStats(sample_size=100)
+    for elapsed in range(1, 101):
+        stats.add(float(elapsed))
+
+    summary = stats.summary()
+
+    assert summary["count"] == 100
+    assert summary["mean_ms"] == pytest.approx(50.5)
+    assert summary["p50_ms"] == 51
+    assert summary["max_ms"] == 100
+    assert summary["buckets"]["1"] == 1
+    assert summary["buckets"]["100"] == 50
+    assert sum(summary["buckets"].values()) == 100
+
+
+def test_spans_are_attributed_to_the_rerun_page(recording):
+    @timed
+    def work():
+        return "done"
+
+    begin_rerun("Cost Calculator")
+    with span("chart"):
+        assert work() == "done"
+    end_rerun()
+
+    snapshot = recording.snapshot()
+    assert list(snapshot["Cost Calculator"]) == [RERUN, "chart", "work"]
+    assert snapshot["Cost Calculator"]["work"]["count"] == 1
+
+
+def test_other_threads_record_as_background(recording):
+    def job():
+        with span("job"):
+            pass
+
+    begin_rerun("Cost Calculator")
+    thread = threading.Thread(target=job)
+    thread.start()
+    thread.join()
+
+    assert "job" in recording.snapshot()[BACKGROUND]
+
+
+def test_disabled_recorder_records_nothing(monkeypatch):
+    monkeypatch.setattr(PERF, "enabled", False)
+    PERF.reset()
+
+    with span("chart"):
+        pass
+
+    assert PERF.snapshot() == {}
@@ -0,0 +1,106 @@
+import functools
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from utils import profiling
+from utils.profiling import (
+    CPROFILE, SAMPLING, ProfileCapture, StackSampler, abandon_profile, begin_profile, end_profile, profile_params,
+    recent_profiles, requested_mode
+)
+
+
+@pytest.fixture
+def profile_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "ProfileCapture", functools.partial(ProfileCapture, output_dir=str(tmp_path)))
+    yield str(tmp_path)
+    abandon_profile()
+
+
+def busy(seconds=0.05):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+@pytest.mark.parametrize("value, mode", [
+    ("1", CPROFILE), ("true", CPROFILE), ("cProfile", CPROFILE), ("sample", SAMPLING), ("sampling", SAMPLING),
+    ("", None), (None, None), ("flame", None),
+])
+def test_requested_mode(value, mode):
+    assert requested_mode(value) == mode
+
+
+def test_profile_params_keep_only_json_safe_values():
+    params = profile_params({"page": "Costs", "years": 10, "regions": ("North", "South")}, {"frame": object()})
+
+    assert params == {"page": "Costs", "years": 10, "regions": ["North", "South"]}
+    json.dumps(params)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        ProfileCapture("trace", "Costs")
+
+
+def test_cprofile_capture_writes_stats_summary_and_metadata(profile_dir):
+    begin_profile(CPROFILE, "Cost Calculator", {"years": 10})
+    busy()
+    paths = end_profile()
+
+    assert [os.path.splitext(path)[1] for path in paths] == [".prof", ".txt", ".json"]
+    with open(paths[0].replace(".prof", ".txt"), encoding="utf-8") as f:
+        assert "busy" in f.read()
+    [profile] = recent_profiles(output_dir=profile_dir)
+    assert profile["page"] == "Cost Calculator"
+    assert profile["params"] == {"years": 10}
+    assert profile["paths"] == paths[:-1]
+    assert end_profile() == []
+
+
+def test_sampling_capture_writes_folded_stacks(profile_dir):
+    begin_profile(SAMPLING, "Scenario Comparison")
+    busy(0.1)
+    paths = end_profile()
+
+    with open(paths[0], encoding="utf-8") as f:
+        folded = f.read().splitlines()
+    assert folded and all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+    assert any("busy (test_profiling.py" in line for line in folded)
+    assert recent_profiles(output_dir=profile_dir)[0]["samples"] > 0
+
+
+def test_abandoned_capture_writes_nothing(profile_dir):
+    begin_profile(CPROFILE, "Cost Calculator")
+    abandon_profile()
+
+    assert end_profile() == []
+    assert os.listdir(profile_dir) == []
+
+
+def test_captures_are_per_thread(profile_dir):
+    begin_profile(CPROFILE, "Cost Calculator")
+    other = []
+    thread = threading.Thread(target=lambda: other.append(end_profile()))
+    thread.start()
+    thread.join()
+
+    assert other == [[]]
+    assert end_profile()
+
+
+def test_sampler_stops_when_its_thread_exits():
+    thread = threading.Thread(target=busy, args=(0.2,))
+    sampler = StackSampler(thread, interval=0.001)
+    thread.start()
+    sampler.start()
+    thread.join()
+
+    sampler.stop()
+
+    assert sum(sampler.stacks.values()) > 0
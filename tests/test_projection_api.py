@@ -0,0 +1,109 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from data.india_healthcare_data import DATA_VERSION
+from utils.projection_api import RESPONSE_CACHE, ApiError, create_server, etag_matches, get_response
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = create_server("127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, path, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", "abc"', True),
+    ("*", True),
+    ('"abcd"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_identical_queries_share_a_cached_response():
+    RESPONSE_CACHE.clear()
+    first = get_response("/v1/cost-projection", "target_gap_closure_pct=75&years=10")
+    second = get_response("/v1/cost-projection", "years=10&target_gap_closure_pct=75.0")
+
+    assert second is first
+    assert first.etag.startswith(f'"{DATA_VERSION}-')
+    assert RESPONSE_CACHE.stats()["hits"] == 1
+
+
+def test_different_parameters_get_different_etags():
+    first = get_response("/v1/cost-projection", "target_gap_closure_pct=75&years=10")
+    second = get_response("/v1/cost-projection", "target_gap_closure_pct=80&years=10")
+
+    assert first.etag != second.etag
+
+
+@pytest.mark.parametrize("path, query, status", [
+    ("/v1/unknown", "", 404),
+    ("/v1/cost-projection", "years=10", 400),
+    ("/v1/cost-projection", "target_gap_closure_pct=75&years=10&colour=red", 400),
+    ("/v1/cost-projection", "target_gap_closure_pct=75&years=10&years=11", 400),
+    ("/v1/scenario-comparison", "years=0", 400),
+])
+def test_invalid_requests_raise_api_errors(path, query, status):
+    with pytest.raises(ApiError) as excinfo:
+        get_response(path, query)
+    assert excinfo.value.status == status
+
+
+def test_get_returns_rows_with_an_etag(server):
+    status, headers, body = request(server, "/v1/cost-projection?target_gap_closure_pct=75&years=10")
+    payload = json.loads(body)
+
+    assert status == 200
+    assert headers["ETag"].startswith(f'"{DATA_VERSION}-')
+    assert headers["Cache-Control"] == "no-cache"
+    assert payload["data_version"] == DATA_VERSION
+    assert payload["params"]["years"] == 10
+    assert len(payload["rows"]) == 10
+
+
+def test_matching_if_none_match_gets_304_without_a_body(server):
+    path = "/v1/scenario-comparison?years=12"
+    _, headers, _ = request(server, path)
+
+    status, revalidated, body = request(server, path, {"If-None-Match": headers["ETag"]})
+
+    assert status == 304
+    assert body == b""
+    assert revalidated["ETag"] == headers["ETag"]
+
+
+def test_stale_if_none_match_gets_the_full_response(server):
+    status, headers, body = request(server, "/v1/regions", {"If-None-Match": '"old-version-0000"'})
+
+    assert status == 200
+    assert json.loads(body)["rows"]
+    assert headers["ETag"] != '"old-version-0000"'
+
+
+def test_errors_are_json_without_an_etag(server):
+    status, headers, body = request(server, "/v1/cost-projection?years=10")
+
+    assert status == 400
+    assert "ETag" not in headers
+    assert "target_gap_closure_pct is required" in json.loads(body)["error"]
@@ -0,0 +1,83 @@
+import pytest
+
+from data.india_healthcare_data import TOTAL_GAP, calculate_cost_projection
+from utils.ai_helper_gemini import POLICY_PROMPT_TOKEN_BUDGET, AIHealthcareAnalyst
+from utils.ai_helper_openai import STRATEGY_CONTEXT_TOKEN_BUDGET, _strategy_context
+from utils.llm_scheduler import estimate_tokens
+from utils.prompt_builder import (
+    PromptBuilder, category_summary, closure_target, compact_prompt, policy_scenario_data, projection_summary
+)
+
+
+def test_required_sections_are_kept_even_over_budget():
+    prompt = PromptBuilder(budget=5).add("MUST", ["a long required line " * 5], required=True).build()
+
+    assert prompt.startswith("MUST:\na long required line")
+
+
+def test_optional_sections_fill_the_budget_by_priority_in_added_order():
+    builder = PromptBuilder(budget=40)
+    builder.add("LOW", ["- low " + "word " * 40], priority=2)
+    builder.add("INTRO", "Intro line", required=True)
+    builder.add("HIGH", ["- first", "- second", "- third " + "word " * 50], priority=0)
+
+    prompt = builder.build()
+
+    assert prompt == "INTRO:\nIntro line\n\nHIGH:\n- first\n- second"
+    assert estimate_tokens(prompt) <= 40
+
+
+def test_sections_without_title_render_their_lines_alone():
+    assert PromptBuilder().add(None, ["one", "two"], required=True).build() == "one\ntwo"
+
+
+def test_compact_prompt_strips_indentation_and_padding():
+    text = """
+        Heading:   
+            - item
+
+        """
+
+    assert compact_prompt(text) == "Heading:\n    - item"
+
+
+def test_projection_summary_comes_from_the_cost_projection():
+    df = calculate_cost_projection(75, 10)
+
+    summary = projection_summary(75, 10)
+
+    assert summary["total_cost_cr"] == round(float(df["Total Year Cost (₹ Cr)"].sum()))
+    assert summary["gap_remaining"] == int(df["Gap Remaining"].iloc[-1])
+    assert sum(summary["cost_mix_pct"].values()) == pytest.approx(100, abs=0.5)
+
+
+def test_closure_target_is_read_from_the_scenario_label():
+    assert closure_target("Moderate (75% by 2035)") == 75
+    assert closure_target("Quick Win (50% by 2030)") == 50
+    assert closure_target("Custom") == 100
+
+
+def test_category_summary_is_ordered_largest_gap_first():
+    gaps = [info["gap"] for info in category_summary().values()]
+
+    assert gaps == sorted(gaps, reverse=True)
+
+
+def test_policy_prompt_uses_live_numbers_within_budget(monkeypatch):
+    monkeypatch.setenv("AI_BACKEND", "stub")
+    analyst = AIHealthcareAnalyst()
+    scenario_data = policy_scenario_data("Moderate (75% by 2035)", 10)
+
+    prompt = analyst.build_policy_prompt(scenario_data, category_summary())
+
+    assert scenario_data["total_gap"] == TOTAL_GAP
+    assert f"₹{scenario_data['budget']:,} crore" in prompt
+    assert estimate_tokens(prompt) <= POLICY_PROMPT_TOKEN_BUDGET
+    assert prompt == analyst.build_policy_prompt(scenario_data, category_summary())
+
+
+def test_strategy_context_stays_within_budget():
+    context = _strategy_context("Nursing", "Moderate", "Rural access", 10, "Balanced")
+
+    assert "- Key shortage areas: Nursing" in context
+    assert estimate_tokens(context) <= STRATEGY_CONTEXT_TOKEN_BUDGET
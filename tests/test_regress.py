@@ -0,0 +1,55 @@
+import json
+
+from benchmarks.regress import BASELINE_PATH, IMPROVED, MISSING, NEW, OK, REGRESSED, compare
+
+
+def result(median_ms, low_ms=None, high_ms=None):
+    low_ms = median_ms * 0.95 if low_ms is None else low_ms
+    high_ms = median_ms * 1.05 if high_ms is None else high_ms
+    return {"median_s": median_ms / 1000, "ci95_s": [low_ms / 1000, high_ms / 1000]}
+
+
+def statuses(baseline, current, **kwargs):
+    return {row["case"]: row["status"] for row in compare(baseline, current, **kwargs)}
+
+
+def test_clear_slowdowns_and_speedups_are_flagged():
+    baseline = {"slow": result(10), "fast": result(10), "same": result(10)}
+    current = {"slow": result(20), "fast": result(5), "same": result(10.5)}
+
+    assert statuses(baseline, current) == {"slow": REGRESSED, "fast": IMPROVED, "same": OK}
+
+
+def test_overlapping_confidence_intervals_are_not_a_regression():
+    baseline = {"noisy": result(10, 6, 16)}
+    current = {"noisy": result(14, 9, 20)}
+
+    assert statuses(baseline, current) == {"noisy": OK}
+
+
+def test_slowdowns_below_the_minimum_delta_are_ignored():
+    baseline = {"tiny": result(0.2)}
+    current = {"tiny": result(0.5)}
+
+    assert statuses(baseline, current) == {"tiny": OK}
+    assert statuses(baseline, current, min_delta_ms=0.1) == {"tiny": REGRESSED}
+
+
+def test_speed_factor_normalises_a_slower_machine():
+    baseline = {"case": result(10)}
+    current = {"case": result(20)}
+
+    assert statuses(baseline, current, speed_factor=2.0) == {"case": OK}
+
+
+def test_added_and_removed_cases_are_reported():
+    assert statuses({"old": result(1)}, {"new": result(1)}) == {"old": MISSING, "new": NEW}
+
+
+def test_committed_baseline_covers_every_hot_case():
+    from benchmarks.suite import build_cases
+
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    assert set(baseline["results"]) == {case.key for case in build_cases(hot_only=True)}
@@ -0,0 +1,154 @@
+import json
+import os
+import time
+
+import pytest
+
+from utils import report_batch
+from utils.report_batch import (
+    REPORT_SCENARIOS, REPORT_TYPES, assemble_board_pack, build_batch_items, item_fingerprint, prune_run_dirs,
+    run_batch, run_dir
+)
+
+
+def fake_items(texts, version="v1"):
+    """Batch items whose generate() returns canned text and counts its calls"""
+    calls = []
+
+    def generator(item_id, text):
+        def generate():
+            calls.append(item_id)
+            if isinstance(text, Exception):
+                raise text
+            return text
+        return generate
+
+    items = [
+        (item_id, item_id.title(), generator(item_id, text), f"{version}-{item_id}")
+        for item_id, text in texts.items()
+    ]
+    return items, calls
+
+
+def test_run_batch_writes_each_document_and_a_manifest(tmp_path):
+    items, calls = fake_items({"alpha": "first", "beta": "second"})
+
+    summary = run_batch(str(tmp_path), items, max_workers=2)
+
+    assert sorted(summary["completed"]) == ["alpha", "beta"]
+    assert sorted(calls) == ["alpha", "beta"]
+    with open(tmp_path / "manifest.json", encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert manifest["items"] == {"alpha": "v1-alpha", "beta": "v1-beta"}
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_rerun_skips_finished_documents_and_retries_failures(tmp_path):
+    items, _ = fake_items({"alpha": "first", "broken": RuntimeError("quota")})
+    summary = run_batch(str(tmp_path), items)
+    assert summary["failed"] == {"broken": "quota"}
+
+    items, calls = fake_items({"alpha": "first", "broken": "fixed"})
+    summary = run_batch(str(tmp_path), items)
+
+    assert summary["skipped"] == ["alpha"]
+    assert calls == ["broken"]
+
+
+def test_empty_responses_count_as_failures(tmp_path):
+    items, _ = fake_items({"alpha": ""})
+
+    assert "alpha" in run_batch(str(tmp_path), items)["failed"]
+
+
+def test_changed_fingerprints_are_regenerated(tmp_path):
+    run_batch(str(tmp_path), fake_items({"alpha": "old"})[0])
+
+    items, calls = fake_items({"alpha": "new"}, version="v2")
+    run_batch(str(tmp_path), items)
+
+    assert calls == ["alpha"]
+    assert "new" in assemble_board_pack(str(tmp_path), items)
+
+
+def test_force_regenerates_everything(tmp_path):
+    run_batch(str(tmp_path), fake_items({"alpha": "text"})[0])
+    items, calls = fake_items({"alpha": "text"})
+
+    run_batch(str(tmp_path), items, force=True)
+
+    assert calls == ["alpha"]
+
+
+def test_board_pack_follows_batch_order_and_marks_missing_documents(tmp_path):
+    items, _ = fake_items({"beta": "second", "alpha": "first"})
+    run_batch(str(tmp_path), items[:1])
+
+    pack = assemble_board_pack(str(tmp_path), items)
+
+    assert pack.index("# Beta") < pack.index("# Alpha")
+    assert "# Alpha\n\n_Not generated yet._" in pack
+
+
+def test_fingerprint_covers_dataset_version_model_and_prompt(monkeypatch):
+    base = item_fingerprint("model", "prompt")
+
+    assert item_fingerprint("model", "prompt") == base
+    assert item_fingerprint("other", "prompt") != base
+    assert item_fingerprint("model", "other") != base
+    monkeypatch.setattr(report_batch, "DATA_VERSION", "next")
+    assert item_fingerprint("model", "prompt") != base
+
+
+def test_run_dir_is_shared_by_identical_batches(tmp_path):
+    items, _ = fake_items({"alpha": "a"})
+
+    first = run_dir(items, str(tmp_path))
+
+    assert run_dir(items, str(tmp_path)) == first
+    assert run_dir(fake_items({"alpha": "a"}, version="v2")[0], str(tmp_path)) != first
+
+
+def test_old_run_dirs_are_pruned(tmp_path):
+    runs = tmp_path / "runs"
+    for index in range(4):
+        path = runs / f"run{index}"
+        path.mkdir(parents=True)
+        stamp = time.time() - 100 + index
+        os.utime(path, (stamp, stamp))
+
+    removed = prune_run_dirs(str(runs), keep=2, current=str(runs / "run0"))
+
+    assert sorted(os.listdir(runs)) == ["run0", "run3"]
+    assert sorted(os.path.basename(path) for path in removed) == ["run1", "run2"]
+
+
+def test_build_batch_items_needs_no_api_key(monkeypatch):
+    monkeypatch.setenv("AI_BACKEND", "stub")
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    items = build_batch_items()
+
+    assert len(items) == len(REPORT_SCENARIOS) * len(REPORT_TYPES) + 1
+    assert len({item_id for item_id, _, _, _ in items}) == len(items)
+    assert [item[3] for item in build_batch_items()] == [item[3] for item in items]
+
+
+def test_build_batch_items_fingerprints_depend_on_the_backend(monkeypatch):
+    monkeypatch.setenv("AI_BACKEND", "stub")
+    stub = [item[3] for item in build_batch_items(include_strategy=False)]
+    monkeypatch.delenv("AI_BACKEND")
+
+    assert [item[3] for item in build_batch_items(include_strategy=False)] != stub
+
+
+@pytest.mark.parametrize("keep", [0, 1])
+def test_prune_never_removes_the_current_run(tmp_path, keep):
+    runs = tmp_path / "runs"
+    (runs / "current").mkdir(parents=True)
+    (runs / "newer").mkdir()
+
+    prune_run_dirs(str(runs), keep=keep, current=str(runs / "current"))
+
+    assert os.path.isdir(runs / "current")
@@ -0,0 +1,126 @@
+import time
+
+import pytest
+
+from utils import response_cache
+from utils.response_cache import ResponseCache, response_cache_key
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache.time, "time", fake)
+    return fake
+
+
+def test_put_then_get_round_trips_per_model(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    cache.put("model-a", "prompt", "answer a")
+
+    assert cache.get("model-a", "prompt") == "answer a"
+    assert cache.get("model-b", "prompt") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_separates_model_from_prompt():
+    assert response_cache_key("ab", "c") != response_cache_key("a", "bc")
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.db"), ttl_seconds=60)
+    cache.put("model", "prompt", "answer")
+
+    clock.now += 59
+    assert cache.get("model", "prompt") == "answer"
+    clock.now += 2
+    assert cache.get("model", "prompt") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_reads_do_not_extend_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.db"), ttl_seconds=60)
+    cache.put("model", "prompt", "answer")
+
+    for _ in range(3):
+        clock.now += 30
+        cache.get("model", "prompt")
+    assert cache.get("model", "prompt") is None
+
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=30)
+    for name in ("first", "second", "third"):
+        clock.now += 1
+        cache.put("model", name, "x" * 10)
+    clock.now += 1
+    assert cache.get("model", "first") is not None
+
+    clock.now += 1
+    cache.put("model", "fourth", "x" * 10)
+
+    assert cache.get("model", "second") is None
+    assert cache.get("model", "first") is not None
+    assert cache.get("model", "third") is not None
+    assert cache.get("model", "fourth") is not None
+    assert cache.stats()["bytes"] == 30
+
+
+def test_cache_persists_across_instances(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(path).put("model", "prompt", "answer")
+
+    assert ResponseCache(path).get("model", "prompt") == "answer"
+
+
+@pytest.fixture
+def shared_cache(monkeypatch, tmp_path):
+    cache = ResponseCache(str(tmp_path / "shared.db"))
+    monkeypatch.setattr(response_cache, "_response_cache", cache)
+    return cache
+
+
+def test_cached_stream_passes_chunks_through_and_caches_the_text(shared_cache):
+    chunks = list(response_cache.cached_stream("model", "prompt", lambda: iter(["Hello, ", "world"])))
+
+    assert chunks == ["Hello, ", "world"]
+    assert shared_cache.get("model", "prompt") == "Hello, world"
+
+
+def test_cached_stream_yields_a_hit_in_one_chunk(shared_cache):
+    shared_cache.put("model", "prompt", "cached answer")
+
+    chunks = list(response_cache.cached_stream("model", "prompt", lambda: pytest.fail("stream was opened")))
+
+    assert chunks == ["cached answer"]
+
+
+def test_empty_streams_are_not_cached(shared_cache):
+    assert list(response_cache.cached_stream("model", "prompt", lambda: iter([]))) == []
+
+    assert shared_cache.get("model", "prompt") is None
+
+
+def test_a_reader_stopping_early_does_not_stop_caching(shared_cache):
+    stream = response_cache.cached_stream("model", "prompt", lambda: iter(["partial", " rest"]))
+    assert next(stream) == "partial"
+    stream.close()
+
+    deadline = time.monotonic() + 5
+    while shared_cache.get("model", "prompt") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert shared_cache.get("model", "prompt") == "partial rest"
+
+
+def test_cached_generate_shares_the_cache_with_streams(shared_cache):
+    list(response_cache.cached_stream("model", "prompt", lambda: iter(["streamed"])))
+
+    assert response_cache.cached_generate("model", "prompt", lambda: pytest.fail("generated again")) == "streamed"
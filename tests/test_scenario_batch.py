@@ -0,0 +1,135 @@
+import os
+
+import pandas as pd
+import pytest
+
+from data.india_healthcare_data import calculate_cost_projection
+from utils import scenario_batch
+from utils.scenario_batch import checkpoint_dir, run_scenarios
+from utils.scenario_specs import COST_PARAMETERS, load_specs, normalize_spec, resolve_params
+
+requires_parquet = pytest.mark.skipif(scenario_batch.pyarrow is None, reason="pyarrow is not installed")
+
+
+def test_normalize_spec_fills_defaults_and_coerces_types():
+    spec = normalize_spec({"id": "base", "model": "cost", "target_gap_closure_pct": "75", "years": "10",
+                           "include_retention": "no"})
+
+    assert spec["id"] == "base"
+    assert spec["models"] == ["cost_projection"]
+    assert spec["strategy"] is None
+    assert spec["cost"]["target_gap_closure_pct"] == 75.0
+    assert spec["cost"]["years"] == 10 and isinstance(spec["cost"]["years"], int)
+    assert spec["cost"]["include_retention"] is False
+    assert spec["cost"]["inflation_rate"] == 0.05
+
+
+@pytest.mark.parametrize("raw, message", [
+    ({"years": "10"}, "target_gap_closure_pct is required"),
+    ({"target_gap_closure_pct": 75, "years": "2.5"}, "whole number"),
+    ({"target_gap_closure_pct": 75, "years": 0}, "between"),
+    ({"target_gap_closure_pct": "lots", "years": 10}, "must be a number"),
+    ({"target_gap_closure_pct": 75, "years": 10, "include_retention": "maybe"}, "true or false"),
+    ({"target_gap_closure_pct": 75, "years": 10, "budget": 5}, "unknown parameter"),
+    ({"target_gap_closure_pct": 75, "years": 10, "model": "other"}, "model must be one of"),
+])
+def test_invalid_specs_are_rejected(raw, message):
+    with pytest.raises(ValueError, match=message):
+        normalize_spec(raw)
+
+
+def test_resolve_params_rejects_non_finite_numbers():
+    with pytest.raises(ValueError, match="finite"):
+        resolve_params({"target_gap_closure_pct": "nan", "years": 10, "inflation_rate": "inf"}, COST_PARAMETERS)
+
+
+def test_specs_without_an_id_get_a_stable_hash():
+    first = normalize_spec({"target_gap_closure_pct": 50, "years": 5})
+    second = normalize_spec({"years": "5", "target_gap_closure_pct": "50"})
+
+    assert first["id"] == second["id"]
+    assert first["id"] != normalize_spec({"target_gap_closure_pct": 51, "years": 5})["id"]
+
+
+def test_load_specs_reports_the_row_and_duplicate_ids(tmp_path):
+    path = tmp_path / "scenarios.csv"
+    path.write_text("id,target_gap_closure_pct,years\na,50,5\na,60,5\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="scenario 2 repeats id 'a'"):
+        load_specs(str(path))
+
+    path.write_text("id,target_gap_closure_pct,years\na,50,5\nb,60,-1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="scenario 2: years"):
+        load_specs(str(path))
+
+
+def test_load_specs_applies_yaml_defaults(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "scenarios.yaml"
+    path.write_text(
+        "defaults:\n  years: 8\n  model: cost\nscenarios:\n  - id: low\n    target_gap_closure_pct: 40\n"
+        "  - id: high\n    target_gap_closure_pct: 90\n    years: 12\n",
+        encoding="utf-8"
+    )
+    specs = load_specs(str(path))
+
+    assert [(spec["id"], spec["cost"]["years"]) for spec in specs] == [("low", 8), ("high", 12)]
+
+
+def cost_spec(scenario, target, years=5):
+    return normalize_spec({"id": scenario, "model": "cost", "target_gap_closure_pct": target, "years": years})
+
+
+@requires_parquet
+def test_run_scenarios_writes_every_projection(tmp_path):
+    output = str(tmp_path / "results.parquet")
+    specs = [cost_spec("a", 50), normalize_spec({"id": "b", "target_gap_closure_pct": 75, "years": 3})]
+
+    summary = run_scenarios(specs, output, max_workers=1)
+    results = pd.read_parquet(output)
+
+    assert summary["completed"] == 2 and summary["failed"] == {}
+    assert not os.path.exists(checkpoint_dir(output))
+    assert list(results.groupby(["Scenario ID", "Model"], sort=False).size().items()) == [
+        (("a", "cost_projection"), 5), (("b", "cost_projection"), 3), (("b", "proposed_strategy"), 4)
+    ]
+    cost_a = results[results["Scenario ID"] == "a"].reset_index(drop=True)
+    expected = calculate_cost_projection(50, 5)
+    pd.testing.assert_frame_equal(cost_a[expected.columns], expected, check_dtype=False)
+
+
+@requires_parquet
+def test_run_scenarios_resumes_from_the_checkpoint(tmp_path):
+    output = str(tmp_path / "results.parquet")
+    run_scenarios([cost_spec("a", 50), cost_spec("b", 60)], output, max_workers=1, keep_checkpoint=True)
+
+    summary = run_scenarios([cost_spec("a", 50), cost_spec("b", 65), cost_spec("c", 70)], output, max_workers=1)
+
+    assert summary["skipped"] == 1
+    assert summary["completed"] == 2
+    results = pd.read_parquet(output)
+    assert results.drop_duplicates("Scenario ID")["target_gap_closure_pct"].tolist() == [50, 65, 70]
+
+
+@requires_parquet
+def test_checkpoint_from_another_dataset_version_is_discarded(tmp_path, monkeypatch):
+    output = str(tmp_path / "results.parquet")
+    run_scenarios([cost_spec("a", 50)], output, max_workers=1, keep_checkpoint=True)
+
+    monkeypatch.setattr(scenario_batch, "DATA_VERSION", "other-version")
+    summary = run_scenarios([cost_spec("a", 50)], output, max_workers=1)
+
+    assert summary["discarded_checkpoint"] is True
+    assert summary["skipped"] == 0 and summary["completed"] == 1
+
+
+@requires_parquet
+def test_failed_scenarios_keep_the_checkpoint(tmp_path):
+    output = str(tmp_path / "results.parquet")
+    broken = cost_spec("broken", 50)
+    broken["cost"]["years"] = 0
+
+    summary = run_scenarios([cost_spec("a", 50), broken], output, max_workers=1)
+
+    assert list(summary["failed"]) == ["broken"]
+    assert os.path.isdir(checkpoint_dir(output))
+    assert pd.read_parquet(output)["Scenario ID"].unique().tolist() == ["a"]
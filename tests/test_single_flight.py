@@ -0,0 +1,165 @@
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def test_concurrent_do_calls_share_one_upstream_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fn)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", fn))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert results == ["result"] * 4
+    assert len(calls) == 1
+    assert flight.stats() == {"in_flight": 0, "upstream_calls": 1, "coalesced_calls": 3}
+
+
+def test_do_errors_reach_every_waiter_and_are_not_cached():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(errors) == 2
+    assert flight.do("k", lambda: "recovered") == "recovered"
+
+
+def test_stream_followers_read_the_same_chunks():
+    flight = SingleFlight()
+    release = threading.Event()
+    opened = []
+
+    def stream():
+        opened.append(1)
+        yield "a"
+        release.wait(5)
+        yield "b"
+        yield "c"
+
+    first = flight.stream("k", stream)
+    assert next(first) == "a"
+    second = flight.stream("k", stream)
+    release.set()
+
+    assert "a" + "".join(first) == "abc"
+    assert "".join(second) == "abc"
+    assert len(opened) == 1
+
+
+def test_stream_keeps_running_when_a_reader_stops_early():
+    flight = SingleFlight()
+    completed = []
+
+    def stream():
+        for chunk in "xyz":
+            time.sleep(0.01)
+            yield chunk
+
+    reader = flight.stream("k", stream, on_complete=completed.append)
+    assert next(reader) == "x"
+    reader.close()
+
+    deadline = time.monotonic() + 5
+    while not completed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert completed == ["xyz"]
+
+
+def test_do_joins_an_in_flight_stream():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def stream():
+        yield "partial "
+        release.wait(5)
+        yield "text"
+
+    reader = flight.stream("k", stream)
+    assert next(reader) == "partial "
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(flight.do("k", lambda: "second upstream call")))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    waiter.join(5)
+
+    assert result == ["partial text"]
+    assert flight.stats()["upstream_calls"] == 1
+
+
+def test_stream_joins_an_in_flight_do_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+        return "whole response"
+
+    result = []
+    leader = threading.Thread(target=lambda: result.append(flight.do("k", fn)))
+    leader.start()
+    started.wait(5)
+    reader = flight.stream("k", lambda: iter(["should not run"]))
+    release.set()
+
+    assert list(reader) == ["whole response"]
+    leader.join(5)
+    assert result == ["whole response"]
+    assert flight.stats()["upstream_calls"] == 1
+
+
+def test_stream_errors_propagate_to_readers():
+    flight = SingleFlight()
+
+    def stream():
+        yield "a"
+        raise ConnectionError("dropped")
+
+    with pytest.raises(ConnectionError):
+        list(flight.stream("k", stream))
+    assert flight.stats()["in_flight"] == 0
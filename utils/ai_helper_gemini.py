@@ -1,85 +1,93 @@
-import os
-import google.generativeai as genai
 import streamlit as st
 
+from utils.llm_providers import get_backend
+from utils.llm_scheduler import estimate_tokens, get_scheduler
+from utils.prompt_builder import PromptBuilder, category_lines, compact_prompt, projection_lines, region_lines
+from utils.response_cache import cached_generate, cached_stream
+
+GEMINI_MODEL_NAME = 'gemini-2.0-flash'
+# Gemini has no output cap set here; budget this many output tokens per call for rate limiting
+GEMINI_OUTPUT_TOKEN_ESTIMATE = 2048
+POLICY_PROMPT_TOKEN_BUDGET = 600
+
+
 class AIHealthcareAnalyst:
     """AI-powered healthcare policy analyst using Google Gemini (FREE)"""
     
     def __init__(self):
-        """Initialize Gemini client"""
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY not found in environment variables")
-        
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        """Attach to the shared Gemini backend (created once per process)"""
+        self.backend = get_backend("gemini", GEMINI_MODEL_NAME)
+        self.model_name = self.backend.model_name
+
+    def _generate(self, prompt):
+        """Generate text for a prompt, served from the persistent response cache when possible"""
+        def request(timeout):
+            return self.backend.generate(prompt, timeout=timeout)
+
+        return cached_generate(
+            self.model_name,
+            prompt,
+            lambda: get_scheduler("gemini").call(request, tokens=self._token_budget(prompt))
+        )
+
+    def _stream(self, prompt):
+        """Stream text chunks for a prompt; a cached response is yielded in one piece"""
+        return cached_stream(
+            self.model_name,
+            prompt,
+            lambda: get_scheduler("gemini").stream(
+                lambda timeout: self.backend.stream(prompt, timeout=timeout),
+                tokens=self._token_budget(prompt)
+            )
+        )
+
+    @staticmethod
+    def _token_budget(prompt):
+        return estimate_tokens(prompt) + GEMINI_OUTPUT_TOKEN_ESTIMATE
 
+    def build_policy_prompt(self, scenario_data, category_data):
+        """Render the policy recommendations prompt within POLICY_PROMPT_TOKEN_BUDGET"""
+        builder = PromptBuilder(POLICY_PROMPT_TOKEN_BUDGET)
+        builder.add(None, (
+            "You are an expert healthcare policy consultant specializing in workforce development "
+            "and UHC implementation in India. Analyze this healthcare workforce scenario and provide "
+            "strategic policy recommendations."
+        ), required=True)
+        builder.add("SCENARIO DETAILS", [
+            f"- Total AHP Gap: {scenario_data.get('total_gap', 'Not specified'):,} professionals",
+            f"- Target Timeline: {scenario_data.get('years', 'Not specified')} years",
+            f"- Strategy Type: {scenario_data.get('strategy_type', 'Not specified')}",
+            f"- Budget Required: ₹{scenario_data.get('budget', 'Not specified'):,} crore",
+            f"- Gap Closure Target: {scenario_data.get('gap_closure_pct', 'Not specified')}%",
+        ], required=True)
+        if scenario_data.get("projection"):
+            builder.add("COST PROJECTION", projection_lines(scenario_data["projection"]), priority=0)
+        builder.add("GEOGRAPHIC CONTEXT", region_lines(), priority=1)
+        builder.add("CATEGORY PRIORITIES", category_lines(category_data), priority=2)
+        builder.add("PROVIDE", [
+            "1. IMMEDIATE ACTIONS (0-6 months): 3-4 specific, low-cost quick wins",
+            "2. MEDIUM-TERM STRATEGIES (6-18 months): capacity building, infrastructure, funding mechanisms",
+            "3. LONG-TERM VISION (18+ months): sustainable systems, retention, rural equity",
+            "4. IMPLEMENTATION RISKS & MITIGATION: 3-4 key risks with mitigations",
+            "5. SUCCESS METRICS: 3-4 KPIs and a monitoring framework",
+            "Format your response clearly with bold headers and bullet points.",
+        ], required=True)
+        return builder.build()
+    
     def get_policy_recommendations(self, scenario_data, category_data):
         """Generate AI-powered policy recommendations"""
-        
-        category_summary = "\n".join([
-            f"- {cat}: {info['gap']:,} gap, {info['gap_percentage']}% of total, "
-            f"₹{info['avg_salary_inr']:,} avg salary"
-            for cat, info in category_data.items()
-        ])
-        
-        prompt = f"""
-        You are an expert healthcare policy consultant specializing in workforce development 
-        and UHC implementation in India.
-        
-        Analyze this healthcare workforce scenario and provide strategic policy recommendations:
-        
-        SCENARIO DETAILS:
-        - Total AHP Gap: {scenario_data.get('total_gap', 'Not specified'):,} professionals
-        - Target Timeline: {scenario_data.get('years', 'Not specified')} years
-        - Strategy Type: {scenario_data.get('strategy_type', 'Not specified')}
-        - Budget Required: ₹{scenario_data.get('budget', 'Not specified')} crore
-        - Gap Closure Target: {scenario_data.get('gap_closure_pct', 'Not specified')}%
-        
-        CATEGORY PRIORITIES:
-        {category_summary}
-        
-        GEOGRAPHIC CONTEXT:
-        - 75% of gap in rural areas
-        - 65% of India's population in rural regions
-        - Only 42% of current AHPs serve rural areas
-        
-        Based on this analysis, provide:
-        
-        1. IMMEDIATE ACTIONS (0-6 months)
-           - 3-4 specific, actionable steps
-           - Focus on quick wins
-           - Low-cost interventions
-        
-        2. MEDIUM-TERM STRATEGIES (6-18 months)
-           - Capacity building initiatives
-           - Infrastructure requirements
-           - Funding mechanisms
-        
-        3. LONG-TERM VISION (18+ months)
-           - Sustainable systems
-           - Retention strategies
-           - Equity considerations (rural focus)
-        
-        4. IMPLEMENTATION RISKS & MITIGATION
-           - 3-4 key risks
-           - Mitigation strategies
-        
-        5. SUCCESS METRICS
-           - 3-4 KPIs to track
-           - Monitoring framework
-        
-        Format your response clearly with bold headers and bullet points.
-        """
-        
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate(self.build_policy_prompt(scenario_data, category_data))
         except Exception as e:
             return f"Error generating recommendations: {str(e)}"
     
-    def generate_executive_report(self, scenario_data, results_data, report_type="executive"):
-        """Generate comprehensive AI reports"""
+    def stream_policy_recommendations(self, scenario_data, category_data):
+        """Yield policy recommendations incrementally as they are generated"""
+        return self._stream(self.build_policy_prompt(scenario_data, category_data))
+    
+    @staticmethod
+    def build_report_prompt(scenario_data, results_data, report_type="executive"):
+        """Render the prompt for one report type (no backend needed, so batch runs can fingerprint it)"""
         
         if report_type == "executive":
             prompt = f"""
@@ -148,8 +156,18 @@ class AIHealthcareAnalyst:
             6. SUCCESS CRITERIA
             """
         
+        else:
+            raise ValueError(f"Unknown report type: {report_type}")
+        
+        return compact_prompt(prompt)
+    
+    def generate_executive_report(self, scenario_data, results_data, report_type="executive"):
+        """Generate comprehensive AI reports"""
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate(self.build_report_prompt(scenario_data, results_data, report_type))
         except Exception as e:
             return f"Error generating report: {str(e)}"
+    
+    def stream_executive_report(self, scenario_data, results_data, report_type="executive"):
+        """Yield a report incrementally as it is generated"""
+        return self._stream(self.build_report_prompt(scenario_data, results_data, report_type))
@@ -0,0 +1,214 @@
+import asyncio
+import os
+
+import streamlit as st
+
+from data.india_healthcare_data import TOTAL_GAP
+from utils.llm_providers import backend_model_name, backend_name, get_backend
+from utils.llm_scheduler import estimate_tokens, get_scheduler
+from utils.prompt_builder import (
+    PromptBuilder, category_lines, category_summary, projection_lines, projection_summary, region_lines
+)
+from utils.response_cache import cached_generate, cached_stream, get_response_cache
+
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+
+# the newest OpenAI model is "gpt-5" which was released August 7, 2025.
+# do not change this unless explicitly requested by the user
+OPENAI_MODEL_NAME = "gpt-5"
+STRATEGY_MAX_TOKENS = 8192
+SECTION_MAX_TOKENS = 4096
+SECTION_MAX_CONCURRENCY = int(os.environ.get("AI_SECTION_CONCURRENCY", 3))
+STRATEGY_CONTEXT_TOKEN_BUDGET = 450
+
+STRATEGY_SYSTEM_PROMPT = "You are a senior healthcare policy advisor with 20+ years of experience in workforce planning for developing nations, particularly India. Provide evidence-based, practical, and detailed recommendations with specific implementation steps, cost estimates, and measurable outcomes."
+
+
+STRATEGY_ROLE = "You are a senior healthcare policy expert specializing in India's healthcare workforce development and Universal Health Coverage planning."
+STRATEGY_FORMAT = "Format with clear headers, bullet points, and quantified targets where possible."
+
+# (key, title, prompt body) in document order; bodies may use {timeline}
+STRATEGY_SECTIONS = [
+    ("executive_summary", "Executive Summary", """## 1. EXECUTIVE SUMMARY (3-4 paragraphs)
+- Current crisis assessment
+- Strategic vision
+- Key success factors"""),
+    ("phased_strategy", "Phased Implementation Strategy", """## 2. PHASED IMPLEMENTATION STRATEGY
+
+### IMMEDIATE PRIORITIES (Years 1-2)
+For each strategy, provide:
+- Strategy Name and Description
+- Specific Locations for Implementation
+- Expected Impact (quantified)
+- Cost Estimate (₹ Crores)
+- Gap Reduction Potential
+- Key Actions (5-7 steps)
+- Success Metrics
+
+### INTERMEDIATE PHASE (Years 3-5)
+[Same structure as above]
+
+### LONG-TERM SUSTAINABILITY (Years 6-{timeline})
+[Same structure as above]"""),
+    ("funding_mechanism", "Funding Mechanism", """## 3. FUNDING MECHANISM
+- Government budget allocation recommendations
+- Public-Private Partnership models
+- International aid opportunities
+- Innovative financing (health cess, CSR, etc.)"""),
+    ("policy_recommendations", "Policy Recommendations", """## 4. POLICY RECOMMENDATIONS
+- Legislative changes needed
+- Regulatory framework updates
+- Institutional reforms"""),
+    ("risk_mitigation", "Risk Mitigation", """## 5. RISK MITIGATION
+- Key risks and contingencies
+- Monitoring and evaluation framework"""),
+    ("success_metrics", "Success Metrics & Milestones", """## 6. SUCCESS METRICS & MILESTONES
+- Year-wise targets
+- Key Performance Indicators"""),
+]
+
+
+def _strategy_context(gap_analysis, budget_constraints, priority_areas, timeline, phase_focus):
+    builder = PromptBuilder(STRATEGY_CONTEXT_TOKEN_BUDGET)
+    builder.add("GAP ANALYSIS", [
+        f"- Total workforce gap: {TOTAL_GAP / 1e6:.1f} million professionals (verified by Ministry of Health 2012)",
+        f"- Key shortage areas: {gap_analysis}",
+        f"- Timeline for closure: {timeline} years",
+        f"- Budget constraints: {budget_constraints}",
+        f"- Priority focus areas: {priority_areas}",
+        f"- Phase emphasis: {phase_focus}",
+    ], required=True)
+    builder.add(f"COST TO CLOSE THE GAP IN {timeline} YEARS", projection_lines(projection_summary(100, timeline)), priority=0)
+    builder.add("LARGEST CATEGORY GAPS", category_lines(category_summary()), priority=2)
+    builder.add("REGIONAL GAPS", region_lines(), priority=1)
+    return builder.build()
+
+
+def build_strategy_prompt(gap_analysis, budget_constraints, priority_areas, timeline, phase_focus):
+    context = _strategy_context(gap_analysis, budget_constraints, priority_areas, timeline, phase_focus)
+    sections = "\n\n".join(body.format(timeline=timeline) for _, _, body in STRATEGY_SECTIONS)
+    return f"""{STRATEGY_ROLE}
+
+Based on the following analysis, provide a comprehensive strategy to address the Allied Health Professional gap:
+
+{context}
+
+Please provide a detailed, actionable strategy document with the following sections:
+
+{sections}
+
+{STRATEGY_FORMAT}"""
+
+
+def build_strategy_section_prompt(section_key, gap_analysis, budget_constraints, priority_areas, timeline, phase_focus):
+    body = next(body for key, _, body in STRATEGY_SECTIONS if key == section_key)
+    context = _strategy_context(gap_analysis, budget_constraints, priority_areas, timeline, phase_focus)
+    return f"""{STRATEGY_ROLE}
+
+Based on the following analysis, you are writing one section of a comprehensive strategy to address the Allied Health Professional gap:
+
+{context}
+
+Write ONLY the following section of the strategy document, starting with its heading:
+
+{body.format(timeline=timeline)}
+
+{STRATEGY_FORMAT}"""
+
+
+def strategy_generation_available():
+    """True when an OpenAI key is configured or a substitute backend is serving OpenAI requests"""
+    return bool(OPENAI_API_KEY) or backend_name("openai") != "openai"
+
+
+def _cache_model_name():
+    return backend_model_name("openai", OPENAI_MODEL_NAME)
+
+
+def _request_completion(prompt, max_tokens):
+    backend = get_backend("openai", OPENAI_MODEL_NAME, OPENAI_API_KEY)
+    
+    def request(timeout):
+        return backend.generate(prompt, system_prompt=STRATEGY_SYSTEM_PROMPT, max_tokens=max_tokens, timeout=timeout)
+    
+    return get_scheduler("openai").call(request, tokens=estimate_tokens(prompt) + max_tokens)
+
+
+def generate_ai_strategy(gap_analysis, budget_constraints, priority_areas, timeline, phase_focus):
+    if not strategy_generation_available():
+        return None
+    
+    try:
+        prompt = build_strategy_prompt(gap_analysis, budget_constraints, priority_areas, timeline, phase_focus)
+        return cached_generate(
+            _cache_model_name(),
+            f"{STRATEGY_SYSTEM_PROMPT}\n\n{prompt}",
+            lambda: _request_completion(prompt, STRATEGY_MAX_TOKENS)
+        )
+    
+    except Exception as e:
+        st.error(f"Error generating strategy: {str(e)}")
+        return None
+
+
+def stream_ai_strategy(gap_analysis, budget_constraints, priority_areas, timeline, phase_focus):
+    """Yield the strategy document as it is generated; errors propagate to the caller"""
+    prompt = build_strategy_prompt(gap_analysis, budget_constraints, priority_areas, timeline, phase_focus)
+    
+    def open_stream(timeout):
+        backend = get_backend("openai", OPENAI_MODEL_NAME, OPENAI_API_KEY)
+        return backend.stream(
+            prompt, system_prompt=STRATEGY_SYSTEM_PROMPT, max_tokens=STRATEGY_MAX_TOKENS, timeout=timeout
+        )
+    
+    def request_stream():
+        return get_scheduler("openai").stream(open_stream, tokens=estimate_tokens(prompt) + STRATEGY_MAX_TOKENS)
+    
+    return cached_stream(_cache_model_name(), f"{STRATEGY_SYSTEM_PROMPT}\n\n{prompt}", request_stream)
+
+
+def generate_strategy_section(section_key, gap_analysis, budget_constraints, priority_areas, timeline, phase_focus,
+                              regenerate=False):
+    """Generate one strategy section, cached independently of the others"""
+    prompt = build_strategy_section_prompt(
+        section_key, gap_analysis, budget_constraints, priority_areas, timeline, phase_focus
+    )
+    cache_prompt = f"{STRATEGY_SYSTEM_PROMPT}\n\n{prompt}"
+    if regenerate:
+        get_response_cache().delete(_cache_model_name(), cache_prompt)
+    return cached_generate(_cache_model_name(), cache_prompt, lambda: _request_completion(prompt, SECTION_MAX_TOKENS))
+
+
+async def _generate_sections(section_keys, strategy_params, regenerate, max_concurrency):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run(section_key):
+        async with semaphore:
+            return await asyncio.to_thread(
+                generate_strategy_section, section_key, **strategy_params, regenerate=section_key in regenerate
+            )
+    
+    results = await asyncio.gather(*(run(key) for key in section_keys))
+    return dict(zip(section_keys, results))
+
+
+def generate_ai_strategy_sections(gap_analysis, budget_constraints, priority_areas, timeline, phase_focus,
+                                  regenerate=(), max_concurrency=SECTION_MAX_CONCURRENCY):
+    """Generate all strategy sections concurrently and return {section_key: text} in document order.
+
+    Sections listed in `regenerate` bypass the cache; the rest are served from it
+    when already generated, so a single section can be redone on its own.
+    """
+    strategy_params = dict(
+        gap_analysis=gap_analysis,
+        budget_constraints=budget_constraints,
+        priority_areas=priority_areas,
+        timeline=timeline,
+        phase_focus=phase_focus
+    )
+    section_keys = [key for key, _, _ in STRATEGY_SECTIONS]
+    return asyncio.run(_generate_sections(section_keys, strategy_params, set(regenerate), max_concurrency))
+
+
+def assemble_strategy(sections):
+    return "\n\n".join(sections[key] for key, _, _ in STRATEGY_SECTIONS if sections.get(key))
@@ -0,0 +1,578 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from data.india_healthcare_data import (
+    AHP_CATEGORIES, get_category_dataframe, get_budget_trend_dataframe,
+    get_funding_sources_dataframe, get_global_comparison_dataframe
+)
+from utils.figure_cache import cached_figure
+
+
+SCENARIO_COLORS = {
+    'Baseline (Current Trend)': '#3182ce',
+    'No Intervention': '#e53e3e',
+    'Proposed Strategy': '#38a169'
+}
+
+# Beyond these sizes traces switch to WebGL and series are decimated server-side
+WEBGL_POINT_THRESHOLD = 1000
+MAX_POINTS_PER_TRACE = 500
+MAX_LINE_TRACES = 12
+MAX_BAR_PERIODS = 50
+ENVELOPE_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def downsample_frame(df, x, y_columns, group=None, max_points=MAX_POINTS_PER_TRACE):
+    """Min/max decimation: keep the first, last and extreme rows of each x bucket"""
+    if group is not None:
+        parts = [downsample_frame(part, x, y_columns, max_points=max_points)
+                 for _, part in df.groupby(group, sort=False)]
+        return pd.concat(parts) if parts else df
+
+    df = df.sort_values(x)
+    if len(df) <= max_points:
+        return df
+
+    buckets = np.arange(len(df)) * (max_points // (2 * len(y_columns))) // len(df)
+    positions = {0, len(df) - 1}
+    for column in y_columns:
+        grouped = pd.Series(df[column].to_numpy()).groupby(buckets)
+        positions.update(grouped.idxmin())
+        positions.update(grouped.idxmax())
+    return df.iloc[sorted(positions)]
+
+
+def collapse_scenario_variants(scenario_df):
+    """Treat more than MAX_LINE_TRACES named scenarios as runs of one ensemble"""
+    if 'Run' not in scenario_df.columns and scenario_df['Scenario'].nunique() > MAX_LINE_TRACES:
+        return scenario_df.assign(Run=scenario_df['Scenario'], Scenario='Scenario Ensemble')
+    return scenario_df
+
+
+def summarize_ensemble(ensemble_df, value='Gap'):
+    """Percentile envelope of `value` per scenario and year across all runs"""
+    quantiles = [p / 100 for p in ENVELOPE_PERCENTILES]
+    summary = ensemble_df.groupby(['Scenario', 'Year'], sort=False)[value].quantile(quantiles).unstack()
+    summary.columns = [f'P{p}' for p in ENVELOPE_PERCENTILES]
+    return summary.reset_index()
+
+
+@cached_figure
+def create_3d_crisis_gauge():
+    fig = go.Figure()
+    
+    categories = list(AHP_CATEGORIES.keys())
+    gaps = [AHP_CATEGORIES[cat]["gap"] for cat in categories]
+    currents = [AHP_CATEGORIES[cat]["current"] for cat in categories]
+    
+    max_gap = max(gaps)
+    normalized_gaps = [g / max_gap for g in gaps]
+    
+    theta = np.linspace(0, 2*np.pi, len(categories), endpoint=False)
+    x = np.cos(theta) * 2
+    y = np.sin(theta) * 2
+    z = [g / 1e5 for g in gaps]
+    
+    colors = ['#e53e3e' if g > 500000 else '#ecc94b' if g > 200000 else '#48bb78' for g in gaps]
+    
+    fig.add_trace(go.Scatter3d(
+        x=x, y=y, z=z,
+        mode='markers+text',
+        marker=dict(
+            size=[max(10, ng * 30) for ng in normalized_gaps],
+            color=colors,
+            opacity=0.8,
+            line=dict(color='white', width=2)
+        ),
+        text=[f"{cat[:15]}..." if len(cat) > 15 else cat for cat in categories],
+        textposition='top center',
+        hovertemplate='<b>%{text}</b><br>Gap: %{z:.0f}K<extra></extra>',
+        name='AHP Categories'
+    ))
+    
+    fig.add_trace(go.Mesh3d(
+        x=[0, 0, 0, 0],
+        y=[0, 0, 0, 0],
+        z=[0, 0, 0, 0],
+        opacity=0,
+        showlegend=False
+    ))
+    
+    fig.update_layout(
+        scene=dict(
+            xaxis=dict(showgrid=False, showticklabels=False, title=''),
+            yaxis=dict(showgrid=False, showticklabels=False, title=''),
+            zaxis=dict(title='Gap (Lakhs)', tickformat='.0f'),
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.2))
+        ),
+        title=dict(text='3D Gap Visualization by Category', font=dict(size=18)),
+        height=500,
+        margin=dict(l=0, r=0, t=40, b=0),
+        hoverlabel=dict(bgcolor="white", font_size=14)
+    )
+    
+    return fig
+
+
+@cached_figure
+def create_interactive_category_chart():
+    df = get_category_dataframe()
+    df = df.sort_values('Gap', ascending=True)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        y=df['Category'],
+        x=df['Current'],
+        name='Current Workforce',
+        orientation='h',
+        marker=dict(
+            color='#4299e1',
+            line=dict(color='#2b6cb0', width=1)
+        ),
+        hovertemplate='<b>%{y}</b><br>Current: %{x:,.0f}<extra></extra>'
+    ))
+    
+    fig.add_trace(go.Bar(
+        y=df['Category'],
+        x=df['Gap'],
+        name='Gap (Shortage)',
+        orientation='h',
+        marker=dict(
+            color='#fc8181',
+            line=dict(color='#c53030', width=1)
+        ),
+        hovertemplate='<b>%{y}</b><br>Gap: %{x:,.0f}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        barmode='stack',
+        title=dict(text='Allied Health Professionals: Current Workforce vs Gap', font=dict(size=18)),
+        xaxis_title='Number of Professionals',
+        yaxis_title='',
+        height=550,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hoverlabel=dict(bgcolor="white", font_size=14),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='rgba(0,0,0,0.1)')
+    
+    return fig
+
+
+@cached_figure
+def create_3d_scenario_comparison(scenario_df):
+    scenario_df = collapse_scenario_variants(scenario_df)
+    is_ensemble = 'Run' in scenario_df.columns
+    if is_ensemble:
+        scenario_df = summarize_ensemble(scenario_df).rename(columns={'P50': 'Gap'})
+    
+    scenarios = scenario_df['Scenario'].unique()
+    
+    fig = go.Figure()
+    
+    for scenario in scenarios:
+        df_scenario = scenario_df[scenario_df['Scenario'] == scenario]
+        position = scenarios.tolist().index(scenario)
+        color = SCENARIO_COLORS.get(scenario, '#888')
+        band_columns = ['P5', 'P95'] if is_ensemble else []
+        df_scenario = downsample_frame(df_scenario, 'Year', ['Gap'] + band_columns)
+        
+        fig.add_trace(go.Scatter3d(
+            x=[position] * len(df_scenario),
+            y=df_scenario['Year'],
+            z=df_scenario['Gap'] / 1e6,
+            mode='lines+markers',
+            name=f'{scenario} (median)' if is_ensemble else scenario,
+            line=dict(color=color, width=6),
+            marker=dict(size=6, color=color),
+            hovertemplate=f'<b>{scenario}</b><br>Year: %{{y}}<br>Gap: %{{z:.2f}}M<extra></extra>'
+        ))
+        
+        for column in band_columns:
+            fig.add_trace(go.Scatter3d(
+                x=[position] * len(df_scenario),
+                y=df_scenario['Year'],
+                z=df_scenario[column] / 1e6,
+                mode='lines',
+                name=f'{scenario} ({column})',
+                line=dict(color=color, width=3, dash='dash'),
+                hovertemplate=f'<b>{scenario} {column}</b><br>Year: %{{y}}<br>Gap: %{{z:.2f}}M<extra></extra>'
+            ))
+    
+    fig.update_layout(
+        scene=dict(
+            xaxis=dict(
+                ticktext=list(scenarios),
+                tickvals=list(range(len(scenarios))),
+                title='Scenario'
+            ),
+            yaxis=dict(title='Year'),
+            zaxis=dict(title='Gap (Millions)'),
+            camera=dict(eye=dict(x=1.8, y=1.8, z=1.2))
+        ),
+        title=dict(text='3D Scenario Projection Comparison', font=dict(size=18)),
+        height=550,
+        margin=dict(l=0, r=0, t=50, b=0),
+        legend=dict(orientation="h", yanchor="bottom", y=0.95, xanchor="center", x=0.5)
+    )
+    
+    return fig
+
+
+@cached_figure
+def create_budget_trend_chart():
+    df = get_budget_trend_dataframe()
+    
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    
+    fig.add_trace(
+        go.Bar(
+            x=df['Financial Year'],
+            y=df['Health Budget (₹ Cr)'],
+            name='Health Budget (₹ Cr)',
+            marker_color='#4299e1',
+            hovertemplate='FY %{x}<br>Budget: ₹%{y:,.0f} Cr<extra></extra>'
+        ),
+        secondary_y=False
+    )
+    
+    fig.add_trace(
+        go.Scatter(
+            x=df['Financial Year'],
+            y=df['Health % of Budget'],
+            mode='lines+markers',
+            name='% of Total Budget',
+            line=dict(color='#e53e3e', width=3),
+            marker=dict(size=8),
+            hovertemplate='FY %{x}<br>%{y:.2f}% of Budget<extra></extra>'
+        ),
+        secondary_y=True
+    )
+    
+    fig.add_trace(
+        go.Scatter(
+            x=df['Financial Year'],
+            y=df['Health % of GDP'],
+            mode='lines+markers',
+            name='% of GDP',
+            line=dict(color='#38a169', width=3, dash='dot'),
+            marker=dict(size=8),
+            hovertemplate='FY %{x}<br>%{y:.2f}% of GDP<extra></extra>'
+        ),
+        secondary_y=True
+    )
+    
+    fig.add_hline(y=2.5, line_dash="dash", line_color="orange", 
+                  annotation_text="NHP Target: 2.5% of GDP", secondary_y=True)
+    
+    fig.update_layout(
+        title=dict(text='India Health Budget Trend (10-Year Analysis)', font=dict(size=18)),
+        xaxis_title='Financial Year',
+        height=450,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hoverlabel=dict(bgcolor="white", font_size=14)
+    )
+    fig.update_yaxes(title_text="Health Budget (₹ Crores)", secondary_y=False)
+    fig.update_yaxes(title_text="Percentage (%)", secondary_y=True)
+    
+    return fig
+
+
+@cached_figure
+def create_funding_waterfall():
+    df = get_funding_sources_dataframe()
+    df = df.sort_values('Potential (₹ Cr/Year)', ascending=False)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=df['Source'],
+        y=df['Current (₹ Cr/Year)'],
+        name='Current Funding',
+        marker_color='#4299e1',
+        hovertemplate='<b>%{x}</b><br>Current: ₹%{y:,.0f} Cr<extra></extra>'
+    ))
+    
+    fig.add_trace(go.Bar(
+        x=df['Source'],
+        y=df['Additional Mobilizable'],
+        name='Additional Potential',
+        marker_color='#48bb78',
+        hovertemplate='<b>%{x}</b><br>Additional Potential: ₹%{y:,.0f} Cr<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        barmode='stack',
+        title=dict(text='Funding Sources: Current vs Potential', font=dict(size=18)),
+        xaxis_title='',
+        yaxis_title='Amount (₹ Crores/Year)',
+        height=450,
+        xaxis_tickangle=-45,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    
+    return fig
+
+
+@cached_figure
+def create_global_comparison_chart():
+    df = get_global_comparison_dataframe()
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=df['Country'],
+        y=df['Total Health % GDP'],
+        name='Total Health Spending % GDP',
+        marker_color='#4299e1'
+    ))
+    
+    fig.add_trace(go.Bar(
+        x=df['Country'],
+        y=df['Govt Health % GDP'],
+        name='Government Health % GDP',
+        marker_color='#38a169'
+    ))
+    
+    fig.update_layout(
+        barmode='group',
+        title=dict(text='Global Health Spending Comparison (% of GDP)', font=dict(size=18)),
+        xaxis_title='',
+        yaxis_title='Percentage of GDP',
+        height=400,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    
+    return fig
+
+
+@cached_figure
+def create_scenario_comparison_chart(scenario_df):
+    scenario_df = collapse_scenario_variants(scenario_df)
+    if 'Run' in scenario_df.columns:
+        return create_scenario_fan_chart(scenario_df)
+    
+    use_webgl = len(scenario_df) > WEBGL_POINT_THRESHOLD
+    if use_webgl:
+        scenario_df = downsample_frame(scenario_df, 'Year', ['Gap'], group='Scenario')
+    
+    fig = px.line(
+        scenario_df,
+        x='Year',
+        y='Gap',
+        color='Scenario',
+        title='Workforce Gap Projection: Scenario Comparison',
+        color_discrete_map=SCENARIO_COLORS,
+        render_mode='webgl' if use_webgl else 'auto'
+    )
+    
+    fig.update_traces(line=dict(width=3))
+    
+    fig.update_layout(
+        xaxis_title='Year',
+        yaxis_title='Workforce Gap',
+        height=500,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hoverlabel=dict(bgcolor="white", font_size=14)
+    )
+    
+    fig.add_hline(y=0, line_dash="dash", line_color="green", 
+                  annotation_text="Zero Gap (UHC Target)")
+    
+    return fig
+
+
+def _hex_to_rgba(color, alpha):
+    color = color.lstrip('#')
+    red, green, blue = (int(color[i:i + 2], 16) for i in (0, 2, 4))
+    return f'rgba({red}, {green}, {blue}, {alpha})'
+
+
+@cached_figure
+def create_scenario_fan_chart(ensemble_df, scenario_df=None):
+    """Percentile fan of an ensemble, optionally over deterministic scenario lines.
+
+    Draws five WebGL traces per scenario however many runs the ensemble has.
+    """
+    envelope = summarize_ensemble(collapse_scenario_variants(ensemble_df))
+    
+    fig = go.Figure()
+    
+    for scenario, df_scenario in envelope.groupby('Scenario', sort=False):
+        df_scenario = downsample_frame(df_scenario, 'Year', ['P5', 'P50', 'P95'])
+        color = SCENARIO_COLORS.get(scenario, '#805ad5')
+        
+        for lower, upper, alpha in (('P5', 'P95', 0.15), ('P25', 'P75', 0.3)):
+            fig.add_trace(go.Scattergl(
+                x=df_scenario['Year'],
+                y=df_scenario[lower],
+                mode='lines',
+                line=dict(width=0, color=color),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            fig.add_trace(go.Scattergl(
+                x=df_scenario['Year'],
+                y=df_scenario[upper],
+                mode='lines',
+                line=dict(width=0, color=color),
+                fill='tonexty',
+                fillcolor=_hex_to_rgba(color, alpha),
+                name=f'{scenario} {lower[1:]}-{upper[1:]}th pct',
+                hoverinfo='skip'
+            ))
+        
+        fig.add_trace(go.Scattergl(
+            x=df_scenario['Year'],
+            y=df_scenario['P50'],
+            mode='lines',
+            name=f'{scenario} (median)',
+            line=dict(color=color, width=3),
+            hovertemplate=f'<b>{scenario}</b><br>Year: %{{x}}<br>Median Gap: %{{y:,.0f}}<extra></extra>'
+        ))
+    
+    if scenario_df is not None:
+        for scenario, df_scenario in scenario_df.groupby('Scenario', sort=False):
+            if scenario in envelope['Scenario'].values:
+                continue
+            df_scenario = downsample_frame(df_scenario, 'Year', ['Gap'])
+            fig.add_trace(go.Scattergl(
+                x=df_scenario['Year'],
+                y=df_scenario['Gap'],
+                mode='lines',
+                name=scenario,
+                line=dict(color=SCENARIO_COLORS.get(scenario, '#888'), width=2, dash='dot'),
+                hovertemplate=f'<b>{scenario}</b><br>Year: %{{x}}<br>Gap: %{{y:,.0f}}<extra></extra>'
+            ))
+    
+    runs = ensemble_df['Run'].nunique() if 'Run' in ensemble_df.columns else ensemble_df['Scenario'].nunique()
+    fig.update_layout(
+        title=dict(text=f'Workforce Gap Uncertainty ({runs:,} runs)', font=dict(size=18)),
+        xaxis_title='Year',
+        yaxis_title='Workforce Gap',
+        height=500,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hoverlabel=dict(bgcolor="white", font_size=14)
+    )
+    
+    fig.add_hline(y=0, line_dash="dash", line_color="green", 
+                  annotation_text="Zero Gap (UHC Target)")
+    
+    return fig
+
+
+def bucket_cost_periods(cost_df, max_periods=MAX_BAR_PERIODS):
+    """Sum consecutive years into multi-year periods when there are too many bars"""
+    if len(cost_df) <= max_periods:
+        return cost_df
+    
+    period = -(-len(cost_df) // max_periods)
+    buckets = np.arange(len(cost_df)) // period
+    cost_columns = ['Training Cost (₹ Cr)', 'Salary Cost (₹ Cr)',
+                    'Infrastructure Cost (₹ Cr)', 'Retention Cost (₹ Cr)']
+    grouped = cost_df.groupby(buckets)
+    bucketed = grouped[cost_columns].sum()
+    first_year = grouped['Calendar Year'].first()
+    last_year = grouped['Calendar Year'].last()
+    bucketed['Calendar Year'] = first_year.astype(str) + '-' + last_year.astype(str)
+    return bucketed.reset_index(drop=True)
+
+
+@cached_figure
+def create_cost_breakdown_chart(cost_df):
+    cost_df = bucket_cost_periods(cost_df)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=cost_df['Calendar Year'],
+        y=cost_df['Training Cost (₹ Cr)'],
+        name='Training',
+        marker_color='#4299e1',
+        hovertemplate='Year %{x}<br>Training: ₹%{y:,.0f} Cr<extra></extra>'
+    ))
+    fig.add_trace(go.Bar(
+        x=cost_df['Calendar Year'],
+        y=cost_df['Salary Cost (₹ Cr)'],
+        name='Salaries',
+        marker_color='#48bb78',
+        hovertemplate='Year %{x}<br>Salaries: ₹%{y:,.0f} Cr<extra></extra>'
+    ))
+    fig.add_trace(go.Bar(
+        x=cost_df['Calendar Year'],
+        y=cost_df['Infrastructure Cost (₹ Cr)'],
+        name='Infrastructure',
+        marker_color='#ecc94b',
+        hovertemplate='Year %{x}<br>Infrastructure: ₹%{y:,.0f} Cr<extra></extra>'
+    ))
+    fig.add_trace(go.Bar(
+        x=cost_df['Calendar Year'],
+        y=cost_df['Retention Cost (₹ Cr)'],
+        name='Retention',
+        marker_color='#9f7aea',
+        hovertemplate='Year %{x}<br>Retention: ₹%{y:,.0f} Cr<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        barmode='stack',
+        title=dict(text='Annual Cost Breakdown by Category (Inflation Adjusted)', font=dict(size=18)),
+        xaxis_title='Year',
+        yaxis_title='Cost (₹ Crores)',
+        height=450,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    
+    return fig
+
+
+@cached_figure
+def create_cumulative_cost_chart(cost_df):
+    scatter = go.Scatter
+    if len(cost_df) > WEBGL_POINT_THRESHOLD:
+        scatter = go.Scattergl
+        cost_df = downsample_frame(cost_df, 'Calendar Year', ['Cumulative Cost (₹ Cr)', 'Gap Closure %'])
+    
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    
+    fig.add_trace(
+        scatter(
+            x=cost_df['Calendar Year'],
+            y=cost_df['Cumulative Cost (₹ Cr)'],
+            mode='lines+markers',
+            name='Cumulative Cost',
+            line=dict(color='#3182ce', width=3),
+            fill='tozeroy',
+            fillcolor='rgba(49, 130, 206, 0.1)',
+            hovertemplate='Year %{x}<br>Cumulative: ₹%{y:,.0f} Cr<extra></extra>'
+        ),
+        secondary_y=False
+    )
+    
+    fig.add_trace(
+        scatter(
+            x=cost_df['Calendar Year'],
+            y=cost_df['Gap Closure %'],
+            mode='lines+markers',
+            name='Gap Closure %',
+            line=dict(color='#38a169', width=3, dash='dot'),
+            hovertemplate='Year %{x}<br>Gap Closure: %{y:.1f}%<extra></extra>'
+        ),
+        secondary_y=True
+    )
+    
+    fig.update_layout(
+        title=dict(text='Cumulative Investment vs Gap Closure Progress', font=dict(size=18)),
+        height=450,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    fig.update_xaxes(title_text="Year")
+    fig.update_yaxes(title_text="Cumulative Cost (₹ Crores)", secondary_y=False)
+    fig.update_yaxes(title_text="Gap Closure (%)", secondary_y=True)
+    
+    return fig
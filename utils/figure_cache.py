@@ -0,0 +1,72 @@
+import hashlib
+from functools import wraps
+
+import pandas as pd
+
+from data.india_healthcare_data import DATA_VERSION
+from utils.lru import LRUCache
+from utils.perf import span
+
+
+class CachedFigure:
+    """A built figure together with its JSON, encoded once on first request"""
+
+    def __init__(self, figure):
+        self.figure = figure
+        self._json = None
+
+    @property
+    def json(self):
+        if self._json is None:
+            self._json = self.figure.to_json()
+        return self._json
+
+
+FIGURE_CACHE = LRUCache()
+
+
+def _hash_value(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    else:
+        digest.update(repr(value).encode("utf-8"))
+
+
+def input_fingerprint(*args, **kwargs):
+    digest = hashlib.sha1()
+    for value in args:
+        _hash_value(digest, value)
+    for name in sorted(kwargs):
+        digest.update(name.encode("utf-8"))
+        _hash_value(digest, kwargs[name])
+    return digest.hexdigest()
+
+
+def cached_figure(builder):
+    """Memoize a chart builder on the dataset version and a hash of its inputs.
+
+    The returned figure is shared between sessions and is read-only: pass it
+    straight to st.plotly_chart, which serializes from a copy. A caller that
+    needs to restyle it must copy it first with go.Figure(figure); copying on
+    every hit would cost more than building the chart.
+    """
+    @wraps(builder)
+    def wrapper(*args, **kwargs):
+        return cached_figure_entry(builder, *args, **kwargs).figure
+
+    wrapper.entry = lambda *args, **kwargs: cached_figure_entry(builder, *args, **kwargs)
+    wrapper.to_json = lambda *args, **kwargs: cached_figure_entry(builder, *args, **kwargs).json
+    return wrapper
+
+
+def cached_figure_entry(builder, *args, **kwargs):
+    with span(builder.__name__):
+        key = (builder.__module__, builder.__qualname__, DATA_VERSION, input_fingerprint(*args, **kwargs))
+        entry = FIGURE_CACHE.get(key)
+        if entry is None:
+            entry = CachedFigure(builder(*args, **kwargs))
+            FIGURE_CACHE.put(key, entry)
+        return entry
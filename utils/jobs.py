@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+JOB_WORKERS = int(os.environ.get("AI_JOB_WORKERS", 4))
+JOB_MAX_PENDING = int(os.environ.get("AI_JOB_MAX_PENDING", 32))
+JOB_RETENTION = 500
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    def __init__(self, kind, label):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.label = label
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._chunks = []
+        self._lock = threading.Lock()
+
+    def append_output(self, chunk):
+        with self._lock:
+            self._chunks.append(chunk)
+
+    @property
+    def partial_output(self):
+        """Text streamed so far by a job submitted with submit_stream"""
+        with self._lock:
+            return "".join(self._chunks)
+
+    @property
+    def is_finished(self):
+        return self.status in (DONE, FAILED)
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class JobQueue:
+    """Bounded worker pool for AI generation that outlives Streamlit reruns.
+
+    Jobs are addressed by ID, so a session only needs to keep the IDs it
+    submitted; results stay available until the job falls out of retention.
+    """
+
+    def __init__(self, max_workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING, retention=JOB_RETENTION):
+        self.max_pending = max_pending
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, label, fn, *args, **kwargs):
+        return self._submit(kind, label, fn, args, kwargs, stream=False)
+
+    def submit_stream(self, kind, label, fn, *args, **kwargs):
+        """Submit `fn` returning an iterable of text chunks; the result is the joined text.
+
+        Chunks are buffered on the job as they arrive, so a poller can render
+        `job.partial_output` while the job is still running.
+        """
+        return self._submit(kind, label, fn, args, kwargs, stream=True)
+
+    def _submit(self, kind, label, fn, args, kwargs, stream):
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if not job.is_finished)
+            if pending >= self.max_pending:
+                raise RuntimeError("Too many AI jobs queued; wait for some to finish")
+            job = Job(kind, label)
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn, args, kwargs, stream)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs, stream):
+        job.started = time.time()
+        job.status = RUNNING
+        try:
+            if stream:
+                for chunk in fn(*args, **kwargs):
+                    if chunk:
+                        job.append_output(chunk)
+                job.result = job.partial_output
+            else:
+                job.result = fn(*args, **kwargs)
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+
+    def _prune(self):
+        # drop the oldest finished jobs once over retention; running jobs are always kept
+        excess = len(self._jobs) - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.is_finished][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Process-wide job queue shared by every session"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
@@ -0,0 +1,274 @@
+import hashlib
+import os
+import random
+import threading
+import time
+
+try:
+    from openai import OpenAI
+except ImportError:
+    OpenAI = None
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+
+class ProviderRegistry:
+    """Process-wide registry that creates each LLM client once and hands out the same instance.
+
+    Clients keep their HTTP connection pools and TLS sessions, so reusing them
+    across clicks and sessions avoids paying connection setup on every request.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        # reentrant: a backend's factory fetches its client from this same registry
+        self._lock = threading.RLock()
+
+    def get(self, key, factory):
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = factory()
+                    self._clients[key] = client
+        return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def items(self):
+        with self._lock:
+            return list(self._clients.items())
+
+    def __len__(self):
+        return len(self._clients)
+
+
+PROVIDER_REGISTRY = ProviderRegistry()
+
+
+def _key_fingerprint(api_key):
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def get_openai_client(api_key=None):
+    api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found in environment variables")
+    if OpenAI is None:
+        raise ImportError("The openai package is required for OpenAI strategy generation")
+
+    return PROVIDER_REGISTRY.get(
+        ("openai", _key_fingerprint(api_key)),
+        # retries are handled by utils.llm_scheduler, so the SDK should fail fast
+        lambda: OpenAI(api_key=api_key, max_retries=0)
+    )
+
+
+def get_gemini_model(model_name, api_key=None):
+    api_key = api_key or os.environ.get("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY not found in environment variables")
+    if genai is None:
+        raise ImportError("The google-generativeai package is required for Gemini analysis")
+
+    fingerprint = _key_fingerprint(api_key)
+    # genai.configure sets module-global credentials, so run it once per key
+    PROVIDER_REGISTRY.get(("gemini-config", fingerprint), lambda: genai.configure(api_key=api_key) or True)
+    return PROVIDER_REGISTRY.get(
+        ("gemini", model_name, fingerprint),
+        lambda: genai.GenerativeModel(model_name)
+    )
+
+
+class LLMBackend:
+    """Interface the AI helpers use to talk to a text-generation provider.
+
+    `generate` returns the full response text; `stream` yields text chunks.
+    `timeout` is the number of seconds the provider call may take.
+    """
+
+    model_name = None
+
+    def generate(self, prompt, system_prompt=None, max_tokens=None, timeout=None):
+        raise NotImplementedError
+
+    def stream(self, prompt, system_prompt=None, max_tokens=None, timeout=None):
+        raise NotImplementedError
+
+
+class OpenAIBackend(LLMBackend):
+    def __init__(self, model_name, api_key=None):
+        self.model_name = model_name
+        self.client = get_openai_client(api_key)
+
+    def _request(self, prompt, system_prompt, max_tokens, timeout, **kwargs):
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        if max_tokens is not None:
+            kwargs["max_completion_tokens"] = max_tokens
+        return self.client.chat.completions.create(
+            model=self.model_name, messages=messages, timeout=timeout, **kwargs
+        )
+
+    def generate(self, prompt, system_prompt=None, max_tokens=None, timeout=None):
+        response = self._request(prompt, system_prompt, max_tokens, timeout)
+        return response.choices[0].message.content
+
+    def stream(self, prompt, system_prompt=None, max_tokens=None, timeout=None):
+        stream = self._request(prompt, system_prompt, max_tokens, timeout, stream=True)
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class GeminiBackend(LLMBackend):
+    def __init__(self, model_name, api_key=None):
+        self.model_name = model_name
+        self.model = get_gemini_model(model_name, api_key)
+
+    def generate(self, prompt, system_prompt=None, max_tokens=None, timeout=None):
+        contents = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        return self.model.generate_content(contents, request_options={"timeout": timeout}).text
+
+    def stream(self, prompt, system_prompt=None, max_tokens=None, timeout=None):
+        contents = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        for chunk in self.model.generate_content(contents, stream=True, request_options={"timeout": timeout}):
+            yield chunk.text
+
+
+STUB_SENTENCES = [
+    "Expand allied health training seats in district hospitals with the largest vacancies.",
+    "Pair rural postings with housing allowances and a guaranteed transfer after three years.",
+    "Fund laboratory technician diplomas through the National Health Mission flexipool.",
+    "Track vacancy rates quarterly at block level and publish them on a public dashboard.",
+    "Use public-private partnerships to add clinical training capacity without new construction.",
+    "Standardise curricula and licensing through the National Commission for Allied and Healthcare Professions.",
+    "Prioritise states where the gap exceeds the national average for targeted recruitment drives.",
+    "Bundle retention incentives with continuing education credits to reduce attrition.",
+    "Phase infrastructure spending so that new colleges open alongside faculty recruitment.",
+    "Measure success by professionals deployed per 10,000 population, not seats sanctioned.",
+]
+
+
+class StubError(Exception):
+    """Failure injected by the stub backend; reported as HTTP 429 so it is retried like a quota error"""
+
+    status_code = 429
+
+
+class StubBackend(LLMBackend):
+    """Offline backend returning deterministic canned text for a prompt.
+
+    Simulates provider latency (time to first token), a token generation rate and
+    random failures, so the AI code paths can be tested and benchmarked without
+    network access. Defaults come from AI_STUB_LATENCY, AI_STUB_TOKENS_PER_SECOND,
+    AI_STUB_ERROR_RATE and AI_STUB_RESPONSE_TOKENS.
+    """
+
+    def __init__(self, model_name, api_key=None, latency=None, tokens_per_second=None, error_rate=None,
+                 response_tokens=None, seed=0):
+        self.model_name = f"stub/{model_name}"
+        self.latency = float(os.environ.get("AI_STUB_LATENCY", 0.5) if latency is None else latency)
+        self.tokens_per_second = float(
+            os.environ.get("AI_STUB_TOKENS_PER_SECOND", 80) if tokens_per_second is None else tokens_per_second
+        )
+        self.error_rate = float(os.environ.get("AI_STUB_ERROR_RATE", 0) if error_rate is None else error_rate)
+        self.response_tokens = int(
+            os.environ.get("AI_STUB_RESPONSE_TOKENS", 400) if response_tokens is None else response_tokens
+        )
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def render(self, prompt, system_prompt=None, max_tokens=None):
+        """The canned response for a prompt; identical prompts always get identical text"""
+        digest = hashlib.sha256(f"{system_prompt or ''}\0{prompt}".encode("utf-8")).hexdigest()
+        rng = random.Random(int(digest, 16))
+        budget = min(self.response_tokens, max_tokens or self.response_tokens)
+        lines = [f"## Stub response {digest[:8]}", ""]
+        words = 0
+        while words < budget:
+            sentence = rng.choice(STUB_SENTENCES)
+            lines.append(f"- {sentence}")
+            words += len(sentence.split())
+        return "\n".join(lines)
+
+    def _start(self, timeout):
+        with self._lock:
+            self.calls += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if failed:
+            raise StubError("Stub backend injected a rate limit error")
+        self._sleep(self.latency, timeout)
+
+    def _sleep(self, seconds, timeout):
+        if timeout is not None and seconds > timeout:
+            time.sleep(max(timeout, 0))
+            raise TimeoutError("Stub backend request timed out")
+        time.sleep(seconds)
+
+    def generate(self, prompt, system_prompt=None, max_tokens=None, timeout=None):
+        started = time.monotonic()
+        self._start(timeout)
+        text = self.render(prompt, system_prompt, max_tokens)
+        remaining = None if timeout is None else timeout - (time.monotonic() - started)
+        self._sleep(len(text.split()) / self.tokens_per_second, remaining)
+        return text
+
+    def stream(self, prompt, system_prompt=None, max_tokens=None, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._start(timeout)
+        words = self.render(prompt, system_prompt, max_tokens).split(" ")
+        for start in range(0, len(words), 8):
+            chunk = words[start:start + 8]
+            remaining = None if deadline is None else deadline - time.monotonic()
+            self._sleep(len(chunk) / self.tokens_per_second, remaining)
+            yield " ".join(chunk) + (" " if start + 8 < len(words) else "")
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "errors": self.errors}
+
+
+BACKEND_FACTORIES = {
+    "openai": OpenAIBackend,
+    "gemini": GeminiBackend,
+    "stub": StubBackend,
+}
+
+
+def register_backend(name, factory):
+    """Make `factory(model_name, api_key=None)` selectable via AI_BACKEND=<name>"""
+    BACKEND_FACTORIES[name] = factory
+
+
+def backend_name(provider):
+    """Backend serving `provider`: itself unless AI_BACKEND overrides every provider"""
+    return os.environ.get("AI_BACKEND") or provider
+
+
+def backend_model_name(provider, model_name):
+    """Model name used for caching, kept distinct when a substitute backend serves the provider"""
+    name = backend_name(provider)
+    return model_name if name == provider else f"{name}/{model_name}"
+
+
+def get_backend(provider, model_name, api_key=None):
+    name = backend_name(provider)
+    factory = BACKEND_FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown AI backend: {name}")
+    return PROVIDER_REGISTRY.get(
+        ("backend", name, model_name, _key_fingerprint(api_key) if api_key else None),
+        lambda: factory(model_name, api_key=api_key)
+    )
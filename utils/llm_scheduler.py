@@ -0,0 +1,253 @@
+import itertools
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from utils.metrics import AI_ERRORS, AI_REQUEST_SECONDS
+from utils.perf import span
+
+
+DEFAULT_TIMEOUT_SECONDS = float(os.environ.get("AI_REQUEST_TIMEOUT", 120))
+DEFAULT_MAX_RETRIES = int(os.environ.get("AI_MAX_RETRIES", 4))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# Per-provider quotas; override with e.g. OPENAI_RPM / GEMINI_TPM to match your tier
+PROVIDER_LIMITS = {
+    "openai": (500, 200_000),
+    "gemini": (60, 1_000_000),
+}
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError",
+    "ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "TooManyRequests",
+}
+
+
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text):
+    """Local approximation of a BPE token count, used for rate limiting and prompt budgets.
+
+    Short words count as one token and long ones as several; digit runs split
+    every three characters and each punctuation mark or symbol counts as one.
+    """
+    count = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        if piece[0].isalpha():
+            count += 1 + (len(piece) - 1) // 6
+        elif piece[0].isdigit():
+            count += (len(piece) + 2) // 3
+        else:
+            count += 1
+    return max(1, count)
+
+
+def is_retryable(error):
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return status in RETRYABLE_STATUS_CODES
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE_SECONDS, cap=BACKOFF_MAX_SECONDS):
+    """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Refills continuously at `per_minute` units per minute up to `capacity`"""
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.available = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount, now):
+        """Seconds until `amount` units are available (0 if they already are)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def take(self, amount):
+        self.available -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """Client-side admission control for one LLM provider.
+
+    Callers are admitted in FIFO order once both the request and token buckets
+    have room. Each call gets a deadline covering queueing, the request itself
+    and any retries; transient failures are retried with jittered backoff.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, timeout=DEFAULT_TIMEOUT_SECONDS,
+                 max_retries=DEFAULT_MAX_RETRIES, name="llm"):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._queue = deque()
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+
+    def _acquire(self, tokens, deadline):
+        with self._condition:
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._queue[0] == ticket:
+                        wait = max(self.requests.delay(1, now), self.tokens.delay(tokens, now))
+                        if wait == 0:
+                            self.requests.take(1)
+                            self.tokens.take(tokens)
+                            self.in_flight += 1
+                            return
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise TimeoutError("Timed out waiting for an LLM request slot")
+                    self._condition.wait(remaining if wait is None else min(wait, remaining))
+            finally:
+                self._queue.remove(ticket)
+                self._condition.notify_all()
+
+    def _release(self, succeeded):
+        with self._condition:
+            self.in_flight -= 1
+            if succeeded:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def _retry_or_raise(self, error, attempt, deadline):
+        if attempt >= self.max_retries or not is_retryable(error):
+            raise error
+        delay = backoff_delay(attempt)
+        if time.monotonic() + delay >= deadline:
+            raise error
+        with self._condition:
+            self.retries += 1
+        time.sleep(delay)
+
+    @contextmanager
+    def _track(self, kind):
+        name = f"ai.{self.name}" if kind == "call" else f"ai.{self.name}.{kind}"
+        started = time.monotonic()
+        try:
+            with span(name):
+                yield
+        except Exception as e:
+            AI_ERRORS.inc(provider=self.name, error=type(e).__name__)
+            raise
+        finally:
+            AI_REQUEST_SECONDS.observe(time.monotonic() - started, provider=self.name, kind=kind)
+
+    def call(self, fn, tokens=1, timeout=None):
+        """Run `fn(timeout)` under the rate limits, retrying transient failures.
+
+        `fn` receives the seconds left before the deadline and should pass it to
+        the provider SDK as its request timeout.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        with self._track("call"):
+            for attempt in itertools.count():
+                self._acquire(tokens, deadline)
+                try:
+                    result = fn(deadline - time.monotonic())
+                except Exception as e:
+                    self._release(False)
+                    self._retry_or_raise(e, attempt, deadline)
+                    continue
+                self._release(True)
+                return result
+
+    def stream(self, open_stream, tokens=1, timeout=None):
+        """Yield chunks from `open_stream(timeout)` under the rate limits.
+
+        Retries only happen before the first chunk arrives; once output has been
+        yielded a failure propagates to the caller. A consumer that stops early
+        (GeneratorExit from a rerun or disconnect) still returns its slot.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        with self._track("stream"):
+            for attempt in itertools.count():
+                self._acquire(tokens, deadline)
+                started = False
+                released = False
+                chunks = None
+                try:
+                    chunks = open_stream(deadline - time.monotonic())
+                    for chunk in chunks:
+                        started = True
+                        yield chunk
+                except Exception as e:
+                    released = True
+                    self._release(False)
+                    if started:
+                        raise
+                    self._retry_or_raise(e, attempt, deadline)
+                    continue
+                finally:
+                    if not released:
+                        self._release(True)
+                    if chunks is not None and hasattr(chunks, "close"):
+                        chunks.close()
+                return
+
+    def stats(self):
+        with self._condition:
+            return {
+                "queue_depth": len(self._queue),
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "retries": self.retries,
+            }
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(provider):
+    """Process-wide scheduler for a provider, sized from PROVIDER_LIMITS or the environment"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(provider)
+        if scheduler is None:
+            rpm, tpm = PROVIDER_LIMITS[provider]
+            prefix = provider.upper()
+            scheduler = LLMScheduler(
+                requests_per_minute=float(os.environ.get(f"{prefix}_RPM", rpm)),
+                tokens_per_minute=float(os.environ.get(f"{prefix}_TPM", tpm)),
+                name=provider
+            )
+            _schedulers[provider] = scheduler
+        return scheduler
+
+
+def scheduler_stats():
+    with _schedulers_lock:
+        return {provider: scheduler.stats() for provider, scheduler in _schedulers.items()}
@@ -0,0 +1,303 @@
+import folium
+import numpy as np
+import pandas as pd
+from branca.element import MacroElement
+from jinja2 import Template
+
+from data.india_healthcare_data import DATA_VERSION, get_state_dataframe
+from utils.figure_cache import FIGURE_CACHE, input_fingerprint
+from utils.perf import timed
+
+
+GAP_LEGEND_HTML = '''
+<div style="position: fixed; bottom: 50px; left: 50px; z-index: 1000;
+            background-color: white; padding: 15px; border-radius: 10px;
+            border: 2px solid #ccc; font-size: 13px; box-shadow: 0 2px 10px rgba(0,0,0,0.2);">
+    <p style="margin: 0 0 8px 0; font-weight: bold; border-bottom: 1px solid #eee; padding-bottom: 5px;">Gap Severity</p>
+    <p style="margin: 4px 0;"><span style="color: #e53e3e; font-size: 16px;">●</span> Critical (>200K)</p>
+    <p style="margin: 4px 0;"><span style="color: #ecc94b; font-size: 16px;">●</span> Moderate (50K-200K)</p>
+    <p style="margin: 4px 0;"><span style="color: #48bb78; font-size: 16px;">●</span> Low (<50K)</p>
+    <p style="margin: 4px 0;"><span style="color: #38a169; font-size: 16px;">●</span> Surplus</p>
+</div>
+'''
+
+# Feature property name -> state dataframe column
+FEATURE_PROPERTIES = {
+    "name": "State",
+    "population": "Population",
+    "current": "Current AHP",
+    "required": "Required AHP",
+    "gap": "Gap",
+    "per_10k": "AHP per 10K",
+    "institutions": "Training Institutions",
+}
+
+
+class GapMarkerLayer(MacroElement):
+    """One GeoJSON layer of gap markers, styled and given popups in the browser"""
+
+    _template = Template(u"""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.geoJSON({{ this.data|tojson }}, {
+                pointToLayer: function (feature, latlng) {
+                    var p = feature.properties;
+                    var color = '#38a169';
+                    var radius = 8;
+                    if (p.gap > 0) {
+                        color = p.gap > 200000 ? '#e53e3e' : (p.gap > 50000 ? '#ecc94b' : '#48bb78');
+                        radius = Math.max(5, Math.min(30, (p.gap / {{ this.max_gap }}) * 30));
+                    }
+                    return L.circleMarker(latlng, {
+                        radius: radius, color: color, fillColor: color,
+                        fill: true, fillOpacity: 0.7, weight: 2
+                    });
+                },
+                onEachFeature: function (feature, layer) {
+                    var p = feature.properties;
+                    var fmt = function (v) { return Number(v).toLocaleString('en-US'); };
+                    var row = function (label, value, style) {
+                        return '<tr><td><b>' + label + ':</b></td><td style="text-align: right;' +
+                               (style || '') + '">' + value + '</td></tr>';
+                    };
+                    layer.bindPopup(
+                        '<div style="font-family: Arial; min-width: 220px; padding: 10px;">' +
+                        '<h4 style="margin-bottom: 10px; color: #1a365d; border-bottom: 2px solid #3182ce; padding-bottom: 5px;">' +
+                        p.name + '</h4><table style="width: 100%; font-size: 13px;">' +
+                        row('Population', fmt(p.population)) +
+                        row('Current AHP', fmt(p.current)) +
+                        row('Required AHP', fmt(p.required)) +
+                        row('Gap', fmt(p.gap), ' color: ' + (p.gap > 0 ? '#e53e3e' : '#38a169') + '; font-weight: bold;') +
+                        row('AHP per 10K', p.per_10k) +
+                        row('Training Institutions', p.institutions) +
+                        '</table></div>',
+                        {maxWidth: 300}
+                    );
+                }
+            }).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, data, max_gap):
+        super().__init__()
+        self._name = "GapMarkerLayer"
+        self.data = data
+        self.max_gap = max_gap or 1
+
+
+def state_gap_features(state_df=None):
+    """Build (and cache) the GeoJSON FeatureCollection behind the gap map"""
+    key = ("state_gap_features", DATA_VERSION, input_fingerprint(state_df))
+    features = FIGURE_CACHE.get(key)
+    if features is None:
+        if state_df is None:
+            state_df = get_state_dataframe()
+        records = state_df[list(FEATURE_PROPERTIES.values())].rename(
+            columns={column: prop for prop, column in FEATURE_PROPERTIES.items()}
+        ).to_dict("records")
+        features = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [float(lon), float(lat)]},
+                    "properties": properties,
+                }
+                for lon, lat, properties in zip(state_df["Longitude"], state_df["Latitude"], records)
+            ],
+        }
+        FIGURE_CACHE.put(key, features)
+    return features
+
+
+@timed
+def create_state_gap_map(state_df=None):
+    features = state_gap_features(state_df)
+    max_gap = max((f["properties"]["gap"] for f in features["features"]), default=0)
+
+    m = folium.Map(location=[22.5, 82.5], zoom_start=5, tiles='CartoDB positron')
+    GapMarkerLayer(features, max_gap).add_to(m)
+    m.get_root().html.add_child(folium.Element(GAP_LEGEND_HTML))
+
+    return m
+
+
+@timed
+def get_state_gap_map_html(state_df=None):
+    """Standalone map document as bytes, rendered once per data version and input"""
+    key = ("state_gap_map_html", DATA_VERSION, input_fingerprint(state_df))
+    html = FIGURE_CACHE.get(key)
+    if html is None:
+        html = create_state_gap_map(state_df).get_root().render().encode("utf-8")
+        FIGURE_CACHE.put(key, html)
+    return html
+
+
+LOD_MIN_ZOOM = 3
+LOD_MAX_ZOOM = 12
+LOD_CELL_PIXELS = 64
+LOD_NAME_COLUMNS = ("Name", "Facility", "District", "State")
+
+CLUSTER_LEGEND_HTML = '''
+<div style="position: fixed; bottom: 50px; left: 50px; z-index: 1000;
+            background-color: white; padding: 15px; border-radius: 10px;
+            border: 2px solid #ccc; font-size: 13px; box-shadow: 0 2px 10px rgba(0,0,0,0.2);">
+    <p style="margin: 0 0 8px 0; font-weight: bold; border-bottom: 1px solid #eee; padding-bottom: 5px;">Cluster Gap (vs. largest in view)</p>
+    <p style="margin: 4px 0;"><span style="color: #e53e3e; font-size: 16px;">●</span> Critical (>50%)</p>
+    <p style="margin: 4px 0;"><span style="color: #ecc94b; font-size: 16px;">●</span> Moderate (15-50%)</p>
+    <p style="margin: 4px 0;"><span style="color: #48bb78; font-size: 16px;">●</span> Low (<15%)</p>
+    <p style="margin: 4px 0;"><span style="color: #38a169; font-size: 16px;">●</span> Surplus</p>
+</div>
+'''
+
+
+class GapClusterLayer(MacroElement):
+    """Pre-aggregated gap clusters for a single zoom level"""
+
+    _template = Template(u"""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.geoJSON({{ this.data|tojson }}, {
+                pointToLayer: function (feature, latlng) {
+                    var p = feature.properties;
+                    var color = '#38a169';
+                    var radius = 6;
+                    if (p.gap > 0) {
+                        var share = p.gap / {{ this.max_gap }};
+                        color = share > 0.5 ? '#e53e3e' : (share > 0.15 ? '#ecc94b' : '#48bb78');
+                        radius = 6 + 24 * Math.sqrt(share);
+                    }
+                    return L.circleMarker(latlng, {
+                        radius: radius, color: color, fillColor: color,
+                        fill: true, fillOpacity: 0.7, weight: 2
+                    });
+                },
+                onEachFeature: function (feature, layer) {
+                    var p = feature.properties;
+                    var fmt = function (v) { return Number(v).toLocaleString('en-US'); };
+                    layer.bindTooltip(p.name + ': ' + fmt(p.gap) + ' gap');
+                    layer.bindPopup(
+                        '<div style="font-family: Arial; min-width: 200px; padding: 10px;">' +
+                        '<h4 style="margin-bottom: 10px; color: #1a365d; border-bottom: 2px solid #3182ce; padding-bottom: 5px;">' +
+                        p.name + '</h4><table style="width: 100%; font-size: 13px;">' +
+                        '<tr><td><b>Locations:</b></td><td style="text-align: right;">' + fmt(p.points) + '</td></tr>' +
+                        '<tr><td><b>Current AHP:</b></td><td style="text-align: right;">' + fmt(p.current) + '</td></tr>' +
+                        '<tr><td><b>Required AHP:</b></td><td style="text-align: right;">' + fmt(p.required) + '</td></tr>' +
+                        '<tr><td><b>Gap:</b></td><td style="text-align: right; font-weight: bold;">' + fmt(p.gap) + '</td></tr>' +
+                        '</table></div>',
+                        {maxWidth: 300}
+                    );
+                }
+            }).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, data, max_gap):
+        super().__init__()
+        self._name = "GapClusterLayer"
+        self.data = data
+        self.max_gap = max_gap if max_gap > 0 else 1
+
+
+def _lod_cell_degrees(zoom):
+    # Longitude span of a LOD_CELL_PIXELS wide square at this web-mercator zoom
+    return 360.0 / (256 * 2 ** zoom) * LOD_CELL_PIXELS
+
+
+def _lod_points(point_df):
+    missing = [c for c in ("Latitude", "Longitude", "Gap") if c not in point_df.columns]
+    if missing:
+        raise ValueError(f"Point data is missing required columns: {', '.join(missing)}")
+
+    name_column = next((c for c in LOD_NAME_COLUMNS if c in point_df.columns), None)
+    points = pd.DataFrame({
+        "lat": point_df["Latitude"].astype(float).to_numpy(),
+        "lon": point_df["Longitude"].astype(float).to_numpy(),
+        "gap": point_df["Gap"].fillna(0).astype("int64").to_numpy(),
+        "current": point_df.get("Current AHP", pd.Series(0, index=point_df.index)).fillna(0).astype("int64").to_numpy(),
+        "required": point_df.get("Required AHP", pd.Series(0, index=point_df.index)).fillna(0).astype("int64").to_numpy(),
+        "name": point_df[name_column].astype(str).to_numpy() if name_column else "Location",
+    })
+    return points.dropna(subset=["lat", "lon"])
+
+
+def build_gap_cluster_index(point_df):
+    """Aggregate points into a grid of gap clusters for every LOD zoom level.
+
+    Each level is sorted by latitude so a viewport query is a binary search
+    plus a longitude mask.
+    """
+    key = ("gap_cluster_index", DATA_VERSION, input_fingerprint(point_df))
+    index = FIGURE_CACHE.get(key)
+    if index is None:
+        points = _lod_points(point_df)
+        index = {}
+        for zoom in range(LOD_MIN_ZOOM, LOD_MAX_ZOOM + 1):
+            size = _lod_cell_degrees(zoom)
+            level = points.assign(
+                row=np.floor(points["lat"] / size).astype("int64"),
+                col=np.floor(points["lon"] / size).astype("int64"),
+            ).groupby(["row", "col"], sort=False).agg(
+                lat=("lat", "mean"),
+                lon=("lon", "mean"),
+                gap=("gap", "sum"),
+                current=("current", "sum"),
+                required=("required", "sum"),
+                points=("lat", "size"),
+                name=("name", "first"),
+            ).reset_index(drop=True)
+            clustered = level["points"] > 1
+            level.loc[clustered, "name"] = level.loc[clustered, "points"].map("{:,} locations".format)
+            index[zoom] = level.sort_values("lat", ignore_index=True)
+        FIGURE_CACHE.put(key, index)
+    return index
+
+
+def gap_clusters_for_view(point_df, zoom, bounds=None):
+    """FeatureCollection of the clusters at `zoom` that fall inside `bounds`.
+
+    `bounds` uses the st_folium shape: {"_southWest": {"lat", "lng"}, "_northEast": {...}}.
+    """
+    zoom = int(min(max(round(zoom), LOD_MIN_ZOOM), LOD_MAX_ZOOM))
+    level = build_gap_cluster_index(point_df)[zoom]
+
+    if bounds and bounds.get("_southWest") and bounds["_southWest"].get("lat") is not None:
+        pad = _lod_cell_degrees(zoom)
+        south, west = bounds["_southWest"]["lat"] - pad, bounds["_southWest"]["lng"] - pad
+        north, east = bounds["_northEast"]["lat"] + pad, bounds["_northEast"]["lng"] + pad
+        start, stop = np.searchsorted(level["lat"].to_numpy(), [south, north])
+        level = level.iloc[start:stop]
+        level = level[(level["lon"] >= west) & (level["lon"] <= east)]
+
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [round(lon, 5), round(lat, 5)]},
+                "properties": {"name": name, "gap": gap, "current": current,
+                               "required": required, "points": count},
+            }
+            for lat, lon, gap, current, required, count, name in zip(
+                level["lat"], level["lon"], level["gap"].tolist(), level["current"].tolist(),
+                level["required"].tolist(), level["points"].tolist(), level["name"]
+            )
+        ],
+    }
+
+
+@timed
+def create_gap_cluster_map(point_df, zoom=5, bounds=None):
+    """Base map plus a feature group holding only the clusters for the current view.
+
+    Pass the group to st_folium(feature_group_to_add=...) so zooming swaps the
+    layer without rebuilding the map.
+    """
+    clusters = gap_clusters_for_view(point_df, zoom, bounds)
+    max_gap = max((f["properties"]["gap"] for f in clusters["features"]), default=0)
+
+    m = folium.Map(location=[22.5, 82.5], zoom_start=5, tiles='CartoDB positron')
+    m.get_root().html.add_child(folium.Element(CLUSTER_LEGEND_HTML))
+
+    cluster_group = folium.FeatureGroup(name="Gap clusters")
+    GapClusterLayer(clusters, max_gap).add_to(cluster_group)
+
+    return m, cluster_group
@@ -0,0 +1,218 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+import numpy as np
+import pandas as pd
+
+
+MEMORY_TRACKING = os.environ.get("MEMORY_TRACKING", "").lower() in ("1", "true", "yes")
+MEMORY_TRACEMALLOC = os.environ.get("MEMORY_TRACEMALLOC", "").lower() in ("1", "true", "yes")
+MB = 1024 * 1024
+SESSION_BUDGET_BYTES = int(float(os.environ.get("MEMORY_SESSION_BUDGET_MB", 50)) * MB)
+TRACEMALLOC_FRAMES = int(os.environ.get("MEMORY_TRACEMALLOC_FRAMES", 1))
+SESSION_RETENTION_SECONDS = 30 * 60
+TOP_ALLOCATORS = 15
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_OPAQUE_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+_local = threading.local()
+
+# tracemalloc's own bookkeeping and module imports would otherwise dominate every diff
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+def estimate_size(obj):
+    """Approximate bytes held by `obj` and everything reachable from it.
+
+    DataFrames and arrays report their buffers (object columns included), Plotly
+    figures are sized through their JSON-able dict, and other objects are walked
+    through containers and instance attributes. Shared objects count once.
+    """
+    seen = set()
+    pending = [obj]
+    total = 0
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        if isinstance(item, (pd.DataFrame, pd.Series, pd.Index)):
+            usage = item.memory_usage(deep=True)
+            total += int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+        elif isinstance(item, np.ndarray):
+            total += item.nbytes
+        elif isinstance(item, (str, bytes, bytearray, int, float, bool)) or item is None:
+            total += sys.getsizeof(item)
+        elif isinstance(item, _OPAQUE_TYPES):
+            continue
+        elif hasattr(item, "to_plotly_json"):
+            pending.append(item.to_plotly_json())
+        elif isinstance(item, dict):
+            total += sys.getsizeof(item)
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            total += sys.getsizeof(item)
+            pending.extend(item)
+        else:
+            total += sys.getsizeof(item)
+            attributes = getattr(item, "__dict__", None)
+            if attributes is not None:
+                pending.append(attributes)
+    return total
+
+
+def state_sizes(state):
+    """{key: estimated bytes} for a session state mapping, largest first"""
+    sizes = {str(key): estimate_size(state[key]) for key in list(state.keys())}
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def cache_sizes():
+    """Estimated bytes held by the process-wide caches shared between sessions"""
+    from utils.figure_cache import FIGURE_CACHE
+    from utils.response_cache import response_cache_stats
+
+    sizes = {}
+    for key, entry in FIGURE_CACHE.entries():
+        # chart keys start with the builder's module and name, map keys with a label
+        name = f"figure_cache/{key[1] if key[0].startswith('utils.') else key[0]}"
+        sizes[name] = sizes.get(name, 0) + estimate_size(entry)
+    responses = response_cache_stats()
+    if responses is not None:
+        sizes["response_cache (on disk)"] = responses["bytes"]
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def _short_path(filename):
+    if filename.startswith(ROOT_DIR):
+        return os.path.relpath(filename, ROOT_DIR)
+    return os.path.join(*filename.split(os.sep)[-2:]) if os.sep in filename else filename
+
+
+def _allocator_rows(stats, limit):
+    rows = []
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        rows.append({
+            "location": f"{_short_path(frame.filename)}:{frame.lineno}",
+            "size_bytes": getattr(stat, "size_diff", stat.size),
+            "blocks": getattr(stat, "count_diff", stat.count),
+        })
+    return rows
+
+
+class MemoryTracker:
+    """Per-session memory accounting for Streamlit reruns.
+
+    While enabled, every rerun sizes its session state and records the result
+    per session, logging a warning the first time a session goes over
+    `budget_bytes`. With tracemalloc on, the rerun is also bracketed by two
+    snapshots and the largest allocation growth by source line is kept per
+    page. tracemalloc traces the whole process, so diffs from reruns that
+    overlap with other sessions include their allocations too.
+    """
+
+    def __init__(self, enabled=MEMORY_TRACKING, budget_bytes=SESSION_BUDGET_BYTES):
+        self.enabled = enabled
+        self.budget_bytes = budget_bytes
+        self._sessions = {}
+        self._page_growth = {}
+        self._lock = threading.Lock()
+        if MEMORY_TRACEMALLOC:
+            self.start_tracing()
+
+    @property
+    def tracing(self):
+        return tracemalloc.is_tracing()
+
+    def start_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    def stop_tracing(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _local.snapshot = None
+
+    def begin_rerun(self):
+        _local.snapshot = _snapshot() if self.enabled and self.tracing else None
+
+    def end_rerun(self, session_id, page, state):
+        """Size `state` and record the rerun's allocation growth; returns the session record"""
+        if not self.enabled:
+            return None
+        before = getattr(_local, "snapshot", None)
+        _local.snapshot = None
+        if before is not None and self.tracing:
+            growth = _snapshot().compare_to(before, "lineno")
+            with self._lock:
+                self._page_growth[page] = {
+                    "net_bytes": sum(stat.size_diff for stat in growth),
+                    "top": _allocator_rows(growth, TOP_ALLOCATORS),
+                    "updated": time.time(),
+                }
+
+        sizes = state_sizes(state)
+        total = sum(sizes.values())
+        now = time.time()
+        with self._lock:
+            previous = self._sessions.get(session_id)
+            record = {
+                "session": session_id,
+                "page": page,
+                "state_bytes": total,
+                "top_keys": dict(list(sizes.items())[:10]),
+                "peak_state_bytes": max(total, previous["peak_state_bytes"] if previous else 0),
+                "over_budget": total > self.budget_bytes,
+                "updated": now,
+            }
+            self._sessions[session_id] = record
+            for stale in [sid for sid, r in self._sessions.items() if now - r["updated"] > SESSION_RETENTION_SECONDS]:
+                del self._sessions[stale]
+
+        if record["over_budget"] and not (previous and previous["over_budget"]):
+            largest = ", ".join(f"{key} {size / MB:.1f} MB" for key, size in list(sizes.items())[:3])
+            print(
+                f"Session {str(session_id)[:8]} holds {total / MB:.1f} MB of state on {page!r} "
+                f"(budget {self.budget_bytes / MB:.0f} MB); largest: {largest}",
+                file=sys.stderr
+            )
+        return record
+
+    def sessions(self):
+        with self._lock:
+            return sorted(self._sessions.values(), key=lambda record: record["state_bytes"], reverse=True)
+
+    def page_growth(self):
+        with self._lock:
+            return dict(self._page_growth)
+
+    def top_allocators(self, limit=TOP_ALLOCATORS):
+        """Largest live allocations by source line across the whole process"""
+        if not self.tracing:
+            return []
+        return _allocator_rows(_snapshot().statistics("lineno"), limit)
+
+    def reset(self):
+        with self._lock:
+            self._sessions.clear()
+            self._page_growth.clear()
+
+
+MEMORY = MemoryTracker()
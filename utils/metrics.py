@@ -0,0 +1,288 @@
+import math
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+METRICS_PREFIX = "ahp"
+# loopback by default; set METRICS_HOST=0.0.0.0 to let a scraper on another host reach the exporter
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_FILE_INTERVAL = float(os.environ.get("METRICS_FILE_INTERVAL", 15))
+ACTIVE_SESSION_SECONDS = float(os.environ.get("METRICS_ACTIVE_SESSION_SECONDS", 300))
+
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [("", list(zip(self.label_names, key)), value) for key, value in values]
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS_SECONDS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][index] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def samples(self):
+        with self._lock:
+            series = sorted((key, dict(value, counts=list(value["counts"]))) for key, value in self._series.items())
+        samples = []
+        for key, value in series:
+            labels = list(zip(self.label_names, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, value["counts"]):
+                cumulative += count
+                samples.append(("_bucket", labels + [("le", _number(bound))], cumulative))
+            samples.append(("_sum", labels, value["sum"]))
+            samples.append(("_count", labels, value["count"]))
+        return samples
+
+
+RERUNS = Counter(f"{METRICS_PREFIX}_reruns_total", "Completed Streamlit reruns", ["page"])
+RERUN_SECONDS = Histogram(f"{METRICS_PREFIX}_rerun_duration_seconds", "Streamlit rerun wall time", ["page"])
+AI_REQUEST_SECONDS = Histogram(
+    f"{METRICS_PREFIX}_ai_request_duration_seconds",
+    "LLM call latency including queueing and retries", ["provider", "kind"]
+)
+AI_ERRORS = Counter(f"{METRICS_PREFIX}_ai_errors_total", "LLM calls that failed after retries", ["provider", "error"])
+
+INSTRUMENTS = [RERUNS, RERUN_SECONDS, AI_REQUEST_SECONDS, AI_ERRORS]
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def observe_rerun(page, seconds):
+    RERUNS.inc(page=page)
+    RERUN_SECONDS.observe(seconds, page=page)
+
+
+def touch_session(session_id):
+    """Mark a browser session as active; sessions idle for ACTIVE_SESSION_SECONDS stop counting"""
+    now = time.monotonic()
+    with _sessions_lock:
+        _sessions[session_id] = now
+        for stale in [sid for sid, seen in _sessions.items() if now - seen > ACTIVE_SESSION_SECONDS]:
+            del _sessions[stale]
+
+
+def active_sessions():
+    cutoff = time.monotonic() - ACTIVE_SESSION_SECONDS
+    with _sessions_lock:
+        return sum(1 for seen in _sessions.values() if seen >= cutoff)
+
+
+def _collected_metrics():
+    """(name, type, help, [(labels, value)]) read from the caches, schedulers and queues"""
+    from utils.figure_cache import FIGURE_CACHE
+    from utils.jobs import get_job_queue
+    from utils.llm_scheduler import scheduler_stats
+    from utils.memory import MEMORY
+    from utils.micro_batch import COST_PROJECTION_BATCHER
+    from utils.prompt_builder import projection_summary
+    from utils.response_cache import response_cache_stats
+    from utils.single_flight import AI_SINGLE_FLIGHT
+
+    p = METRICS_PREFIX
+    figures = FIGURE_CACHE.stats()
+    projections = projection_summary.cache_info()
+    flights = AI_SINGLE_FLIGHT.stats()
+    schedulers = scheduler_stats()
+    jobs = get_job_queue().stats()
+    batching = COST_PROJECTION_BATCHER.stats()
+
+    metrics = [
+        (f"{p}_active_sessions", "gauge", f"Sessions seen in the last {ACTIVE_SESSION_SECONDS:.0f}s",
+         [([], active_sessions())]),
+        (f"{p}_figure_cache_hits_total", "counter", "Chart and map figure cache hits", [([], figures["hits"])]),
+        (f"{p}_figure_cache_misses_total", "counter", "Chart and map figure cache misses", [([], figures["misses"])]),
+        (f"{p}_figure_cache_entries", "gauge", "Figures held in the cache", [([], figures["entries"])]),
+        (f"{p}_prompt_summary_cache_hits_total", "counter",
+         "AI prompt builder's projection_summary lru_cache hits", [([], projections.hits)]),
+        (f"{p}_prompt_summary_cache_misses_total", "counter",
+         "AI prompt builder's projection_summary lru_cache misses", [([], projections.misses)]),
+        (f"{p}_single_flight_upstream_total", "counter", "AI requests sent upstream",
+         [([], flights["upstream_calls"])]),
+        (f"{p}_single_flight_coalesced_total", "counter", "AI requests served by joining an identical in-flight call",
+         [([], flights["coalesced_calls"])]),
+        (f"{p}_projection_batches_total", "counter", "Micro-batched cost projection evaluations",
+         [([], batching["batches"])]),
+        (f"{p}_projection_batched_calls_total", "counter", "Cost projection calls served through micro-batches",
+         [([], batching["items"])]),
+        (f"{p}_ai_jobs", "gauge", "Background AI jobs by status",
+         [([("status", status)], count) for status, count in jobs.items()]),
+    ]
+
+    if MEMORY.enabled:
+        sessions = MEMORY.sessions()
+        metrics += [
+            (f"{p}_session_state_bytes", "gauge", "Estimated session state held by tracked sessions",
+             [([], sum(record["state_bytes"] for record in sessions))]),
+            (f"{p}_sessions_over_memory_budget", "gauge", "Tracked sessions whose state exceeds the budget",
+             [([], sum(1 for record in sessions if record["over_budget"]))]),
+        ]
+
+    responses = response_cache_stats()
+    if responses is not None:
+        metrics += [
+            (f"{p}_response_cache_hits_total", "counter", "AI response cache hits", [([], responses["hits"])]),
+            (f"{p}_response_cache_misses_total", "counter", "AI response cache misses", [([], responses["misses"])]),
+            (f"{p}_response_cache_bytes", "gauge", "Stored AI response text", [([], responses["bytes"])]),
+        ]
+
+    for field, metric_type, help_text in (
+        ("queue_depth", "gauge", "LLM calls waiting for a rate-limit slot"),
+        ("in_flight", "gauge", "LLM calls in progress"),
+        ("completed", "counter", "LLM call attempts that succeeded"),
+        ("failed", "counter", "LLM call attempts that failed"),
+        ("retries", "counter", "LLM call retries"),
+    ):
+        name = f"{p}_llm_{field}_total" if metric_type == "counter" else f"{p}_llm_{field}"
+        metrics.append((name, metric_type, help_text, [
+            ([("provider", provider)], stats[field]) for provider, stats in sorted(schedulers.items())
+        ]))
+    return metrics
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for instrument in INSTRUMENTS:
+        lines.append(f"# HELP {instrument.name} {instrument.help}")
+        lines.append(f"# TYPE {instrument.name} {instrument.type}")
+        for suffix, labels, value in instrument.samples():
+            lines.append(f"{instrument.name}{suffix}{_labels(labels)} {_number(value)}")
+    for name, metric_type, help_text, samples in _collected_metrics():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path):
+    """Write the metrics atomically so a collector never reads a partial file"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(render_metrics())
+    os.replace(temp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_started = set()
+_start_lock = threading.Lock()
+
+
+def start_metrics_server(port, host=METRICS_HOST):
+    """Serve /metrics on a daemon thread; later calls in the same process are no-ops"""
+    with _start_lock:
+        if ("server", port) in _started:
+            return
+        _started.add(("server", port))
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            print(f"Metrics server not started on port {port}: {e}", file=sys.stderr)
+            return
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+
+
+def start_metrics_file_writer(path, interval=METRICS_FILE_INTERVAL):
+    """Rewrite `path` every `interval` seconds on a daemon thread"""
+    with _start_lock:
+        if ("file", path) in _started:
+            return
+        _started.add(("file", path))
+
+    def run():
+        while True:
+            try:
+                write_metrics_file(path)
+            except OSError as e:
+                print(f"Could not write metrics to {path}: {e}", file=sys.stderr)
+            time.sleep(interval)
+
+    threading.Thread(target=run, name="metrics-file", daemon=True).start()
+
+
+def start_metrics_exporters():
+    """Start the exporters configured in the environment.
+
+    METRICS_PORT serves http://<METRICS_HOST>:<port>/metrics from this process;
+    METRICS_FILE is rewritten every METRICS_FILE_INTERVAL seconds for
+    node_exporter's textfile collector.
+    """
+    if os.environ.get("METRICS_PORT"):
+        start_metrics_server(int(os.environ["METRICS_PORT"]))
+    if os.environ.get("METRICS_FILE"):
+        start_metrics_file_writer(os.environ["METRICS_FILE"])
@@ -0,0 +1,132 @@
+import inspect
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from data.india_healthcare_data import calculate_cost_projection, calculate_cost_projection_batch
+from utils.perf import timed
+
+
+COST_BATCH_MAX_SIZE = int(os.environ.get("COST_BATCH_MAX_SIZE", 64))
+COST_BATCH_MAX_WAIT_MS = float(os.environ.get("COST_BATCH_MAX_WAIT_MS", 2))
+
+
+class MicroBatcher:
+    """Coalesce calls that arrive within a short window into one batched evaluation.
+
+    Callers block in `submit(item)`. A dispatcher thread takes the oldest queued
+    item, keeps collecting until `max_batch_size` items are queued or `max_wait`
+    seconds have passed, evaluates them with a single `batch_fn(items)` call and
+    hands each caller its own result. Items with the same `key` share one slot
+    in the batch. If a batch raises, its items are retried one at a time so only
+    the callers whose input fails see the error.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=COST_BATCH_MAX_SIZE, max_wait=COST_BATCH_MAX_WAIT_MS / 1000,
+                 key=None, copy_result=None, name="micro-batch"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.key = key
+        self.copy_result = copy_result
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._dispatcher = None
+
+    def submit(self, item):
+        """Evaluate `item` as part of the next batch and return its result"""
+        future = Future()
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._dispatcher.start()
+        self._queue.put((item, future))
+        return future.result()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            self._evaluate(self._collect())
+
+    def _evaluate(self, batch):
+        groups = {}
+        for item, future in batch:
+            key = self.key(item) if self.key is not None else id(future)
+            groups.setdefault(key, (item, []))[1].append(future)
+        unique = list(groups.values())
+        with self._lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+        try:
+            results = self.batch_fn([item for item, _ in unique])
+        except Exception:
+            results = None
+        if results is not None:
+            for (_, futures), result in zip(unique, results):
+                self._resolve(futures, result)
+            return
+
+        for item, futures in unique:
+            try:
+                result = self.batch_fn([item])[0]
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                self._resolve(futures, result)
+
+    def _resolve(self, futures, result):
+        futures[0].set_result(result)
+        for future in futures[1:]:
+            future.set_result(self.copy_result(result) if self.copy_result is not None else result)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "largest_batch": self.largest_batch,
+                "queued": self._queue.qsize(),
+                "mean_batch": round(self.items / self.batches, 2) if self.batches else None,
+            }
+
+
+_COST_PROJECTION_SIGNATURE = inspect.signature(calculate_cost_projection)
+
+COST_PROJECTION_BATCHER = MicroBatcher(
+    calculate_cost_projection_batch,
+    key=lambda params: tuple(sorted(params.items())),
+    # every caller may modify its frame, as it could one from calculate_cost_projection
+    copy_result=lambda frame: frame.copy(),
+    name="cost-projection-batch",
+)
+
+
+@timed
+def batched_cost_projection(*args, **kwargs):
+    """calculate_cost_projection evaluated together with concurrent callers' requests"""
+    bound = _COST_PROJECTION_SIGNATURE.bind(*args, **kwargs)
+    bound.apply_defaults()
+    params = dict(bound.arguments)
+    if params["years"] < 1:
+        # outside the vectorized path's domain; keep the loop's own behaviour for these
+        return calculate_cost_projection(**params)
+    return COST_PROJECTION_BATCHER.submit(params)
@@ -0,0 +1,185 @@
+import hmac
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from utils.metrics import observe_rerun
+
+
+PERF_ENABLED = os.environ.get("PERF_TRACING", "").lower() in ("1", "true", "yes")
+PERF_SAMPLE_SIZE = int(os.environ.get("PERF_SAMPLE_SIZE", 2048))
+# ?admin=<key> shows the performance page; unset (the default) keeps it hidden from everyone
+PERF_ADMIN_KEY = os.environ.get("PERF_ADMIN_KEY") or None
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+RERUN = "rerun"
+BACKGROUND = "background"
+
+_local = threading.local()
+_NO_SPAN = nullcontext()
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LatencyStats:
+    """Count, total and bucketed histogram of every observation plus a window of recent samples"""
+
+    def __init__(self, sample_size=PERF_SAMPLE_SIZE):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.samples = deque(maxlen=sample_size)
+
+    def add(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.samples.append(elapsed_ms)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+            "max_ms": self.max_ms,
+            "buckets": dict(zip([str(bound) for bound in LATENCY_BUCKETS_MS] + ["+Inf"], self.buckets)),
+        }
+
+
+class PerfRecorder:
+    """Process-wide timing spans, aggregated per page and span name.
+
+    A span is attributed to the page of the rerun that is active on the
+    calling thread; work on other threads (AI jobs, batch runs) is recorded
+    under "background". When recording is disabled, `span` returns a shared
+    no-op context manager and `timed` functions call straight through.
+    """
+
+    def __init__(self, enabled=PERF_ENABLED, sample_size=PERF_SAMPLE_SIZE):
+        self.enabled = enabled
+        self.sample_size = sample_size
+        self.started = time.time()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, elapsed_ms, page=None):
+        key = (page or current_page(), name)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = LatencyStats(self.sample_size)
+            stats.add(elapsed_ms)
+
+    @contextmanager
+    def _timed_span(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def span(self, name):
+        if not self.enabled:
+            return _NO_SPAN
+        return self._timed_span(name)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """{page: {span: summary}} with the rerun totals listed first on each page"""
+        with self._lock:
+            items = [(page, name, stats.summary()) for (page, name), stats in self._stats.items()]
+        pages = {}
+        for page, name, summary in sorted(items, key=lambda item: (item[0], item[1] != RERUN, item[1])):
+            pages.setdefault(page, {})[name] = summary
+        return pages
+
+    def to_json(self):
+        return json.dumps({
+            "enabled": self.enabled,
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "pages": self.snapshot(),
+        }, indent=2)
+
+    def dump_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+
+PERF = PerfRecorder()
+
+
+def perf_page_unlocked(supplied, key=PERF_ADMIN_KEY):
+    """Whether an ?admin= value opens the performance page; always False when no key is configured"""
+    if not key or not supplied:
+        return False
+    return hmac.compare_digest(str(supplied).encode("utf-8"), key.encode("utf-8"))
+
+
+def current_page():
+    return getattr(_local, "page", None) or BACKGROUND
+
+
+def span(name):
+    """Time a block under `name` when recording is enabled"""
+    return PERF.span(name)
+
+
+def timed(fn=None, *, name=None):
+    """Decorator recording each call of `fn` as a span named after the function"""
+    if fn is None:
+        return lambda fn: timed(fn, name=name)
+    span_name = name or fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not PERF.enabled:
+            return fn(*args, **kwargs)
+        with PERF._timed_span(span_name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def begin_rerun(page):
+    """Attribute spans on this thread to `page` and start timing the rerun"""
+    _local.page = page
+    _local.rerun_started = time.perf_counter()
+
+
+def end_rerun():
+    """Record the rerun started by begin_rerun.
+
+    Rerun counts and durations always go to the exported metrics; the span is
+    only recorded while PERF is enabled. The app calls this from a `finally`,
+    so reruns cut short by st.rerun() or st.stop() are counted too.
+    """
+    started = getattr(_local, "rerun_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    observe_rerun(current_page(), elapsed)
+    if PERF.enabled:
+        PERF.record(RERUN, elapsed * 1000)
+    _local.rerun_started = None
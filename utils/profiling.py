@@ -0,0 +1,202 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles")
+)
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL", 0.005))
+
+CPROFILE = "cprofile"
+SAMPLING = "sampling"
+PROFILE_MODES = (CPROFILE, SAMPLING)
+
+_local = threading.local()
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower() or "page"
+
+
+def _frame_label(code):
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def profile_params(*mappings):
+    """JSON-safe copy of query parameters and widget state to tag a profile with"""
+    params = {}
+    for mapping in mappings:
+        for key in mapping:
+            value = mapping[key]
+            if isinstance(value, (str, int, float, bool)) or value is None:
+                params[str(key)] = value
+            elif isinstance(value, (list, tuple)) and all(isinstance(item, (str, int, float, bool)) for item in value):
+                params[str(key)] = list(value)
+    return params
+
+
+def requested_mode(value):
+    """Profile mode named by a ?profile= query value: '1' or 'cprofile', or 'sampling'"""
+    if not value:
+        return None
+    value = value.lower()
+    if value in ("1", "true", CPROFILE):
+        return CPROFILE
+    if value in ("sample", SAMPLING):
+        return SAMPLING
+    return None
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval into folded stacks"""
+
+    def __init__(self, thread, interval=PROFILE_SAMPLE_INTERVAL):
+        self.thread = thread
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval) and self.thread.is_alive():
+            frame = sys._current_frames().get(self.thread.ident)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self):
+        """Brendan Gregg's collapsed-stack format, readable by flamegraph.pl and speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileCapture:
+    """Profiles one Streamlit script run on the calling thread.
+
+    `cprofile` records every call deterministically and writes a pstats file
+    (snakeviz, gprof2dot) plus a text summary; `sampling` samples the stack and
+    writes folded stacks for flame graphs at much lower overhead. Each capture
+    also writes a JSON file with the page, parameters and timing.
+    """
+
+    def __init__(self, mode, page, params=None, output_dir=PROFILE_DIR):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; expected one of {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self.page = page
+        self.params = params or {}
+        self.output_dir = output_dir
+        self._profiler = None
+        self._sampler = None
+
+    def start(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        if self.mode == CPROFILE:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._sampler = StackSampler(threading.current_thread())
+            self._sampler.start()
+
+    def cancel(self):
+        """Stop profiling without writing anything"""
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+
+    def stop(self):
+        """Stop profiling and write the output files; returns their paths"""
+        self.cancel()
+        elapsed = time.perf_counter() - self._started
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        stem = os.path.join(
+            self.output_dir,
+            f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))}"
+            f"{int(self.started_at * 1000) % 1000:03d}-{_slug(self.page)}-{self.mode}"
+        )
+        paths = []
+        if self._profiler is not None:
+            self._profiler.dump_stats(f"{stem}.prof")
+            summary = io.StringIO()
+            pstats.Stats(self._profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+            with open(f"{stem}.txt", "w", encoding="utf-8") as f:
+                f.write(summary.getvalue())
+            paths += [f"{stem}.prof", f"{stem}.txt"]
+        if self._sampler is not None:
+            with open(f"{stem}.collapsed", "w", encoding="utf-8") as f:
+                f.write(self._sampler.folded())
+            paths.append(f"{stem}.collapsed")
+
+        with open(f"{stem}.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "page": self.page,
+                "mode": self.mode,
+                "params": self.params,
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+                "duration_s": round(elapsed, 4),
+                "samples": sum(self._sampler.stacks.values()) if self._sampler is not None else None,
+                "files": [os.path.basename(path) for path in paths],
+            }, f, indent=2, ensure_ascii=False)
+        paths.append(f"{stem}.json")
+        return paths
+
+
+def begin_profile(mode, page, params=None):
+    """Start profiling the rest of this script run on the current thread"""
+    abandon_profile()
+    capture = ProfileCapture(mode, page, params)
+    capture.start()
+    _local.capture = capture
+
+
+def end_profile():
+    """Finish the capture begun on this thread, if any; returns the written paths"""
+    capture = getattr(_local, "capture", None)
+    _local.capture = None
+    if capture is None:
+        return []
+    return capture.stop()
+
+
+def abandon_profile():
+    """Stop a capture left running by a run that ended early (st.rerun, st.stop) without writing it"""
+    capture = getattr(_local, "capture", None)
+    _local.capture = None
+    if capture is not None:
+        capture.cancel()
+
+
+def recent_profiles(limit=20, output_dir=PROFILE_DIR):
+    """Metadata of the newest captures, newest first"""
+    if not os.path.isdir(output_dir):
+        return []
+    names = sorted((name for name in os.listdir(output_dir) if name.endswith(".json")), reverse=True)
+    profiles = []
+    for name in names[:limit]:
+        with open(os.path.join(output_dir, name), encoding="utf-8") as f:
+            profile = json.load(f)
+        profile["paths"] = [os.path.join(output_dir, file_name) for file_name in profile["files"]]
+        profiles.append(profile)
+    return profiles
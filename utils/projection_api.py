@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from data.india_healthcare_data import DATA_VERSION, get_region_summary, get_scenario_comparison, get_state_dataframe
+from utils.lru import LRUCache
+from utils.micro_batch import batched_cost_projection
+from utils.scenario_specs import COST_PARAMETERS, STRATEGY_PARAMETERS, resolve_params
+from utils.single_flight import SingleFlight
+
+
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("API_PORT", 8600))
+API_CACHE_ENTRIES = int(os.environ.get("API_CACHE_ENTRIES", 1024))
+CONTENT_TYPE = "application/json; charset=utf-8"
+
+# path -> (parameter schema, data function)
+ENDPOINTS = {
+    "/v1/cost-projection": (COST_PARAMETERS, batched_cost_projection),
+    "/v1/scenario-comparison": (STRATEGY_PARAMETERS, get_scenario_comparison),
+    "/v1/regions": ({}, get_region_summary),
+    "/v1/states": ({}, get_state_dataframe),
+}
+
+# Encoded responses keyed on path, dataset version and validated parameters
+RESPONSE_CACHE = LRUCache(max_entries=API_CACHE_ENTRIES)
+API_SINGLE_FLIGHT = SingleFlight()
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class CachedResponse:
+    """An encoded JSON body and the ETag that identifies it"""
+
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+
+
+def _encode(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def describe_endpoints():
+    """Endpoint listing with each parameter's type, default and bounds"""
+    return {
+        path: {
+            name: {"type": kind.__name__, "default": default, "min": minimum, "max": maximum}
+            for name, (kind, default, minimum, maximum) in parameters.items()
+        }
+        for path, (parameters, _) in ENDPOINTS.items()
+    }
+
+
+def parse_query(query, parameters):
+    """Validated keyword arguments from a query string, rejecting unknown and repeated parameters"""
+    raw = parse_qs(query, keep_blank_values=True)
+    unknown = sorted(set(raw) - set(parameters))
+    if unknown:
+        raise ApiError(400, f"Unknown parameter(s): {', '.join(unknown)}")
+    repeated = sorted(name for name, values in raw.items() if len(values) > 1)
+    if repeated:
+        raise ApiError(400, f"Parameter(s) given more than once: {', '.join(repeated)}")
+    try:
+        return resolve_params({name: values[0] for name, values in raw.items()}, parameters)
+    except ValueError as e:
+        raise ApiError(400, str(e)) from None
+
+
+def _build_response(path, params, data_function):
+    frame = data_function(**params)
+    body = _encode({
+        "data_version": DATA_VERSION,
+        "params": params,
+        "rows": json.loads(frame.to_json(orient="records", force_ascii=False)),
+    })
+    return CachedResponse(body, f'"{DATA_VERSION}-{hashlib.sha1(body).hexdigest()[:16]}"')
+
+
+def get_response(path, query=""):
+    """The cached response for an endpoint, computing it once for concurrent identical requests"""
+    if path not in ENDPOINTS:
+        raise ApiError(404, f"Unknown endpoint {path}; see /v1")
+    parameters, data_function = ENDPOINTS[path]
+    params = parse_query(query, parameters)
+    key = (path, DATA_VERSION, tuple(sorted(params.items())))
+    response = RESPONSE_CACHE.get(key)
+    if response is None:
+        response = API_SINGLE_FLIGHT.do(key, lambda: _build_response(path, params, data_function))
+        RESPONSE_CACHE.put(key, response)
+    return response
+
+
+def etag_matches(header, etag):
+    """Whether an If-None-Match header value covers `etag` (weak comparison, as RFC 9110 requires)"""
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+
+class ProjectionApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes; with Nagle on, keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+    access_log = False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        if path in ("/", "/v1"):
+            self._send(200, _encode({"data_version": DATA_VERSION, "endpoints": describe_endpoints()}))
+            return
+        if path == "/health":
+            self._send(200, _encode({"status": "ok", "data_version": DATA_VERSION}))
+            return
+        try:
+            response = get_response(path, url.query)
+        except ApiError as e:
+            self._send(e.status, _encode({"error": str(e)}))
+            return
+        except Exception as e:
+            print(f"API error on {self.path}: {type(e).__name__}: {e}", file=sys.stderr)
+            self._send(500, _encode({"error": "Internal error"}))
+            return
+
+        if etag_matches(self.headers.get("If-None-Match"), response.etag):
+            self._send(304, b"", etag=response.etag)
+        else:
+            self._send(200, response.body, etag=response.etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.access_log:
+            super().log_message(format, *args)
+
+
+def create_server(host=API_HOST, port=API_PORT, access_log=False):
+    handler = type("Handler", (ProjectionApiHandler,), {"access_log": access_log})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_api_server(host=API_HOST, port=API_PORT):
+    """Serve the API on a daemon thread; returns the server so callers can shut it down"""
+    server = create_server(host, port)
+    threading.Thread(target=server.serve_forever, name="projection-api", daemon=True).start()
+    return server
@@ -0,0 +1,167 @@
+import os
+import textwrap
+from functools import lru_cache
+
+from data.india_healthcare_data import (
+    TOTAL_GAP, calculate_cost_projection, get_category_dataframe, get_region_summary
+)
+from utils.llm_scheduler import estimate_tokens
+
+
+DEFAULT_PROMPT_TOKEN_BUDGET = int(os.environ.get("AI_PROMPT_TOKEN_BUDGET", 700))
+
+
+def compact_prompt(text):
+    """Strip the indentation and blank-line padding of a triple-quoted prompt"""
+    lines = textwrap.dedent(text).strip().splitlines()
+    return "\n".join(line.rstrip() for line in lines)
+
+
+class PromptBuilder:
+    """Assemble a prompt from sections while keeping it within a token budget.
+
+    Required sections are always included. Optional sections are admitted in
+    priority order (lower first) and truncated line by line when only part of
+    them fits, so their lines should be ordered most important first. Sections
+    are emitted in the order they were added, which keeps the output
+    deterministic for identical inputs.
+    """
+
+    def __init__(self, budget=DEFAULT_PROMPT_TOKEN_BUDGET):
+        self.budget = budget
+        self._sections = []
+
+    def add(self, title, lines, priority=0, required=False):
+        if isinstance(lines, str):
+            lines = [lines]
+        self._sections.append({"title": title, "lines": list(lines), "priority": priority, "required": required})
+        return self
+
+    @staticmethod
+    def _render(title, lines):
+        body = "\n".join(lines)
+        return f"{title}:\n{body}" if title else body
+
+    def build(self):
+        chosen = {}
+        used = 0
+        for index, section in enumerate(self._sections):
+            if section["required"]:
+                chosen[index] = section["lines"]
+                used += estimate_tokens(self._render(section["title"], section["lines"])) + 1
+
+        optional = sorted(
+            (index for index, section in enumerate(self._sections) if not section["required"]),
+            key=lambda index: (self._sections[index]["priority"], index)
+        )
+        for index in optional:
+            section = self._sections[index]
+            lines = []
+            cost = estimate_tokens(f"{section['title']}:") + 1
+            for line in section["lines"]:
+                line_cost = estimate_tokens(line) + 1
+                if used + cost + line_cost > self.budget:
+                    break
+                lines.append(line)
+                cost += line_cost
+            if lines:
+                chosen[index] = lines
+                used += cost
+
+        return "\n\n".join(
+            self._render(self._sections[index]["title"], chosen[index]) for index in sorted(chosen)
+        )
+
+
+def closure_target(strategy_type):
+    """Gap closure percentage named in a scenario label such as 'Moderate (75% by 2035)'"""
+    for pct in (100, 75, 50):
+        if f"{pct}%" in strategy_type:
+            return pct
+    return 100
+
+
+@lru_cache(maxsize=64)
+def projection_summary(target_gap_closure_pct, years):
+    """Headline numbers from calculate_cost_projection for one closure target and timeline"""
+    df = calculate_cost_projection(target_gap_closure_pct, years)
+    first, last = df.iloc[0], df.iloc[-1]
+    total = float(df["Total Year Cost (₹ Cr)"].sum())
+    cost_mix = {
+        name: float(df[f"{name} Cost (₹ Cr)"].sum()) / total * 100 if total else 0.0
+        for name in ("Training", "Salary", "Infrastructure", "Retention")
+    }
+    return {
+        "years": int(years),
+        "target_gap_closure_pct": float(target_gap_closure_pct),
+        "total_cost_cr": round(total),
+        "first_year_cost_cr": round(float(first["Total Year Cost (₹ Cr)"])),
+        "final_year_cost_cr": round(float(last["Total Year Cost (₹ Cr)"])),
+        "first_year_training_cr": round(float(first["Training Cost (₹ Cr)"])),
+        "first_year_salary_cr": round(float(first["Salary Cost (₹ Cr)"])),
+        "annual_additions": int(first["Professionals Added"]),
+        "professionals_added": int(last["Cumulative Professionals"]),
+        "gap_remaining": int(last["Gap Remaining"]),
+        "cost_mix_pct": {name: round(share, 1) for name, share in cost_mix.items()},
+    }
+
+
+def projection_lines(summary):
+    mix = ", ".join(f"{name} {share}%" for name, share in summary["cost_mix_pct"].items() if share)
+    return [
+        f"- Total investment: ₹{summary['total_cost_cr']:,} Cr over {summary['years']} years",
+        f"- Professionals added: {summary['professionals_added']:,} ({summary['annual_additions']:,}/year); "
+        f"gap remaining {summary['gap_remaining']:,}",
+        f"- Annual cost: ₹{summary['first_year_cost_cr']:,} Cr in year 1 rising to "
+        f"₹{summary['final_year_cost_cr']:,} Cr in year {summary['years']}",
+        f"- Cost mix: {mix}",
+    ]
+
+
+def category_summary():
+    """{category: {gap, gap_percentage, avg_salary_inr, attrition_pct}} ordered by gap, largest first"""
+    df = get_category_dataframe().sort_values(["Gap", "Category"], ascending=[False, True])
+    return {
+        row["Category"]: {
+            "gap": int(row["Gap"]),
+            "gap_percentage": float(row["Gap %"]),
+            "avg_salary_inr": int(row["Avg Salary (₹)"]),
+            "attrition_pct": round(float(row["Attrition Rate"]) * 100, 1),
+        }
+        for _, row in df.iterrows()
+    }
+
+
+def category_lines(category_data):
+    lines = []
+    for category, info in category_data.items():
+        line = (
+            f"- {category}: {info['gap']:,} gap, {info['gap_percentage']}% of total, "
+            f"₹{info['avg_salary_inr']:,} avg salary"
+        )
+        if "attrition_pct" in info:
+            line += f", {info['attrition_pct']}% attrition"
+        lines.append(line)
+    return lines
+
+
+def region_lines():
+    """Regions ordered by gap share of requirement, most under-served first"""
+    df = get_region_summary().sort_values(["Gap %", "Region"], ascending=[False, True])
+    return [
+        f"- {row['Region']}: {int(row['Gap']):,} gap ({row['Gap %']}% of need), {row['AHP per 10K']} AHPs per 10K"
+        for _, row in df.iterrows()
+    ]
+
+
+def policy_scenario_data(strategy_type, years):
+    """Scenario inputs for the policy prompt, taken from the live cost projection"""
+    summary = projection_summary(closure_target(strategy_type), int(years))
+    return {
+        "total_gap": TOTAL_GAP,
+        "years": int(years),
+        "strategy_type": strategy_type,
+        "budget": summary["total_cost_cr"],
+        "gap_closure_pct": closure_target(strategy_type),
+        "projection": summary,
+    }
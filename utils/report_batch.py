@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from data.india_healthcare_data import DATA_VERSION, REGION_DATA, TOTAL_GAP, get_category_dataframe
+from utils.ai_helper_gemini import GEMINI_MODEL_NAME, AIHealthcareAnalyst
+from utils.ai_helper_openai import (
+    OPENAI_MODEL_NAME, STRATEGY_SYSTEM_PROMPT, build_strategy_prompt, stream_ai_strategy
+)
+from utils.llm_providers import backend_model_name
+from utils.prompt_builder import closure_target, projection_summary
+from utils.response_cache import response_cache_key
+
+
+BATCH_OUTPUT_DIR = os.environ.get(
+    "AI_BATCH_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "board_pack")
+)
+BATCH_MAX_WORKERS = int(os.environ.get("AI_BATCH_WORKERS", 4))
+# UI board packs get a directory per distinct set of documents; older ones beyond this count are removed
+BATCH_RUNS_KEPT = int(os.environ.get("AI_BATCH_RUNS_KEPT", 5))
+
+REPORT_SCENARIOS = [
+    "Conservative (50% by 2035)",
+    "Moderate (75% by 2035)",
+    "Aggressive (100% by 2035)",
+    "Quick Win (50% by 2030)"
+]
+
+# report_type -> (title, file stem)
+REPORT_TYPES = {
+    "executive": ("Executive Summary", "Executive_Summary"),
+    "policy_brief": ("Policy Brief", "Policy_Brief"),
+    "implementation": ("Implementation Roadmap", "Implementation_Roadmap")
+}
+
+REPORT_YEARS = 10
+
+# Headline workforce figures quoted in the reports; costs come from the live projection
+REPORT_WORKFORCE_DATA = {
+    "current_supply": 2_120_000,
+    "required_supply": 8_600_000,
+    "gap": TOTAL_GAP,
+    "gap_pct": 95
+}
+
+
+def report_scenario_data(scenario):
+    return {
+        "years": REPORT_YEARS,
+        "strategy_type": scenario,
+        "budget": projection_summary(closure_target(scenario), REPORT_YEARS)["total_cost_cr"]
+    }
+
+
+def report_results_data(scenario):
+    """Report inputs with first-year costs and hiring taken from calculate_cost_projection"""
+    summary = projection_summary(closure_target(scenario), REPORT_YEARS)
+    return dict(
+        REPORT_WORKFORCE_DATA,
+        annual_salary=summary["first_year_salary_cr"],
+        training_cost=summary["first_year_training_cr"],
+        total_cost=summary["first_year_cost_cr"],
+        professionals_added=summary["annual_additions"]
+    )
+
+
+def default_strategy_params():
+    """Strategy inputs matching the defaults on the Strategy Formulation page"""
+    category_df = get_category_dataframe()
+    top_categories = category_df.nlargest(5, 'Gap')['Category'].tolist()[:3]
+    region_focus = [region for region in ['North', 'East'] if region in REGION_DATA]
+    return dict(
+        gap_analysis=f"Priority categories: {', '.join(top_categories)}. Focus regions: {', '.join(region_focus)}",
+        budget_constraints='Moderate',
+        priority_areas=', '.join(['Training Capacity Expansion', 'Rural Deployment', 'Retention & Incentives']),
+        timeline=15,
+        phase_focus='Balanced'
+    )
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "_", text.split("(")[0].lower()).strip("_")
+
+
+def item_fingerprint(model, prompt):
+    """Short hash of the dataset version, model and rendered prompt that produce a document"""
+    digest = hashlib.sha256(f"{DATA_VERSION}\0{response_cache_key(model, prompt)}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def build_batch_items(include_strategy=True):
+    """Every report type x scenario, plus the strategy document, as (item_id, title, generate, fingerprint) tuples"""
+    analyst = None
+    analyst_lock = threading.Lock()
+
+    def get_analyst():
+        # created lazily so a missing GOOGLE_API_KEY fails the report items, not the whole batch
+        nonlocal analyst
+        with analyst_lock:
+            if analyst is None:
+                analyst = AIHealthcareAnalyst()
+            return analyst
+
+    def report(report_type, scenario):
+        return lambda: "".join(
+            get_analyst().stream_executive_report(
+                report_scenario_data(scenario), report_results_data(scenario), report_type
+            )
+        )
+
+    report_model = backend_model_name("gemini", GEMINI_MODEL_NAME)
+    items = []
+    for scenario in REPORT_SCENARIOS:
+        for report_type, (title, stem) in REPORT_TYPES.items():
+            prompt = AIHealthcareAnalyst.build_report_prompt(
+                report_scenario_data(scenario), report_results_data(scenario), report_type
+            )
+            items.append((
+                f"{stem}_{_slug(scenario)}",
+                f"{title} - {scenario}",
+                report(report_type, scenario),
+                item_fingerprint(report_model, prompt)
+            ))
+
+    if include_strategy:
+        strategy_params = default_strategy_params()
+        # the same model name and system + user prompt the strategy response cache keys on
+        strategy_prompt = f"{STRATEGY_SYSTEM_PROMPT}\n\n{build_strategy_prompt(**strategy_params)}"
+        items.append((
+            "Comprehensive_Strategy",
+            "Comprehensive Strategy",
+            lambda: "".join(stream_ai_strategy(**strategy_params)),
+            item_fingerprint(backend_model_name("openai", OPENAI_MODEL_NAME), strategy_prompt)
+        ))
+    return items
+
+
+def run_dir(items, base_dir=BATCH_OUTPUT_DIR, keep=BATCH_RUNS_KEPT):
+    """Directory under `base_dir/runs` for a batch of `items`, named by their fingerprints.
+
+    Rerunning the same batch (same documents, dataset, models and prompts)
+    resumes in the same directory. Only the `keep` most recently used run
+    directories are kept.
+    """
+    digest = hashlib.sha256(
+        "\n".join(f"{item_id}:{fingerprint}" for item_id, _, _, fingerprint in items).encode("utf-8")
+    ).hexdigest()[:16]
+    runs_dir = os.path.join(base_dir, "runs")
+    path = os.path.join(runs_dir, digest)
+    os.makedirs(path, exist_ok=True)
+    os.utime(path)
+    prune_run_dirs(runs_dir, keep, current=path)
+    return path
+
+
+def prune_run_dirs(runs_dir, keep=BATCH_RUNS_KEPT, current=None):
+    """Remove all but the `keep` most recently used run directories, never `current`"""
+    if not os.path.isdir(runs_dir):
+        return []
+    paths = [entry.path for entry in os.scandir(runs_dir) if entry.is_dir()]
+    paths.sort(key=lambda path: (path == current, os.path.getmtime(path)), reverse=True)
+    removed = [path for path in paths[max(keep, 1):] if path != current]
+    for path in removed:
+        shutil.rmtree(path, ignore_errors=True)
+    return removed
+
+
+def _item_path(output_dir, item_id, fingerprint):
+    return os.path.join(output_dir, f"{item_id}-{fingerprint}.md")
+
+
+def _write_atomic(path, text):
+    # unique per writer: two sessions resuming the same run directory may write the same item
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def run_batch(output_dir=BATCH_OUTPUT_DIR, items=None, max_workers=BATCH_MAX_WORKERS, force=False,
+              on_progress=None):
+    """Generate every item concurrently, writing each to `output_dir` as soon as it completes.
+
+    Output files are named by each item's fingerprint (dataset version, model
+    and prompt), and an item whose file already exists is skipped unless `force`
+    is set, so an interrupted batch resumes where it stopped while a changed
+    prompt, model or dataset is regenerated. Provider rate limits are
+    enforced by the shared LLM scheduler. `on_progress(item_id, status, detail)`
+    is called for every item as it is skipped, completed or failed.
+    """
+    if items is None:
+        items = build_batch_items()
+    os.makedirs(output_dir, exist_ok=True)
+    summary = {"completed": [], "skipped": [], "failed": {}}
+
+    def report_progress(item_id, status, detail=""):
+        if on_progress is not None:
+            on_progress(item_id, status, detail)
+
+    pending = []
+    for item_id, title, generate, fingerprint in items:
+        if not force and os.path.exists(_item_path(output_dir, item_id, fingerprint)):
+            summary["skipped"].append(item_id)
+            report_progress(item_id, "skipped")
+        else:
+            pending.append((item_id, title, generate, fingerprint))
+
+    def run_item(item_id, title, generate, fingerprint):
+        started = time.time()
+        text = generate()
+        if not text:
+            raise RuntimeError("empty response")
+        _write_atomic(_item_path(output_dir, item_id, fingerprint), f"# {title}\n\n{text}\n")
+        return time.time() - started
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch") as executor:
+            futures = {executor.submit(run_item, *item): item[0] for item in pending}
+            for future in as_completed(futures):
+                item_id = futures[future]
+                try:
+                    elapsed = future.result()
+                except Exception as e:
+                    summary["failed"][item_id] = str(e)
+                    report_progress(item_id, "failed", str(e))
+                else:
+                    summary["completed"].append(item_id)
+                    report_progress(item_id, "completed", f"{elapsed:.1f}s")
+
+    _write_atomic(os.path.join(output_dir, "manifest.json"), json.dumps({
+        "data_version": DATA_VERSION,
+        "items": {item_id: fingerprint for item_id, _, _, fingerprint in items},
+        "failed": summary["failed"],
+        "updated": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }, indent=2))
+    return summary
+
+
+def assemble_board_pack(output_dir=BATCH_OUTPUT_DIR, items=None):
+    """Concatenate the generated documents in batch order into one markdown pack"""
+    if items is None:
+        items = build_batch_items()
+    parts = []
+    for item_id, title, _, fingerprint in items:
+        path = _item_path(output_dir, item_id, fingerprint)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                parts.append(f.read().rstrip())
+        else:
+            parts.append(f"# {title}\n\n_Not generated yet._")
+    return "\n\n---\n\n".join(parts) + "\n"
@@ -0,0 +1,171 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.single_flight import AI_SINGLE_FLIGHT
+
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "AI_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".ai_cache", "responses.sqlite3")
+)
+DEFAULT_TTL_SECONDS = float(os.environ.get("AI_CACHE_TTL_HOURS", 24 * 7)) * 3600
+DEFAULT_MAX_BYTES = int(float(os.environ.get("AI_CACHE_MAX_MB", 50)) * 1024 * 1024)
+
+
+def response_cache_key(model, prompt):
+    """Stable key for a model name plus the fully rendered prompt"""
+    digest = hashlib.sha256()
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Persistent LLM response cache in a single SQLite file.
+
+    Entries expire after `ttl_seconds`; once the stored text exceeds
+    `max_bytes` the least recently used entries are evicted.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT, response TEXT, size INTEGER, "
+                "created REAL, accessed REAL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, model, prompt):
+        key = response_cache_key(model, prompt)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, model, prompt, response):
+        key = response_cache_key(model, prompt)
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now)
+            )
+            conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def delete(self, model, prompt):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (response_cache_key(model, prompt),))
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock, self._connect() as conn:
+            entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": entries, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Process-wide cache shared by every AI helper"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
+
+
+def response_cache_stats():
+    """Stats of the shared cache, or None if nothing has used it yet"""
+    with _response_cache_lock:
+        cache = _response_cache
+    return None if cache is None else cache.stats()
+
+
+def cached_generate(model, prompt, generate):
+    """Return the cached response for (model, prompt), calling `generate()` on a miss.
+
+    Concurrent misses for the same key share a single `generate()` call.
+    """
+    cache = get_response_cache()
+    response = cache.get(model, prompt)
+    if response is not None:
+        return response
+
+    def generate_once():
+        # A leader that finished just before we joined will already have cached it
+        response = cache.get(model, prompt)
+        if response is None:
+            response = generate()
+            if response:
+                cache.put(model, prompt, response)
+        return response
+
+    return AI_SINGLE_FLIGHT.do(response_cache_key(model, prompt), generate_once)
+
+
+def cached_stream(model, prompt, stream):
+    """Yield response chunks for (model, prompt).
+
+    A cached response is yielded whole; otherwise chunks from `stream()` are
+    passed through and the full text is cached once the stream completes.
+    Concurrent misses for the same key all read from one upstream stream.
+    """
+    cache = get_response_cache()
+    response = cache.get(model, prompt)
+    if response is not None:
+        yield response
+        return
+
+    def store(response):
+        if response:
+            cache.put(model, prompt, response)
+
+    yield from AI_SINGLE_FLIGHT.stream(response_cache_key(model, prompt), stream, on_complete=store)
@@ -0,0 +1,186 @@
+import glob
+import json
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+from data.india_healthcare_data import DATA_VERSION, calculate_cost_projection, project_proposed_strategy_scenario
+from utils.scenario_specs import COST_MODEL, COST_PARAMETERS, STRATEGY_MODEL, STRATEGY_PARAMETERS, scenario_id
+
+
+SCENARIO_BATCH_WORKERS = int(os.environ.get("SCENARIO_BATCH_WORKERS", 0)) or os.cpu_count() or 1
+SCENARIO_BATCH_OUTPUT = os.environ.get("SCENARIO_BATCH_OUTPUT", "scenario_results.parquet")
+MAX_CHUNK_SIZE = 50
+
+# calculate_cost_projection counts years from 1 after 2024, the scenario projections from 2024 itself
+BASE_YEAR = 2024
+
+ID_COLUMN = "Scenario ID"
+MODEL_COLUMN = "Model"
+# checkpoint parts only: lets a resumed run recompute a scenario whose parameters changed under the same id
+SPEC_HASH_COLUMN = "Spec Hash"
+PARAMETER_COLUMNS = list(dict.fromkeys([*COST_PARAMETERS, *STRATEGY_PARAMETERS]))
+
+
+def _require_parquet():
+    if pyarrow is None:
+        raise ImportError("The pyarrow package is required to write scenario results as Parquet")
+
+
+def scenario_frame(spec):
+    """Yearly rows for every model in `spec`, tagged with its id and parameters"""
+    params = {**(spec["strategy"] or {}), **(spec["cost"] or {})}
+    frames = []
+    if COST_MODEL in spec["models"]:
+        frames.append((COST_MODEL, calculate_cost_projection(**spec["cost"])))
+    if STRATEGY_MODEL in spec["models"]:
+        strategy = project_proposed_strategy_scenario(**spec["strategy"])
+        strategy = strategy.drop(columns="Scenario").rename(columns={"Year": "Calendar Year"})
+        strategy.insert(0, "Year", strategy["Calendar Year"] - BASE_YEAR)
+        frames.append((STRATEGY_MODEL, strategy))
+
+    tagged = []
+    for model, frame in frames:
+        columns = {ID_COLUMN: spec["id"], MODEL_COLUMN: model}
+        columns.update({name: params.get(name) for name in PARAMETER_COLUMNS})
+        tagged.append(pd.concat([pd.DataFrame(columns, index=frame.index), frame], axis=1))
+    return pd.concat(tagged, ignore_index=True)
+
+
+def _run_chunk(specs):
+    """Process-pool task: (rows of every spec that ran, {id: error}) for a list of specs"""
+    frames = []
+    failures = {}
+    for spec in specs:
+        try:
+            frame = scenario_frame(spec)
+        except Exception as e:
+            failures[spec["id"]] = f"{type(e).__name__}: {e}"
+            continue
+        frame[SPEC_HASH_COLUMN] = scenario_id(spec)
+        frames.append(frame)
+    return (pd.concat(frames, ignore_index=True) if frames else None), failures
+
+
+def checkpoint_dir(output_path):
+    return f"{output_path}.checkpoint"
+
+
+def _write_parquet_atomic(frame, path):
+    tmp_path = f"{path}.tmp"
+    frame.to_parquet(tmp_path, engine="pyarrow", index=False)
+    os.replace(tmp_path, path)
+
+
+def _open_checkpoint(directory, fresh):
+    """Part files from a previous run of the same dataset, or a new empty checkpoint directory"""
+    manifest_path = os.path.join(directory, "manifest.json")
+    discarded = False
+    if os.path.isdir(directory):
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        if fresh or manifest.get("data_version") != DATA_VERSION:
+            shutil.rmtree(directory)
+            discarded = not fresh
+    os.makedirs(directory, exist_ok=True)
+    if not os.path.exists(manifest_path):
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"data_version": DATA_VERSION, "created": time.strftime("%Y-%m-%dT%H:%M:%S")}, f, indent=2)
+    for stale in glob.glob(os.path.join(directory, "*.tmp")):
+        os.remove(stale)
+    return sorted(glob.glob(os.path.join(directory, "part-*.parquet"))), discarded
+
+
+def _completed(parts):
+    done = set()
+    for part in parts:
+        frame = pd.read_parquet(part, columns=[ID_COLUMN, SPEC_HASH_COLUMN], engine="pyarrow")
+        done.update(zip(frame[ID_COLUMN], frame[SPEC_HASH_COLUMN]))
+    return done
+
+
+def _assemble(parts, specs):
+    """Rows of the current specs from every part, in input order"""
+    order = {spec["id"]: index for index, spec in enumerate(specs)}
+    hashes = {(spec["id"], scenario_id(spec)) for spec in specs}
+    frames = [pd.read_parquet(part, engine="pyarrow") for part in parts]
+    if not frames:
+        return pd.DataFrame(columns=[ID_COLUMN, MODEL_COLUMN, *PARAMETER_COLUMNS])
+    frame = pd.concat(frames, ignore_index=True)
+    frame = frame[[key in hashes for key in zip(frame[ID_COLUMN], frame[SPEC_HASH_COLUMN])]]
+    frame = frame.assign(_order=frame[ID_COLUMN].map(order))
+    frame = frame.sort_values(["_order", MODEL_COLUMN, "Year"], kind="stable")
+    return frame.drop(columns=["_order", SPEC_HASH_COLUMN]).reset_index(drop=True)
+
+
+def run_scenarios(specs, output_path=SCENARIO_BATCH_OUTPUT, max_workers=SCENARIO_BATCH_WORKERS, chunk_size=None,
+                  fresh=False, keep_checkpoint=False, on_progress=None):
+    """Evaluate every spec across a process pool and write all rows to one Parquet file.
+
+    Chunks of specs are written to `<output>.checkpoint/` as they finish, and
+    specs already there (same id and parameters, same DATA_VERSION) are skipped,
+    so an interrupted run resumes where it stopped; `fresh` discards the
+    checkpoint. It is removed once every spec succeeded unless
+    `keep_checkpoint` is set. `on_progress(done, total, failed)` is called after
+    each chunk.
+    """
+    _require_parquet()
+    directory = checkpoint_dir(output_path)
+    parts, discarded = _open_checkpoint(directory, fresh)
+    done = _completed(parts)
+    pending = [spec for spec in specs if (spec["id"], scenario_id(spec)) not in done]
+    summary = {
+        "total": len(specs),
+        "skipped": len(specs) - len(pending),
+        "completed": 0,
+        "failed": {},
+        "discarded_checkpoint": discarded,
+        "output": output_path,
+    }
+
+    def report_progress():
+        if on_progress is not None:
+            on_progress(summary["skipped"] + summary["completed"] + len(summary["failed"]), len(specs),
+                        len(summary["failed"]))
+
+    report_progress()
+    if pending:
+        workers = max(1, min(max_workers, len(pending)))
+        if chunk_size is None:
+            # a few chunks per worker keeps the pool busy without checkpointing every scenario
+            chunk_size = max(1, min(MAX_CHUNK_SIZE, math.ceil(len(pending) / (workers * 4))))
+        chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+        next_part = len(parts)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_run_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    frame, failures = future.result()
+                except Exception as e:
+                    frame, failures = None, {spec["id"]: f"{type(e).__name__}: {e}" for spec in chunk}
+                if frame is not None:
+                    next_part += 1
+                    _write_parquet_atomic(frame, os.path.join(directory, f"part-{next_part:05d}.parquet"))
+                summary["failed"].update(failures)
+                summary["completed"] += len(chunk) - len(failures)
+                report_progress()
+        parts = sorted(glob.glob(os.path.join(directory, "part-*.parquet")))
+
+    results = _assemble(parts, specs)
+    _write_parquet_atomic(results, output_path)
+    summary["rows"] = len(results)
+    if not summary["failed"] and not keep_checkpoint:
+        shutil.rmtree(directory)
+    return summary
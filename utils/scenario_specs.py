@@ -0,0 +1,169 @@
+import csv
+import hashlib
+import json
+import math
+import os
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+COST_MODEL = "cost_projection"
+STRATEGY_MODEL = "proposed_strategy"
+MODEL_CHOICES = {
+    "cost": (COST_MODEL,),
+    "strategy": (STRATEGY_MODEL,),
+    "both": (COST_MODEL, STRATEGY_MODEL),
+}
+
+# name -> (type, default, minimum, maximum); rates are fractions, as calculate_cost_projection takes them
+COST_PARAMETERS = {
+    "target_gap_closure_pct": (float, None, 0.0, 100.0),
+    "years": (int, None, 1, 100),
+    "training_cost_multiplier": (float, 1.0, 0.0, 10.0),
+    "salary_growth_rate": (float, 0.05, -0.5, 1.0),
+    "infrastructure_investment_pct": (float, 0.20, 0.0, 5.0),
+    "include_retention": (bool, True, None, None),
+    "inflation_rate": (float, 0.05, -0.5, 1.0),
+}
+STRATEGY_PARAMETERS = {
+    "years": (int, 15, 1, 100),
+    "training_capacity_increase": (float, 2.0, 0.0, 20.0),
+    # accepted like project_proposed_strategy_scenario does, though the projection does not model it
+    "infrastructure_boost": (float, 1.5, 0.0, 20.0),
+    "retention_improvement": (float, 0.30, 0.0, 1.0),
+}
+
+_TRUE = ("1", "true", "yes", "y", "on")
+_FALSE = ("0", "false", "no", "n", "off")
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip()) or \
+        (isinstance(value, float) and math.isnan(value))
+
+
+def coerce_param(name, value, kind, minimum=None, maximum=None):
+    """Convert a raw spec or query value to `kind`, raising ValueError when it is invalid or out of range"""
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise ValueError(f"{name} must be true or false, got {value!r}")
+
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be finite, got {value!r}")
+    if kind is int:
+        if not number.is_integer():
+            raise ValueError(f"{name} must be a whole number, got {value!r}")
+        number = int(number)
+    if minimum is not None and number < minimum or maximum is not None and number > maximum:
+        raise ValueError(f"{name} must be between {minimum} and {maximum}, got {value!r}")
+    return number
+
+
+def resolve_params(raw, parameters):
+    """Validated keyword arguments for one model with defaults filled in; keys outside `parameters` are ignored"""
+    params = {}
+    for name, (kind, default, minimum, maximum) in parameters.items():
+        value = raw.get(name)
+        if _blank(value):
+            if default is None:
+                raise ValueError(f"{name} is required")
+            params[name] = default
+        else:
+            params[name] = coerce_param(name, value, kind, minimum, maximum)
+    return params
+
+
+def scenario_id(spec):
+    """Stable id for a spec without one: a hash of its models and parameters"""
+    payload = json.dumps({key: spec[key] for key in ("models", "cost", "strategy")}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def normalize_spec(raw, defaults=None):
+    """Validate one scenario definition.
+
+    Returns {"id", "models", "cost", "strategy"} where "cost" and "strategy"
+    hold the keyword arguments for calculate_cost_projection and
+    project_proposed_strategy_scenario (None for a model the spec skips).
+    """
+    raw = {**(defaults or {}), **{str(key): value for key, value in raw.items() if not _blank(value)}}
+    name = raw.pop("id", None)
+    model = str(raw.pop("model", "both")).strip().lower()
+    if model not in MODEL_CHOICES:
+        raise ValueError(f"model must be one of {', '.join(MODEL_CHOICES)}, got {model!r}")
+    models = MODEL_CHOICES[model]
+
+    known = set(COST_PARAMETERS) | set(STRATEGY_PARAMETERS)
+    unknown = sorted(set(raw) - known)
+    if unknown:
+        raise ValueError(f"unknown parameter(s): {', '.join(unknown)}")
+
+    spec = {
+        "models": list(models),
+        "cost": resolve_params(raw, COST_PARAMETERS) if COST_MODEL in models else None,
+        "strategy": resolve_params(raw, STRATEGY_PARAMETERS) if STRATEGY_MODEL in models else None,
+    }
+    spec["id"] = str(name).strip() if not _blank(name) else scenario_id(spec)
+    return spec
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f)), {}
+
+
+def _read_yaml(path):
+    if yaml is None:
+        raise ImportError("The PyYAML package is required to read YAML scenario files")
+    with open(path, encoding="utf-8") as f:
+        document = yaml.safe_load(f) or []
+    if isinstance(document, dict):
+        return document.get("scenarios") or [], document.get("defaults") or {}
+    return document, {}
+
+
+def load_specs(path):
+    """Read and validate scenario definitions from a CSV or YAML file.
+
+    CSV files have one scenario per row with parameter names as headers. YAML
+    files hold a list of mappings, or a mapping with `scenarios` and shared
+    `defaults`. Every scenario may set `id` and `model` (cost, strategy or
+    both). Errors name the offending row; duplicate ids are rejected.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        rows, defaults = _read_csv(path)
+    elif extension in (".yaml", ".yml"):
+        rows, defaults = _read_yaml(path)
+    else:
+        raise ValueError(f"Unsupported scenario file {path!r}; expected .csv, .yaml or .yml")
+
+    specs = []
+    seen = {}
+    for index, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            raise ValueError(f"{path}: scenario {index} is not a mapping")
+        try:
+            spec = normalize_spec(row, defaults)
+        except ValueError as e:
+            raise ValueError(f"{path}: scenario {index}: {e}") from None
+        if spec["id"] in seen:
+            raise ValueError(f"{path}: scenario {index} repeats id {spec['id']!r} from scenario {seen[spec['id']]}")
+        seen[spec["id"]] = index
+        specs.append(spec)
+    return specs
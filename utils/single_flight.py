@@ -0,0 +1,147 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def iterate(self):
+        result = self.wait()
+        if result:
+            yield result
+
+
+class _StreamCall:
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.condition = threading.Condition()
+
+    def publish(self, chunk):
+        with self.condition:
+            self.chunks.append(chunk)
+            self.condition.notify_all()
+
+    def finish(self, error=None):
+        with self.condition:
+            self.done = True
+            self.error = error
+            self.condition.notify_all()
+
+    def iterate(self):
+        position = 0
+        while True:
+            with self.condition:
+                while position >= len(self.chunks) and not self.done:
+                    self.condition.wait()
+                pending = self.chunks[position:]
+                finished = self.done
+                error = self.error
+            for chunk in pending:
+                yield chunk
+            position += len(pending)
+            if finished and position >= len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
+    def wait(self):
+        return "".join(self.iterate())
+
+
+class SingleFlight:
+    """Coalesce concurrent identical requests onto one upstream call.
+
+    While a call for `key` is in flight, later callers with the same key wait
+    for it and receive the same result (or exception) instead of issuing
+    their own request. `do` and `stream` share keys: a `do` caller arriving
+    while a stream is in flight gets the stream's joined text, and a `stream`
+    caller arriving during a `do` call gets its result as a single chunk.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._streams = {}
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key) or self._streams.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.upstream_calls += 1
+            else:
+                self.coalesced_calls += 1
+
+        if not leader:
+            return call.wait()
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def stream(self, key, stream, on_complete=None):
+        """Yield chunks of the shared stream for `key`, starting it if nobody else has.
+
+        The upstream stream is drained by a background thread, so a caller that
+        stops reading early does not cut the stream short for the others.
+        `on_complete` receives the joined text once the stream finishes cleanly.
+        """
+        with self._lock:
+            call = self._streams.get(key) or self._calls.get(key)
+            if call is None:
+                call = _StreamCall()
+                self._streams[key] = call
+                self.upstream_calls += 1
+                threading.Thread(
+                    target=self._pump, args=(key, call, stream, on_complete), daemon=True
+                ).start()
+            else:
+                self.coalesced_calls += 1
+        return call.iterate()
+
+    def _pump(self, key, call, stream, on_complete):
+        error = None
+        try:
+            for chunk in stream():
+                if chunk:
+                    call.publish(chunk)
+            if on_complete is not None:
+                on_complete("".join(call.chunks))
+        except Exception as e:
+            error = e
+        finally:
+            with self._lock:
+                del self._streams[key]
+            call.finish(error)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls) + len(self._streams),
+                "upstream_calls": self.upstream_calls,
+                "coalesced_calls": self.coalesced_calls,
+            }
+
+
+AI_SINGLE_FLIGHT = SingleFlight()